@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Çıkarım motorlarının model yükleme süresi ve kare başına gecikmesi.
+
+Sabit bir kare kümesi (varsayılan: sabit tohumlu sentetik kareler veya --images
+dizini) her motordan geçirilir. Bağımlılığı kurulu olmayan motorlar atlanır.
+
+Önce model gerektirmeyen bir tutarlılık kontrolü yapılır: kare kenarından
+taşan iki kutu içeren sentetik bir YOLOv8 çıktısı ONNX motorunun decode()'u
+ile ve (kuruluysa) Ultralytics'in kendi NMS + scale_boxes yolu ile kare
+koordinatlarına çevrilir. Sonuçlar aynı değilse (ör. kırpma farkı) çıkış
+kodu 1'dir. Ultralytics yoksa elle hesaplanmış kırpılmış kutularla karşılaştırılır.
+
+Kullanım:
+    python3 benchmarks/bench_backends.py --backends ultralytics onnx onnx-int8 --frames 50
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from backends import OnnxBackend, create_backend  # noqa: E402
+from postprocess import postprocess_array  # noqa: E402
+
+
+def load_frames(images_dir, count):
+    if images_dir:
+        paths = sorted(glob.glob(os.path.join(images_dir, "*.jpg")) + glob.glob(os.path.join(images_dir, "*.png")))
+        return [cv2.resize(cv2.imread(p), (config.FRAME_WIDTH, config.FRAME_HEIGHT)) for p in paths[:count]]
+
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8)
+            for _ in range(count)]
+
+
+def edge_output(imgsz, num_classes=80):
+    """Letterbox uzayında iki kutulu (1, 4+nc, A) YOLOv8 çıktısı: biri sol üst,
+    diğeri sağ alt kenardan kare dışına taşar. Diğer çapaların güveni sıfırdır."""
+    output = np.zeros((1, 4 + num_classes, 8), dtype=np.float32)
+    output[0, :4, 0] = (10, 60, 40, 60)                  # cx, cy, w, h
+    output[0, :4, 1] = (imgsz - 5, imgsz - 50, 20, 40)
+    output[0, 4 + config.PERSON_CLASS_ID, :2] = (0.9, 0.8)
+    return output
+
+
+def ultralytics_decode(output, imgsz, shape):
+    """UltralyticsBackend'in sonuçlarını üreten yol: NMS + scale_boxes (kırpma dahil)."""
+    import torch
+    from ultralytics.utils import ops
+    det = ops.non_max_suppression(torch.from_numpy(output), config.CONF_THRESHOLD, config.NMS_IOU_THRESHOLD,
+                                  max_det=config.MAX_DETECTIONS)[0]
+    det[:, :4] = ops.scale_boxes((imgsz, imgsz), det[:, :4], shape)
+    return det.numpy()
+
+
+def check_edge_boxes(imgsz):
+    """Kenardan taşan kutular iki motorda aynı kare koordinatlarına çıkıyor mu."""
+    shape = (config.FRAME_HEIGHT, config.FRAME_WIDTH)
+    image = np.zeros(shape + (3,), dtype=np.uint8)
+    _, scale, pad = OnnxBackend(None).preprocess(image, imgsz)
+    output = edge_output(imgsz)
+    onnx = OnnxBackend(None).decode(output, scale, pad, shape)
+    try:
+        reference, source = ultralytics_decode(output, imgsz, shape), "ultralytics"
+    except ImportError:
+        # Elle: letterbox'tan kareye çevir, kare sınırlarına kırp
+        cx, cy, w, h = output[0, :4, :2]
+        boxes = np.stack([cx - w / 2 - pad[0], cy - h / 2 - pad[1],
+                          cx + w / 2 - pad[0], cy + h / 2 - pad[1]], axis=1) / scale
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, shape[0])
+        reference = np.hstack([boxes, [[0.9], [0.8]], [[config.PERSON_CLASS_ID]] * 2])
+        source = "elle hesaplanan; ultralytics kurulu değil"
+    same = onnx.shape == reference.shape and np.allclose(onnx, reference, atol=0.5)
+    print(f"[INFO] Kenar kutusu kontrolü ({source}): {'aynı' if same else 'FARKLI'}")
+    if not same:
+        print(f"[HATA] onnx:\n{onnx}\nreferans:\n{reference}")
+    return same
+
+
+def build(name):
+    if name == "onnx-int8":
+        return create_backend("onnx", model_path=config.ONNX_INT8_MODEL_PATH)
+    return create_backend(name, device="cpu")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["ultralytics", "onnx", "onnx-int8"])
+    parser.add_argument("--images", default=None, help="Kare olarak kullanılacak resim dizini")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--imgsz", type=int, default=config.INFERENCE_IMGSZ)
+    args = parser.parse_args()
+
+    if not check_edge_boxes(args.imgsz):
+        sys.exit(1)
+
+    frames = load_frames(args.images, args.frames)
+    print(f"{'motor':>12} | {'yükleme (s)':>11} | {'ort ms/kare':>11} | {'p50':>7} | {'p95':>7}")
+
+    for name in args.backends:
+        backend = build(name)
+        try:
+            load_time = backend.load()
+            backend.warmup(args.imgsz)
+        except Exception as e:
+            print(f"{name:>12} | atlandı: {e}")
+            continue
+
+        timings = []
+        for frame in frames:
+            start = time.perf_counter()
+            postprocess_array(backend.infer(frame, args.imgsz))
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings = np.array(timings)
+        print(f"{name:>12} | {load_time:>11.2f} | {timings.mean():>11.1f} | "
+              f"{np.percentile(timings, 50):>7.1f} | {np.percentile(timings, 95):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
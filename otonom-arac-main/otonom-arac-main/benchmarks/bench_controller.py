@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""ControllerEngine: simülasyonda adım hızı ve motor güncelleme zamanlaması.
+
+1) Simülasyon: yatayda hareket eden sahte hedef, sahte saatle step() çağrıları;
+   saniyedeki kontrol adımı ve sahte hedefin merkezden ortalama sapması.
+2) Zamanlama: motor güncellemeleri arası süre (ms). Eski yol kararları kare
+   geldikçe verir (kamera aralıkları titrek, ara sıra yavaş kare); yeni yol
+   kontrolcü thread'inde --rate Hz ile verir, hedef ayrı thread'den beslenir.
+
+Kullanım:
+    python3 benchmarks/bench_controller.py [--steps 100000 --rate 50 --seconds 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from controller import ControllerEngine  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+
+def sim_box(t):
+    """t anında sahte hedefin kutusu: merkez etrafında 2 sn periyotla sağa sola gider."""
+    cx = config.FRAME_WIDTH / 2 + 150 * np.sin(np.pi * t)
+    return [cx - 40, 140, cx + 40, 340]
+
+
+def bench_steps(steps):
+    motor = RecordingMotorController()
+    engine = ControllerEngine(motor, StateLogger(log_enabled=False))
+    dt = 1.0 / config.CONTROL_RATE_HZ
+    errors = np.empty(steps)
+    start = time.perf_counter()
+    for i in range(steps):
+        t = i * dt
+        # Kamera kontrolcünün yarı hızında: her iki adımda bir ölçüm
+        if i % 2 == 0:
+            box = sim_box(t)
+            engine.update_target(box, track_id=1)
+        output = engine.step(t)
+        errors[i] = output.pred_x - (box[0] + box[2]) / 2
+        motor.commands.clear()
+    elapsed = time.perf_counter() - start
+    print(f"simülasyon: {steps} adım | {steps / elapsed:,.0f} adım/s | "
+          f"tahmin - gerçek merkez: ortalama |hata| {np.abs(errors).mean():.1f} px")
+
+
+def update_intervals(commands):
+    """Her kontrol adımı ena pinine bir kez yazar; ardışık yazmalar arası süre (ms)."""
+    times = np.array([t for t, pin, _ in commands if pin == "ena"])
+    return np.diff(times) * 1000
+
+
+def camera_intervals(seconds, rng):
+    """Titrek kamera: ~33 ms, %5 olasılıkla 60-90 ms yavaş kare."""
+    intervals = rng.normal(1 / 30, 0.004, int(seconds * 30))
+    slow = rng.random(intervals.size) < 0.05
+    intervals[slow] = rng.uniform(0.06, 0.09, slow.sum())
+    return np.clip(intervals, 0.01, None)
+
+
+def run_frame_driven(seconds, rng):
+    motor = RecordingMotorController()
+    engine = ControllerEngine(motor, StateLogger(log_enabled=False))
+    start = time.monotonic()
+    for interval in camera_intervals(seconds, rng):
+        time.sleep(interval)
+        now = time.monotonic() - start
+        engine.update_target(sim_box(now), track_id=1)
+        engine.step(now)
+    return update_intervals(motor.commands)
+
+
+def run_fixed_rate(seconds, rate, rng):
+    motor = RecordingMotorController()
+    engine = ControllerEngine(motor, StateLogger(log_enabled=False), rate_hz=rate)
+    engine.start()
+    start = time.monotonic()
+    for interval in camera_intervals(seconds, rng):
+        time.sleep(interval)
+        engine.update_target(sim_box(time.monotonic() - start), track_id=1)
+    engine.stop()
+    return update_intervals(motor.commands)
+
+
+def report(name, intervals):
+    p50, p99 = np.percentile(intervals, [50, 99])
+    print(f"{name:>16} | {intervals.size:>6} | {p50:>7.2f} | {p99:>7.2f} | {intervals.max():>7.2f} | {intervals.std():>6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=config.CONTROL_RATE_HZ)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    bench_steps(args.steps)
+
+    print(f"{'motor güncelleme':>16} | {'adım':>6} | {'p50 ms':>7} | {'p99 ms':>7} | {'maks ms':>7} | {'std':>6}")
+    report("kare başına", run_frame_driven(args.seconds, np.random.default_rng(0)))
+    report(f"sabit {args.rate:.0f} Hz", run_fixed_rate(args.seconds, args.rate, np.random.default_rng(0)))
+
+
+if __name__ == "__main__":
+    main()
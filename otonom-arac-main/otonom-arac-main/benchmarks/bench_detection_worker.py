@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tespit çalışanı: thread vs süreç (paylaşımlı bellek) karşılaştırması.
+
+Sentetik kaynak gerçek zamanlı (--fps) oynatılır, her karede tespit istenir.
+Motor, model çıkarımını --latency-ms uyku (GIL bırakılır) ve Python tarafı
+ön/son işlemeyi --gil-ms saf Python döngüsü (GIL tutulur) ile taklit eder.
+Ayrıca --encoders thread'i Flask JPEG kodlayıcılarının Python yükünü taklit
+eder. Raporlanan: kare okuma aralığının p50/p99/maks değeri (döngü titreşimi)
+ve saniyedeki tespit sonucu.
+
+Kullanım:
+    python3 benchmarks/bench_detection_worker.py [--frames 300 --gil-ms 15 --encoders 1]
+"""
+import argparse
+import functools
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from bench_end_to_end import CountingBackend, ScriptedBackend, TimedSource  # noqa: E402
+from detection_process import DetectionProcess  # noqa: E402
+from detector import frame_queue, result_queue  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+
+def busy_python(ms):
+    """GIL'i tutan saf Python işi."""
+    end = time.perf_counter() + ms / 1000
+    x = 0
+    while time.perf_counter() < end:
+        x += 1
+    return x
+
+
+class GilBoundBackend(ScriptedBackend):
+    """Çıkarım uykusu + GIL tutan Python işi. Süreç modunda alt süreçte
+    oluşturulabilmesi için modül seviyesinde tanımlıdır."""
+    def __init__(self, latency_ms=30.0, gil_ms=15.0):
+        super().__init__(latency_ms)
+        self.gil_ms = gil_ms
+
+    def infer(self, image, imgsz=None):
+        result = super().infer(image, imgsz)
+        busy_python(self.gil_ms)
+        return result
+
+
+def encoder_load(stop, gil_ms):
+    """Yayın kodlayıcısı taklidi: her 33 ms'de gil_ms Python işi."""
+    while not stop.is_set():
+        busy_python(gil_ms)
+        time.sleep(1 / 30)
+
+
+def run(mode, args):
+    config.DETECT_SCHEDULE = "every_frame"
+    inner = SyntheticSource(count=args.frames, realtime=True, fps=args.fps)
+    inner.start()
+    source = TimedSource(inner)
+
+    if mode == "process":
+        worker = DetectionProcess(functools.partial(GilBoundBackend, args.latency_ms, args.gil_ms))
+        worker.start()
+        worker.wait_ready(timeout=60)
+        frame_q = result_q = worker
+    else:
+        backend = CountingBackend(GilBoundBackend(args.latency_ms, args.gil_ms))
+        worker = start_detection_thread(backend)
+        while backend.inner.load_time is None:
+            time.sleep(0.01)
+        frame_q, result_q = frame_queue, result_queue
+
+    stop = threading.Event()
+    encoders = [threading.Thread(target=encoder_load, args=(stop, args.encoder_ms), daemon=True)
+                for _ in range(args.encoders)]
+    for t in encoders:
+        t.start()
+
+    start = time.perf_counter()
+    try:
+        control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False),
+                     frame_q=frame_q, result_q=result_q, max_frames=args.frames, verbose=False)
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        worker.stop()
+        worker.join()
+        inner.stop()
+
+    results = worker.results_received if mode == "process" else backend.calls
+    return np.diff(source.read_times) * 1000, results / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Çıkarım süresi (GIL bırakılır)")
+    parser.add_argument("--gil-ms", type=float, default=15.0, help="Tespit başına GIL tutan Python işi")
+    parser.add_argument("--encoders", type=int, default=1, help="Kodlayıcı taklidi thread sayısı")
+    parser.add_argument("--encoder-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'çalışan':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'maks ms':>7} | {'tespit/s':>8}")
+    for mode in ("thread", "process"):
+        intervals, detection_hz = run(mode, args)
+        p50, p99 = np.percentile(intervals, [50, 99])
+        print(f"{mode:>8} | {p50:>7.2f} | {p99:>7.2f} | {intervals.max():>7.2f} | {detection_hz:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Donanımsız uçtan uca benchmark: kare kaynağı -> tespit -> kontrol döngüsü -> motor.
+
+main.control_loop değiştirilmeden çalıştırılır; GPIO yerine
+RecordingMotorController kullanılır. Gecikme, karenin kaynaktan okunmasından
+o döngü turundaki son motor komutuna kadar geçen süredir.
+
+Kullanım:
+    python3 benchmarks/bench_end_to_end.py --source synthetic --frames 500
+    python3 benchmarks/bench_end_to_end.py --source replay --path kayit.mp4 --fast --backend onnx
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from backends import InferenceBackend, create_backend  # noqa: E402
+from detector import frame_queue, result_queue  # noqa: E402
+from frame_source import ReplaySource, SyntheticSource  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+
+class ScriptedBackend(InferenceBackend):
+    """Model gerektirmeyen motor: SyntheticSource'un hedef rengini kareden bulur.
+    latency_ms ile model çıkarım süresi taklit edilir."""
+    name = "scripted"
+
+    def __init__(self, latency_ms=0.0):
+        super().__init__()
+        self.latency = latency_ms / 1000.0
+
+    def _load(self):
+        pass
+
+    def infer(self, image, imgsz=None):
+        if self.latency:
+            time.sleep(self.latency)
+        mask = (image[:, :, 0] == 60) & (image[:, :, 2] == 200)
+        cols = np.flatnonzero(mask.any(axis=0))
+        rows = np.flatnonzero(mask.any(axis=1))
+        if cols.size == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+        return np.array([[cols[0], rows[0], cols[-1] + 1, rows[-1] + 1, 0.9, 0]], dtype=np.float32)
+
+
+class CountingBackend(InferenceBackend):
+    """Gerçek motoru sarar ve çıkarım sayısını tutar."""
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.name = inner.name
+        self.calls = 0
+
+    def load(self):
+        return self.inner.load()
+
+    def warmup(self, imgsz=None):
+        self.inner.warmup(imgsz)
+
+    def infer(self, image, imgsz=None):
+        self.calls += 1
+        return self.inner.infer(image, imgsz)
+
+
+class TimedSource:
+    """Kaynağı sarar ve her karenin okunma zamanını kaydeder."""
+    def __init__(self, inner):
+        self.inner = inner
+        self.pipeline = inner.pipeline
+        self.name = inner.name
+        self.read_times = []
+
+    def read(self):
+        frame = self.inner.read()
+        self.read_times.append(time.perf_counter())
+        return frame
+
+
+def actuation_latencies(read_times, commands):
+    """Her kare için okuma -> o turdaki son motor komutu gecikmesi (ms)."""
+    if not commands:
+        return np.zeros(0)
+    read_times = np.asarray(read_times)
+    command_times = np.array([c[0] for c in commands])
+    # Her komutun ait olduğu tur: kendisinden önceki son okuma
+    frame_index = np.searchsorted(read_times, command_times, side="right") - 1
+    valid = frame_index >= 0
+    last_command = np.full(read_times.shape, np.nan)
+    # Sıralı olduğu için her turun son komutu en son yazılan değerdir
+    last_command[frame_index[valid]] = command_times[valid]
+    latencies = (last_command - read_times) * 1000
+    return latencies[~np.isnan(latencies)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--path", default=None, help="replay için video dosyası veya resim dizini")
+    parser.add_argument("--fast", action="store_true", help="Olabildiğince hızlı oynat (gerçek zamanlı değil)")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--backend", default="scripted", help="'scripted', 'ultralytics' veya 'onnx'")
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="scripted motor çıkarım süresi")
+    parser.add_argument("--schedule", default=config.DETECT_SCHEDULE, help="'every_frame', 'fixed' veya 'adaptive'")
+    parser.add_argument("--every-n", type=int, default=config.DETECT_EVERY_N)
+    args = parser.parse_args()
+    config.DETECT_SCHEDULE = args.schedule
+    config.DETECT_EVERY_N = args.every_n
+
+    if args.source == "replay":
+        inner = ReplaySource(args.path or config.REPLAY_PATH, realtime=not args.fast)
+    else:
+        inner = SyntheticSource(count=args.frames, realtime=not args.fast)
+    inner.start()
+    source = TimedSource(inner)
+
+    if args.backend == "scripted":
+        backend = CountingBackend(ScriptedBackend(args.latency_ms))
+    else:
+        backend = CountingBackend(create_backend(args.backend, device="cpu"))
+
+    motor = RecordingMotorController()
+    state_logger = StateLogger(log_enabled=False)
+    detection_thread = start_detection_thread(backend)
+    # Model yüklenene kadar bekle ki ölçüm soğuk başlangıcı içermesin
+    while detection_thread.is_alive() and backend.inner.load_time is None:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    try:
+        frames = control_loop(source, motor, state_logger, frame_q=frame_queue, result_q=result_queue,
+                              max_frames=args.frames, verbose=False)
+    finally:
+        elapsed = time.perf_counter() - start
+        detection_thread.stop()
+        detection_thread.join()
+        inner.stop()
+
+    latencies = actuation_latencies(source.read_times, motor.commands)
+    print(f"kaynak: {inner.name} | motor: {backend.name} | gerçek zamanlı: {not args.fast} | "
+          f"zamanlama: {args.schedule} (N={args.every_n})")
+    print(f"kare: {frames} | süre: {elapsed:.2f} s | kontrol döngüsü: {frames / elapsed:.1f} Hz | "
+          f"tespit: {backend.calls / elapsed:.1f} Hz")
+    if latencies.size:
+        print(f"okuma->motor gecikmesi ms: p50 {np.percentile(latencies, 50):.3f} | "
+              f"p99 {np.percentile(latencies, 99):.3f} | maks {latencies.max():.3f}")
+    print(f"motor pin yazma sayısı: {len(motor.commands)}")
+    stages = METRICS.summary()
+    stale = stages.get("result_stale", {}).get("count", 0)
+    if "result_age" in stages:
+        print(f"kullanılan sonuç yaşı ms: p50 {stages['result_age']['p50_ms']:.1f} | "
+              f"p99 {stages['result_age']['p99_ms']:.1f} | eski diye atılan: {stale}")
+    elif stale:
+        print(f"tüm sonuçlar eski diye atıldı ({stale}); RESULT_MAX_AGE = {config.RESULT_MAX_AGE} s")
+
+
+if __name__ == "__main__":
+    main()
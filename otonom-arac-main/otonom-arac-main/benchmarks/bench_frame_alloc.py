@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Yakalama -> tespit kare yolunda kare başına ayrılan bellek (eski vs FramePipeline).
+
+Kamera gerekmez: sentetik kaynak, Picamera2'nin eşlenmiş (MappedArray) tamponunu
+taklit eden sabit bir dizi döndürür. Ölçüm tracemalloc ile yapılır (numpy ve
+OpenCV çıktı dizileri numpy ayırıcısı üzerinden izlenir).
+
+Kullanım:
+    python3 benchmarks/bench_frame_alloc.py [--frames 200]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from frame_pipeline import FramePipeline  # noqa: E402
+
+
+class SyntheticCamera:
+    """Her çağrıda aynı eşlenmiş tamponu döndürür (DMA tamponu taklidi)."""
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.buffer = rng.integers(0, 256, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8)
+
+    def capture_array(self):
+        # Picamera2.capture_array() eşlenmiş tamponun kopyasını döndürür
+        return self.buffer.copy()
+
+    def mapped_array(self):
+        return self.buffer
+
+
+def legacy_step(camera, _pipeline):
+    frame_rgb = camera.capture_array()
+    frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+    small_frame = cv2.flip(frame, 1)
+    img_rgb_for_yolo = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+    return img_rgb_for_yolo, small_frame
+
+
+def pipeline_step(camera, pipeline):
+    # Çizim yayın tarafında yapıldığı için döngüde overlay kopyası yok
+    return pipeline.push(camera.mapped_array())
+
+
+def measure(step, camera, pipeline, frames):
+    # Isınma: halka yuvaları ve OpenCV iç tamponları ölçüm dışında kalsın
+    for _ in range(pipeline.ring_size):
+        step(camera, pipeline)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    total = 0
+    peak = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = step(camera, pipeline)
+        _, step_peak = tracemalloc.get_traced_memory()
+        total += step_peak - before
+        peak = max(peak, step_peak - before)
+        del result
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return total / frames, peak, elapsed / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    camera = SyntheticCamera()
+    print(f"{'yol':>13} | {'ort bayt/kare':>14} | {'tepe bayt':>10} | {'ms/kare':>8}")
+    for name, step, mirror in (("eski", legacy_step, False), ("pipeline", pipeline_step, False),
+                               ("pipeline+flip", pipeline_step, True)):
+        pipeline = FramePipeline(mirror=mirror)
+        avg, peak, ms = measure(step, camera, pipeline, args.frames)
+        print(f"{name:>13} | {avg:>14.0f} | {peak:>10.0f} | {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Kalite yöneticisi: ısınan SoC'de tespit hızı, sabit 320 px / N=3 ile karşılaştırma.
+
+Deterministik simülasyon (gerçek zaman beklenmez). SoC sıcaklığı bir iz
+boyunca yükselir, bekler ve soğur; 80 °C ve üstünde CPU frekansı düşer
+(Pi 4 kısması). Çıkarım süresi imgsz^2 ve frekansla ölçeklenir. Kamera 30 fps;
+tespit çalışanı meşgulken gelen kare düşer (maxsize=1 kuyruk gibi).
+Sensör değerleri sahte bir sysfs dizinine yazılır ve QualityGovernor bunu
+SocSensor ile okur (araçtakiyle aynı yol).
+
+Çıktı: zaman penceresi başına sıcaklık, basamak ve elde edilen tespit hızı;
+sonda hedef hızın (GOVERNOR_TARGET_HZ, marjlı) sağlandığı süre oranı.
+--trace ile t,temp_c,freq_mhz sütunlu bir CSV iz verilebilir (sahada
+`vcgencmd measure_temp` / sysfs'ten toplanmış).
+
+Kullanım:
+    python3 benchmarks/bench_governor.py [--duration 300 --base-ms 80 --window 30]
+    python3 benchmarks/bench_governor.py --trace termal_iz.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from governor import QualityGovernor, SocSensor  # noqa: E402
+
+CAMERA_FPS = 30.0
+MAX_FREQ_MHZ = 1800.0
+THROTTLED_FREQ_MHZ = 1000.0
+
+
+def synthetic_trace(duration):
+    """55 °C'den 82 °C'ye ısınma, bekleme ve soğuma; (t, temp_c, freq_mhz) listesi."""
+    trace = []
+    for t in np.arange(0.0, duration + 1.0, 1.0):
+        phase = t / duration
+        if phase < 0.4:
+            temp = 55.0 + 27.0 * phase / 0.4
+        elif phase < 0.7:
+            temp = 82.0
+        else:
+            temp = 82.0 - 27.0 * (phase - 0.7) / 0.3
+        freq = THROTTLED_FREQ_MHZ if temp >= 80.0 else MAX_FREQ_MHZ
+        trace.append((float(t), temp, freq))
+    return trace
+
+
+def load_trace(path):
+    with open(path, newline="") as f:
+        return [(float(row["t"]), float(row["temp_c"]), float(row["freq_mhz"])) for row in csv.DictReader(f)]
+
+
+class FakeSysfs:
+    """SocSensor'un okuduğu dosyaları geçici bir dizinde tutar."""
+    def __init__(self, root):
+        self.root = root
+        for path in (SocSensor.TEMP_PATH, SocSensor.FREQ_PATH, SocSensor.MAX_FREQ_PATH):
+            os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+        self._write(SocSensor.MAX_FREQ_PATH, int(MAX_FREQ_MHZ * 1000))
+
+    def _write(self, path, value):
+        with open(os.path.join(self.root, path), "w") as f:
+            f.write(f"{value}\n")
+
+    def set(self, temp_c, freq_mhz):
+        self._write(SocSensor.TEMP_PATH, int(temp_c * 1000))
+        self._write(SocSensor.FREQ_PATH, int(freq_mhz * 1000))
+
+
+def sample(trace, t):
+    """t anındaki iz değeri (önceki noktayı tutar)."""
+    index = max(0, np.searchsorted([p[0] for p in trace], t, side="right") - 1)
+    return trace[index][1], trace[index][2]
+
+
+def simulate(trace, args, governed, root):
+    """Kare kare simülasyon; (pencere başına satırlar, tespit zamanları, meşgul oranı)."""
+    sysfs = FakeSysfs(root)
+    governor = QualityGovernor(sensor=SocSensor(root), verbose=False) if governed else None
+    duration = trace[-1][0]
+    busy_until = 0.0
+    busy_time = 0.0
+    pending = [] # (bitiş anı, çıkarım süresi)
+    completions = []
+    rows = []
+    frames_since = config.DETECT_EVERY_N
+    imgsz, every_n = config.INFERENCE_IMGSZ, config.DETECT_EVERY_N
+
+    for index in range(int(duration * CAMERA_FPS)):
+        now = index / CAMERA_FPS
+        temp, freq = sample(trace, now)
+        sysfs.set(temp, freq)
+
+        # Biten çıkarımların süreleri yöneticiye bildirilir (kontrol döngüsü sonucu alınca)
+        while pending and pending[0][0] <= now:
+            done, latency = pending.pop(0)
+            completions.append(done)
+            if governor is not None:
+                governor.observe(latency)
+
+        if governor is not None:
+            point = governor.update(now)
+            imgsz, every_n = point.imgsz, point.every_n
+
+        frames_since += 1
+        if frames_since < every_n:
+            continue
+        frames_since = 0
+        if now < busy_until:
+            continue # Çalışan meşgul: kare düşer
+        latency = args.base_ms / 1000 * (imgsz / 320) ** 2 * (MAX_FREQ_MHZ / freq)
+        busy_until = now + latency
+        busy_time += latency
+        pending.append((busy_until, latency))
+
+    completions = np.asarray(completions)
+    for start in np.arange(0.0, duration, args.window):
+        end = min(start + args.window, duration)
+        hz = np.count_nonzero((completions >= start) & (completions < end)) / (end - start)
+        temp, freq = sample(trace, end - 1e-6)
+        rows.append((start, temp, freq, hz))
+    return rows, completions, busy_time / duration, governor
+
+
+def time_at_target(completions, duration, target):
+    """1 s'lik pencerelerde hedef hızı (marjlı) sağlanan sürenin oranı."""
+    counts = np.histogram(completions, bins=np.arange(0.0, duration + 1.0, 1.0))[0]
+    return float(np.mean(counts >= target * (1 - config.GOVERNOR_MARGIN)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=300.0, help="sentetik iz süresi (s)")
+    parser.add_argument("--base-ms", type=float, default=80.0, help="320 px, tam frekansta çıkarım süresi")
+    parser.add_argument("--window", type=float, default=30.0, help="rapor penceresi (s)")
+    parser.add_argument("--trace", help="t,temp_c,freq_mhz sütunlu CSV iz")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(args.duration)
+    duration = trace[-1][0]
+    target = config.GOVERNOR_TARGET_HZ
+    with tempfile.TemporaryDirectory() as root:
+        fixed_rows, fixed_done, fixed_busy, _ = simulate(trace, args, False, root)
+        gov_rows, gov_done, gov_busy, governor = simulate(trace, args, True, root)
+
+    print(f"çıkarım: {args.base_ms:.0f} ms @ 320 px | hedef: {target:.1f} Hz "
+          f"(-%{config.GOVERNOR_MARGIN * 100:.0f}) | kamera: {CAMERA_FPS:.0f} fps")
+    print(f"{'t s':>5} | {'°C':>5} | {'MHz':>5} | {'sabit Hz':>8} | {'yönetici Hz':>11}")
+    for (start, temp, freq, fixed_hz), (_, _, _, gov_hz) in zip(fixed_rows, gov_rows):
+        print(f"{start:>5.0f} | {temp:>5.1f} | {freq:>5.0f} | {fixed_hz:>8.1f} | {gov_hz:>11.1f}")
+
+    print(f"{'':>20}| {'hedefte süre':>12} | {'meşgul':>7}")
+    print(f"{'sabit 320 px, N=' + str(config.DETECT_EVERY_N):>20}| "
+          f"{time_at_target(fixed_done, duration, target):>11.0%} | {fixed_busy:>7.0%}")
+    print(f"{'yönetici':>20}| {time_at_target(gov_done, duration, target):>11.0%} | {gov_busy:>7.0%}")
+    print(f"[INFO] Basamak değişikliği: {governor.changes}, son durum: {governor.describe()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Loglamanın kontrol döngüsü titreşimine (jitter) etkisi.
+
+Sentetik kaynak gerçek zamanlı (--fps) oynatılır ve control_loop üç kez
+çalıştırılır: loglama kapalı, arka plan ikili log yazıcısı ve eski yol (her
+saniye pandas DataFrame + to_csv, döngü içinde). Raporlanan: ardışık kare
+okumaları arasındaki sürenin p50/p99/maks değeri, periyottan sapmanın
+standart sapması ve döngü içinde loglama çağrısında geçen sürenin maksimumu
+(titreşimin loglamadan gelen kısmı; diğer sütunlar makinenin gürültüsünü de
+içerir). Eski yol pandas yüklü değilse atlanır.
+
+Kullanım:
+    python3 benchmarks/bench_log_jitter.py [--frames 450 --fps 30]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from bench_end_to_end import ScriptedBackend, TimedSource  # noqa: E402
+from detector import frame_queue, result_queue  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+
+class LegacyCsvLogger(StateLogger):
+    """Eski StateLogger davranışı: tampon her saniye döngü içinde pandas ile CSV'ye eklenir."""
+    def __init__(self, path):
+        super().__init__(log_enabled=False)
+        import pandas as pd
+        self.pd = pd
+        self.path = path
+        self.log_buffer = []
+        self.last_write_time = time.time()
+        pd.DataFrame(columns=["timestamp", "x", "y", "direction", "source"]).to_csv(path, index=False)
+
+    def update_log_buffer(self, x, y, direction, source):
+        self.log_buffer.append([time.strftime("%H:%M:%S", time.localtime()), x, y, direction, source])
+        # Eski döngü her turda write_logs_to_disk() çağırıyordu
+        if time.time() - self.last_write_time >= config.LOG_WRITE_INTERVAL_SEC:
+            df = self.pd.DataFrame(self.log_buffer, columns=["timestamp", "x", "y", "direction", "source"])
+            df.to_csv(self.path, mode="a", header=False, index=False)
+            self.log_buffer = []
+            self.last_write_time = time.time()
+
+
+def timed_logging(state_logger):
+    """update_log_buffer çağrılarının döngü içinde aldığı süreyi (ms) kaydeder."""
+    durations = []
+    original = state_logger.update_log_buffer
+
+    def update_log_buffer(*args):
+        start = time.perf_counter()
+        original(*args)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    state_logger.update_log_buffer = update_log_buffer
+    return durations
+
+
+def run(state_logger, frames, fps):
+    log_durations = timed_logging(state_logger)
+    inner = SyntheticSource(count=frames, realtime=True, fps=fps)
+    inner.start()
+    source = TimedSource(inner)
+    backend = ScriptedBackend(latency_ms=5)
+    detection_thread = start_detection_thread(backend)
+    while backend.load_time is None:
+        time.sleep(0.01)
+    try:
+        control_loop(source, RecordingMotorController(), state_logger, frame_q=frame_queue,
+                     result_q=result_queue, max_frames=frames, verbose=False)
+    finally:
+        state_logger.close()
+        detection_thread.stop()
+        detection_thread.join()
+        inner.stop()
+    return np.diff(source.read_times) * 1000, max(log_durations, default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=450)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="log_jitter_")
+    config.LOG_DIR = tmp
+    variants = [("kapalı", lambda: StateLogger(log_enabled=False)),
+                ("ikili", lambda: StateLogger(log_enabled=True))]
+    try:
+        import pandas  # noqa: F401
+        variants.append(("eski csv", lambda: LegacyCsvLogger(os.path.join(tmp, "takip_log.csv"))))
+    except ImportError:
+        print("[UYARI] pandas yüklü değil, eski yol atlanıyor.")
+
+    period = 1000.0 / args.fps
+    print(f"periyot: {period:.2f} ms | kare: {args.frames} | loglar: {tmp}")
+    print(f"{'loglama':>9} | {'p50 ms':>7} | {'p99 ms':>7} | {'maks ms':>7} | {'sapma std ms':>12} | {'log maks ms':>11}")
+    for name, make in variants:
+        intervals, log_max = run(make(), args.frames, args.fps)
+        p50, p99 = np.percentile(intervals, [50, 99])
+        jitter = np.std(intervals - period)
+        print(f"{name:>9} | {p50:>7.2f} | {p99:>7.2f} | {intervals.max():>7.2f} | {jitter:>12.3f} | {log_max:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""StageMetrics ölçüm katmanının maliyeti.
+
+1) Mikro: record_ns ve span() çağrısı başına maliyet.
+2) Döngü: sentetik kaynak ile tek bir uzun control_loop; ölçüm her tespit
+   döngüsünde (DETECT_EVERY_N kare) açılıp kapanır ve ardışık açık/kapalı
+   döngüler çift olarak karşılaştırılır (ABBA sırası). Tespit (scripted motor)
+   döngüyle aynı thread'de yapılır, saat kare sırasından gelir ve yönetici
+   kapalıdır: her döngü aynı işi yapar, thread zamanlaması ve makinenin yavaş
+   kayması farka girmez.
+   Sonuç, çift farklarının medyanıdır (yüzde, standart hata ve çeyrekler arası
+   aralıkla); hedefi (--limit, varsayılan %1) aşarsa çıkış kodu 1'dir. Kayıt
+   sayısı x record_ns'ten beklenen değer yalnızca bilgi amaçlı basılır.
+
+Kullanım:
+    python3 benchmarks/bench_metrics.py [--frames 30000]
+"""
+import argparse
+import gc
+import os
+import queue
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from metrics import METRICS, StageMetrics  # noqa: E402
+
+
+def bench_micro(repeat=200000):
+    metrics = StageMetrics(enabled=True)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        metrics.record_ns("x", 1000)
+    record_ns = (time.perf_counter() - start) / repeat * 1e9
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with metrics.span("y"):
+            pass
+    span_ns = (time.perf_counter() - start) / repeat * 1e9
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        metrics.summary()
+    summary_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    print(f"record_ns: {record_ns:.0f} ns | span: {span_ns:.0f} ns | summary(): {summary_us:.0f} us")
+    return record_ns
+
+
+class InlineDetector:
+    """frame_q ve result_q yerine geçer: gönderilen kare put_nowait() içinde
+    aynı thread'de işlenir, sonuç bir sonraki get_nowait()'te döner. Tespit
+    thread'i olmadığından döngü süresi thread zamanlamasına bağlı değildir
+    (tek çekirdekte açık/kapalı farkını gürültü boğmaz)."""
+    def __init__(self, backend):
+        self.backend = backend
+        self.result = None
+
+    def put_nowait(self, packet):
+        from detector import detect_frame
+        from handoff import DetectionResult
+
+        # Tespit thread'inin kayıtları da yapılır (kare başına kayıt sayısı aynı kalır)
+        METRICS.record_ns("queue_wait", time.perf_counter_ns() - packet.capture_ns)
+        target, detections, infer_ns, post_ns = detect_frame(self.backend, packet.frame, packet.roi, packet.imgsz)
+        METRICS.record_ns("inference", infer_ns)
+        METRICS.record_ns("postprocess", post_ns)
+        self.result = DetectionResult(packet.seq, packet.capture_ns, target, detections, packet.camera, infer_ns)
+
+    def get_nowait(self):
+        result, self.result = self.result, None
+        if result is None:
+            raise queue.Empty
+        return result
+
+
+class ToggledSource:
+    """Kaynağı sarar: her karede ölçümü desene göre açar/kapatır ve okuma
+    anını kaydeder (iki okuma arası = bir döngü turu)."""
+    def __init__(self, inner, cycle):
+        self.inner = inner
+        self.pipeline = inner.pipeline
+        self.name = inner.name
+        self.cycle = cycle
+        self.read_ns = []
+
+    def enabled(self, index):
+        """Ardışık iki tespit döngüsü bir çifttir; çiftler ABBA sırasıyla
+        (açık-kapalı, kapalı-açık, ...) dizilir."""
+        pair, position = divmod(index // self.cycle, 2)
+        return position == pair % 2
+
+    def clock(self):
+        return self.inner.frame_index / self.inner.fps
+
+    def read(self):
+        self.read_ns.append(time.perf_counter_ns())
+        METRICS.enabled = self.enabled(len(self.read_ns) - 1)
+        return self.inner.read()
+
+
+def run_loop(frames, warmup):
+    """Tek control_loop; ölçüm tespit döngüsü başına açılıp kapanır. Çift başına
+    (açık - kapalı) / kapalı farkı (%) ile açık ve kapalı tur süreleri (us) döndürülür."""
+    from bench_end_to_end import ScriptedBackend
+    from frame_source import SyntheticSource
+    from logger import StateLogger
+    from main import control_loop
+    from motor_control import RecordingMotorController
+
+    backend = ScriptedBackend()
+    backend.load()
+    detector = InlineDetector(backend)
+    cycle = config.DETECT_EVERY_N
+    source = ToggledSource(SyntheticSource(count=frames + 1), cycle)
+    source.inner.start()
+    gc.collect()
+    control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False), frame_q=detector,
+                 result_q=detector, max_frames=frames, verbose=False, clock=source.clock)
+    METRICS.enabled = True
+
+    # Tur süresi: bu karenin okunmasından sonrakinin okunmasına kadar
+    durations = np.diff(np.asarray(source.read_ns, dtype=np.int64))
+    span = 2 * cycle # Bir çift: açık ve kapalı birer tespit döngüsü
+    start = -(-warmup // span) * span # Isınmadan sonraki ilk tam çift
+    pairs = (len(durations) - start) // span
+    per_cycle = durations[start:start + pairs * span].reshape(pairs, 2, cycle).sum(axis=2)
+    first_on = np.array([source.enabled(start + p * span) for p in range(pairs)])
+    on = np.where(first_on, per_cycle[:, 0], per_cycle[:, 1])
+    off = np.where(first_on, per_cycle[:, 1], per_cycle[:, 0])
+    return (on - off) / off * 100, on / cycle / 1000, off / cycle / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=30000)
+    parser.add_argument("--warmup", type=int, default=300, help="Ölçülmeyen ilk kare sayısı")
+    parser.add_argument("--limit", type=float, default=1.0, help="Kabul edilen ek yük (%%)")
+    args = parser.parse_args()
+
+    record_ns = bench_micro()
+
+    # Her tespit döngüsü aynı işi yapmalı: yönetici çıkarım süresine göre ayar
+    # değiştirir, döngü saati de gerçek zaman yerine kare sırasından gelir
+    config.GOVERNOR_ENABLED = False
+    before = sum(s["count"] for s in METRICS.summary().values())
+    overhead, on, off = run_loop(args.frames, args.warmup)
+    records_per_frame = (sum(s["count"] for s in METRICS.summary().values()) - before) / (args.frames / 2)
+
+    measured = float(np.median(overhead))
+    q1, q3 = np.percentile(overhead, [25, 75])
+    error = 1.2533 * overhead.std() / np.sqrt(len(overhead)) # Medyanın standart hatası (yaklaşık)
+    expected = records_per_frame * record_ns / 1000 / np.median(off) * 100
+    print(f"döngü turu ({len(overhead)} açık/kapalı çift): ölçüm kapalı {np.median(off):.1f} us | "
+          f"açık {np.median(on):.1f} us")
+    print(f"ölçülen ek yük (çift farklarının medyanı): {measured:+.2f}% ±{error:.2f} "
+          f"[çeyrekler arası {q1:+.1f}% .. {q3:+.1f}%] | hedef < %{args.limit:g}")
+    print(f"  kare başına {records_per_frame:.1f} kayıt x record_ns -> beklenen: {expected:.3f}%")
+    for stage, stats in METRICS.summary().items():
+        print(f"  {stage:>12}: p50 {stats['p50_ms']:.3f} ms | p95 {stats['p95_ms']:.3f} ms | p99 {stats['p99_ms']:.3f} ms")
+    if measured >= args.limit:
+        print(f"[HATA] Ölçüm katmanının ek yükü hedefin üstünde: {measured:+.2f}% >= %{args.limit:g}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""MJPEG yayını yük testi: N yerel HTTP istemcisi, paylaşımlı kodlama vs eski yol.
+
+Flask uygulaması rastgele bir portta başlatılır, bir yayıncı thread'i sentetik
+kareleri --fps hızında yayınlar. Her istemci akışı okur ve aldığı kareleri sayar.
+Raporlanan: kodlayıcı CPU süresi, saniyedeki kodlama sayısı ve istemci başına FPS.
+--slow ile bazı istemciler yavaş ağ taklidi yapar (okumalar arası bekleme).
+--query ile /video_feed profil parametreleri verilir (ör. "w=320&q=50");
+istemci başına alınan KB/s de raporlanır.
+
+Kullanım:
+    python3 benchmarks/bench_mjpeg_load.py --clients 1 3 5 --seconds 5
+    python3 benchmarks/bench_mjpeg_load.py --clients 3 --query "w=320&q=50&fps=15"
+"""
+import argparse
+import http.client
+import logging
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+import web_server  # noqa: E402
+from flask import Response  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+
+class LegacyState:
+    """Eski web_server.mjpeg_generator'ın kullandığı global kare + CPU sayacı."""
+    frame = None
+    encode_cpu_time = 0.0
+    encode_count = 0
+    lock = threading.Lock()
+
+
+def legacy_generator():
+    """Eski yol: her istemci kareyi kopyalar, kendisi kodlar ve 30 ms uyur."""
+    while True:
+        if LegacyState.frame is None:
+            time.sleep(0.05)
+            continue
+        frame_copy = LegacyState.frame.copy()
+        cpu_start = time.thread_time()
+        ok, buf = cv2.imencode(".jpg", frame_copy, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
+        with LegacyState.lock:
+            LegacyState.encode_cpu_time += time.thread_time() - cpu_start
+            LegacyState.encode_count += 1
+        yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + buf.tobytes() + b"\r\n"
+        time.sleep(0.03)
+
+
+@web_server.app.route("/legacy_feed")
+def legacy_feed():
+    return Response(legacy_generator(), mimetype="multipart/x-mixed-replace; boundary=frame")
+
+
+def publisher(stop, fps):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8)
+              for _ in range(config.FRAME_RING_SIZE)]
+    i = 0
+    while not stop.is_set():
+        frame = frames[i % len(frames)]
+        web_server.set_global_frame(frame)
+        LegacyState.frame = frame
+        i += 1
+        time.sleep(1.0 / fps)
+
+
+def client(port, path, seconds, counts, rates, idx, read_delay):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    deadline = time.monotonic() + seconds
+    frames = 0
+    received = 0
+    tail = b""
+    while time.monotonic() < deadline:
+        chunk = resp.read1(65536)
+        if not chunk:
+            break
+        received += len(chunk)
+        data = tail + chunk
+        frames += data.count(b"--frame")
+        tail = data[-8:]
+        if read_delay:
+            time.sleep(read_delay)
+    counts[idx] = frames / seconds
+    rates[idx] = received / seconds / 1024
+    conn.close()
+
+
+def run(port, path, n_clients, n_slow, seconds):
+    counts = [0.0] * n_clients
+    rates = [0.0] * n_clients
+    threads = [threading.Thread(target=client,
+                                args=(port, path, seconds, counts, rates, i, 0.2 if i < n_slow else 0.0))
+               for i in range(n_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts, rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--slow", type=int, default=0, help="Yavaş istemci sayısı")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0, help="Yayıncı kare hızı")
+    parser.add_argument("--query", default="", help="/video_feed parametreleri, ör. w=320&q=50")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, web_server.app, threaded=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    threading.Thread(target=publisher, args=(stop, args.fps), daemon=True).start()
+
+    broadcaster = web_server.BROADCASTER
+    feed = "/video_feed" + (f"?{args.query}" if args.query else "")
+    print(f"{'yol':>9} | {'istemci':>7} | {'kodlama/s':>9} | {'kodlayıcı CPU %':>15} | istemci FPS (KB/s)")
+    for n in args.clients:
+        for name, path in (("paylaşım", feed), ("eski", "/legacy_feed")):
+            state = broadcaster if name == "paylaşım" else LegacyState
+            cpu0, enc0 = state.encode_cpu_time, state.encode_count
+            fps, rates = run(port, path, n, min(args.slow, n), args.seconds)
+            cpu = (state.encode_cpu_time - cpu0) / args.seconds * 100
+            enc = (state.encode_count - enc0) / args.seconds
+            per_client = ", ".join(f"{f:.1f} ({r:.0f})" for f, r in zip(fps, rates))
+            print(f"{name:>9} | {n:>7} | {enc:>9.1f} | {cpu:>15.1f} | {per_client}")
+
+    stop.set()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
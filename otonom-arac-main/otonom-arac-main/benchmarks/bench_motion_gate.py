@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Hareket kapısı: araç dururken atlanan çıkarımlar ve hareket başlayınca tespit gecikmesi.
+
+Sentetik kişi önce araca yakın hareketsiz durur (YAKIN, motorlar durur),
+--still-sec saniye sonra yana yürümeye başlar. Arka plana kamera gürültüsü
+eklenir. control_loop hareket kapısı açık ve kapalı çalıştırılır:
+1) Durgun bölümde yapılan çıkarım sayısı ve atlanan oranı.
+2) Hareketin başladığı kare okunduktan, hareketi gösteren ilk tespit
+   sonucunun döngüde kullanılmasına kadar geçen süre.
+
+Kullanım:
+    python3 benchmarks/bench_motion_gate.py [--latency-ms 60 --still-sec 4 --runs 3]
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from bench_end_to_end import CountingBackend, ScriptedBackend  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from interframe import MotionGate  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+BOX_W, BOX_H = 240, 300 # CLOSE_WIDTH'ten geniş: kontrolcü YAKIN der ve durur
+
+
+class StillThenWalkSource(SyntheticSource):
+    """Kişi still_frames kare boyunca ortada durur, sonra yana yürür."""
+    def __init__(self, still_frames, count, fps=30.0, noise=6):
+        super().__init__(count=count, realtime=True, fps=fps)
+        self.still_frames = still_frames
+        self.noise = noise
+        self.backgrounds = None
+        self.onset = None # Hareketin başladığı karenin okunma anı (perf_counter)
+
+    def start(self):
+        super().start()
+        # Sensör gürültüsü: birkaç gürültülü arka plan sırayla kullanılır
+        rng = np.random.default_rng(1)
+        base = self.background.astype(np.int16)
+        self.backgrounds = [np.clip(base + rng.integers(-self.noise, self.noise + 1, base.shape), 0, 255)
+                            .astype(np.uint8) for _ in range(4)]
+
+    def target_box(self, index):
+        x1 = (config.FRAME_WIDTH - BOX_W) // 2 + 6 * max(0, index - self.still_frames)
+        y1 = (config.FRAME_HEIGHT - BOX_H) // 2
+        return x1, y1, x1 + BOX_W, y1 + BOX_H
+
+    def read(self):
+        if self.backgrounds is not None:
+            self.background = self.backgrounds[self.frame_index % len(self.backgrounds)]
+        frame = super().read()
+        if self.frame_index - 1 == self.still_frames:
+            self.onset = time.perf_counter()
+        return frame
+
+
+class ResumeProbe:
+    """control_loop'a recorder olarak verilir; hareketi gösteren ilk sonucu yakalar."""
+    def __init__(self, source, backend):
+        self.source = source
+        self.backend = backend
+        self.still_x1 = source.target_box(0)[0]
+        self.still_calls = None # Hareket başlayana kadar yapılan çıkarım
+        self.latency = None
+
+    def record(self, frame, t, detections, kalman_state, motor, direction):
+        if self.source.onset is None:
+            return
+        if self.still_calls is None:
+            self.still_calls = self.backend.calls
+        if self.latency is None and detections is not None and len(detections):
+            if abs(detections[0][0] - self.still_x1) >= 1:
+                self.latency = time.perf_counter() - self.source.onset
+
+
+def run(args, gated):
+    fps = 30.0
+    still_frames = int(args.still_sec * fps)
+    source = StillThenWalkSource(still_frames, still_frames + int(args.walk_sec * fps), fps=fps)
+    source.start()
+    backend = CountingBackend(ScriptedBackend(args.latency_ms))
+    frame_q, result_q = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+    detection_thread = start_detection_thread(backend, frame_q, result_q)
+    while detection_thread.is_alive() and backend.inner.load_time is None:
+        time.sleep(0.01)
+
+    config.MOTION_GATE_ENABLED = gated
+    gate = MotionGate() if gated else None
+    probe = ResumeProbe(source, backend)
+    try:
+        control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False),
+                     frame_q=frame_q, result_q=result_q, verbose=False, recorder=probe, gate=gate)
+    finally:
+        detection_thread.stop()
+        detection_thread.join()
+        source.stop()
+    skip_ratio = gate.skip_ratio if gate is not None else 0.0
+    return probe.still_calls, skip_ratio, probe.latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="scripted motor çıkarım süresi")
+    parser.add_argument("--still-sec", type=float, default=4.0)
+    parser.add_argument("--walk-sec", type=float, default=1.5)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"durgun: {args.still_sec:.1f} s | çıkarım: {args.latency_ms:.0f} ms | "
+          f"zamanlama: {config.DETECT_SCHEDULE} (N={config.DETECT_EVERY_N}) | "
+          f"yenileme: {config.MOTION_GATE_REFRESH_SEC:.1f} s")
+    print(f"{'kapı':>6} | {'durgun çıkarım':>14} | {'atlanan':>8} | {'hareket -> tespit ms (medyan, maks)':>36}")
+    for label, gated in (("kapalı", False), ("açık", True)):
+        results = [run(args, gated) for _ in range(args.runs)]
+        calls = np.median([r[0] for r in results])
+        skipped = np.mean([r[1] for r in results])
+        latencies = [r[2] * 1000 for r in results if r[2] is not None]
+        latency = f"{np.median(latencies):.0f}, {max(latencies):.0f}" if latencies else "-"
+        print(f"{label:>6} | {calls:>14.0f} | {skipped:>7.0%} | {latency:>36}")
+
+
+if __name__ == "__main__":
+    main()
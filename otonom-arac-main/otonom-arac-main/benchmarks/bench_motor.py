@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Motor komut katmanı: pin yazma sayısı, komut gecikmesi, eğim sınırı ve watchdog.
+
+Komut akışı ControllerEngine'den gelir: sahte hedef sağa sola gider, ara sıra
+kaybolur (arama modu) ve yaklaşır (YAKIN, dur). Sahte GPIO (RecordingMotorController)
+ile donanımsız ölçülür:
+1) Pin yazma: her komutta tüm pinlere yazan eski yol vs değişim bastırma.
+2) Motor thread'i (AsyncMotorDriver): komutlar CONTROL_RATE_HZ ile gerçek
+   zamanlı gönderilir; komut -> ilk pin yazma gecikmesi, yazma/s ve ardışık
+   yazmalar arasındaki en büyük hız adımı (eğim sınırı kontrolü).
+3) Watchdog: komutlar kesildikten sonra motorların durması ne kadar sürüyor.
+
+Kullanım:
+    python3 benchmarks/bench_motor.py [--seconds 3 --slew 4 --watchdog-ms 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from controller import ControllerEngine  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from motor_control import AsyncMotorDriver, RecordingMotorController  # noqa: E402
+
+
+class SpeedLog:
+    """ControllerEngine'e motor olarak verilir; istenen hızları toplar."""
+    def __init__(self):
+        self.speeds = []
+
+    def drive(self, speed_a, speed_b):
+        self.speeds.append((speed_a, speed_b))
+
+
+def sim_box(t):
+    """t anındaki sahte hedef kutusu; 4-5. saniyeler arası kayıp, 8. saniyeden sonra yakın."""
+    if 4.0 <= t % 10 < 5.0:
+        return None
+    cx = config.FRAME_WIDTH / 2 + 150 * np.sin(np.pi * t / 2)
+    half = 120 if t % 10 >= 8.0 else 40
+    return [cx - half, 140, cx + half, 340]
+
+
+def command_stream(seconds):
+    """Kontrolcünün seconds boyunca ürettiği (hız_a, hız_b) komutları."""
+    log = SpeedLog()
+    engine = ControllerEngine(log, StateLogger(log_enabled=False))
+    dt = 1.0 / config.CONTROL_RATE_HZ
+    for i in range(int(seconds * config.CONTROL_RATE_HZ)):
+        t = i * dt
+        engine.update_target(sim_box(t), track_id=1)
+        engine.step(t)
+    return log.speeds
+
+
+def count_writes(speeds, suppress):
+    motor = RecordingMotorController(suppress_redundant=suppress)
+    for speed_a, speed_b in speeds:
+        motor.drive(speed_a, speed_b)
+    return len(motor.commands)
+
+
+def signed_speeds(commands):
+    """Sahte GPIO kaydından her yazma sonrası (hız_a, hız_b) dizisi."""
+    pins = {"in1": 0, "in2": 0, "ena": 0.0, "in3": 0, "in4": 0, "enb": 0.0}
+    speeds = []
+    for _, pin, value in commands:
+        pins[pin] = value
+        if pin in ("ena", "enb"):
+            a = pins["ena"] * (1 if pins["in1"] else -1 if pins["in2"] else 0)
+            b = pins["enb"] * (1 if pins["in3"] else -1 if pins["in4"] else 0)
+            speeds.append((a, b))
+    return np.array(speeds)
+
+
+def run_async(speeds, args):
+    motor = RecordingMotorController(suppress_redundant=True)
+    driver = AsyncMotorDriver(motor, slew_rate=args.slew, watchdog_sec=args.watchdog_ms / 1000).start()
+    period = 1.0 / config.CONTROL_RATE_HZ
+    start = time.perf_counter()
+    next_tick = start
+    for speed_a, speed_b in speeds:
+        driver.drive(speed_a, speed_b)
+        next_tick += period
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+    live_writes = len(motor.commands)
+
+    # Komutlar kesilir: watchdog motorları durdurmalı (süre son drive() çağrısından)
+    last_command = driver.command_ns / 1e9
+    while driver.watchdog_stops == 0 and time.perf_counter() - last_command < 5:
+        time.sleep(0.001)
+    stop_delay = time.perf_counter() - last_command
+    driver.close()
+    return motor.commands[:live_writes], elapsed, stop_delay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Gerçek zamanlı bölümün süresi")
+    parser.add_argument("--slew", type=float, default=config.MOTOR_SLEW_RATE)
+    parser.add_argument("--watchdog-ms", type=float, default=config.MOTOR_WATCHDOG_SEC * 1000)
+    args = parser.parse_args()
+
+    speeds = command_stream(10.0)
+    print(f"komut akışı: {len(speeds)} komut (10 s, {config.CONTROL_RATE_HZ:.0f} Hz)")
+    for label, suppress in (("her komutta tüm pinler", False), ("değişim bastırma", True)):
+        writes = count_writes(speeds, suppress)
+        print(f"  {label:>22}: {writes:>6} pin yazma | {writes / len(speeds):.2f} / komut")
+
+    live = speeds[:int(args.seconds * config.CONTROL_RATE_HZ)]
+    commands, elapsed, stop_delay = run_async(live, args)
+    applied = signed_speeds(commands)
+    steps = np.abs(np.diff(applied, axis=0)).max() if len(applied) > 1 else 0.0
+    latency = METRICS.summary().get("actuation", {})
+    print(f"motor thread'i ({elapsed:.1f} s): {len(commands) / elapsed:.0f} pin yazma/s | "
+          f"komut -> pin p50 {latency.get('p50_ms', float('nan')):.3f} ms, "
+          f"p99 {latency.get('p99_ms', float('nan')):.3f} ms")
+    print(f"  en büyük hız adımı: {steps:.3f} (eğim {args.slew}/s, {config.MOTOR_RATE_HZ:.0f} Hz'de "
+          f"~{args.slew / config.MOTOR_RATE_HZ:.3f}/adım)")
+    print(f"  watchdog: son komuttan {stop_delay * 1000:.0f} ms sonra durdurdu "
+          f"(eşik {args.watchdog_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Çoklu kamera: iki ayrı model çağrısı vs tek toplu (batch) çağrı.
+
+1) Motor: aynı iki kare için iki infer() çağrısı ile tek infer_batch()
+   çağrısının süresi (ms). --backend scripted çağrı başına sabit maliyeti
+   (--call-ms: ön/son işleme, çekirdek başlatma) ve kare başına maliyeti
+   (--image-ms) taklit eder; gerçek kazanç için --backend ultralytics/onnx
+   (ONNX modeli export_onnx.py --dynamic ile dışa aktarılmalı).
+2) Uçtan uca: ön + arka sentetik kaynak gerçek zamanlı okunur, her turda iki
+   kare CameraMailbox ile DetectionThread'e gönderilir. Toplu (DETECT_MAX_BATCH=2)
+   ve tek tek (1) işleme için kamera başına sonuç/s ve sonuç yaşı.
+
+Kullanım:
+    python3 benchmarks/bench_multicam.py [--call-ms 20 --image-ms 10 --seconds 3]
+    python3 benchmarks/bench_multicam.py --backend onnx
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backends import InferenceBackend, create_backend  # noqa: E402
+from bench_end_to_end import ScriptedBackend  # noqa: E402
+from detector import DetectionThread  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from handoff import CameraMailbox, ResultHandoff  # noqa: E402
+
+CAMERAS = ("front", "rear")
+
+
+class BatchCostBackend(ScriptedBackend):
+    """Çağrı başına sabit + kare başına maliyetli scripted motor."""
+    name = "scripted-batch"
+
+    def __init__(self, call_ms=20.0, image_ms=10.0):
+        super().__init__(0.0)
+        self.call = call_ms / 1000
+        self.image = image_ms / 1000
+
+    def infer(self, image, imgsz=None):
+        time.sleep(self.call + self.image)
+        return super().infer(image, imgsz)
+
+    def infer_batch(self, images, imgsz=None):
+        time.sleep(self.call + self.image * len(images))
+        return [super(BatchCostBackend, self).infer(image, imgsz) for image in images]
+
+
+class LoadedBackend(InferenceBackend):
+    """Yüklenmiş motoru sarar; her DetectionThread'de yeniden yüklenmesin."""
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.name = inner.name
+
+    def load(self):
+        return self.inner.load_time
+
+    def warmup(self, imgsz=None):
+        pass
+
+    def infer(self, image, imgsz=None):
+        return self.inner.infer(image, imgsz)
+
+    def infer_batch(self, images, imgsz=None):
+        return self.inner.infer_batch(images, imgsz)
+
+
+def make_backend(args):
+    if args.backend == "scripted":
+        return BatchCostBackend(args.call_ms, args.image_ms)
+    return create_backend(args.backend, device="cpu")
+
+
+def bench_backend(backend, frames, iterations):
+    separate = np.empty(iterations)
+    batched = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        for frame in frames:
+            backend.infer(frame)
+        separate[i] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        backend.infer_batch(frames)
+        batched[i] = time.perf_counter() - start
+    return np.median(separate) * 1000, np.median(batched) * 1000
+
+
+def run_cameras(backend, max_batch, seconds, fps):
+    sources = {camera: SyntheticSource(realtime=True, fps=fps) for camera in CAMERAS}
+    for source in sources.values():
+        source.start()
+    frame_q = CameraMailbox(CAMERAS)
+    result_qs = {camera: queue.Queue(maxsize=1) for camera in CAMERAS}
+    handoffs = {camera: ResultHandoff(camera=camera) for camera in CAMERAS}
+    ages = {camera: [] for camera in CAMERAS}
+
+    thread = DetectionThread(LoadedBackend(backend), frame_q, result_qs, max_batch=max_batch)
+    thread.daemon = True
+    thread.start()
+
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        # Kameralar aynı turda okunur, kareler arka arkaya gönderilir
+        frames = {camera: source.read() for camera, source in sources.items()}
+        now = time.perf_counter()
+        for camera, frame in frames.items():
+            handoffs[camera].submit(frame_q, frame, None, time.perf_counter_ns(), now)
+        for camera in CAMERAS:
+            if handoffs[camera].poll(result_qs[camera], time.perf_counter()) is not None:
+                ages[camera].append(handoffs[camera].age * 1000)
+    elapsed = time.perf_counter() - start
+    thread.stop()
+    thread.join()
+    return {camera: (len(ages[camera]) / elapsed, np.median(ages[camera]) if ages[camera] else float("nan"))
+            for camera in CAMERAS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="scripted", help="'scripted', 'ultralytics' veya 'onnx'")
+    parser.add_argument("--call-ms", type=float, default=20.0, help="scripted: çağrı başına sabit maliyet")
+    parser.add_argument("--image-ms", type=float, default=10.0, help="scripted: kare başına maliyet")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    backend = make_backend(args)
+    backend.load()
+    backend.warmup()
+    source = SyntheticSource()
+    source.start()
+    frames = [source.read().copy(), source.read().copy()]
+
+    separate, batched = bench_backend(backend, frames, args.iterations)
+    print(f"motor: {backend.name} | 2 kare")
+    print(f"  iki ayrı çağrı: {separate:.2f} ms | tek toplu çağrı: {batched:.2f} ms | "
+          f"oran: {batched / separate:.2f}")
+
+    print(f"{'işleme':>8} | {'kamera':>6} | {'sonuç/s':>8} | {'yaş p50 ms':>10}")
+    for label, max_batch in (("tek tek", 1), ("toplu", len(CAMERAS))):
+        stats = run_cameras(backend, max_batch, args.seconds, args.fps)
+        for camera, (rate, age) in stats.items():
+            print(f"{label:>8} | {camera:>6} | {rate:>8.1f} | {age:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
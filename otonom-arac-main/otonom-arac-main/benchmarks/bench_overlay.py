@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Overlay çizimi: kontrol döngüsünde kare başına çizim vs yayın tarafında çizim.
+
+1) Eski yol (kontrol döngüsünde her kare): yörünge listesine ekle + pop(0),
+   karenin önceden ayrılmış overlay tamponuna kopyası, kutu/yazılar ve 99 ayrı cv2.line çağrısı.
+2) Yeni yol, kontrol döngüsü: TrajectoryRing'e ekleme + OverlayInfo anlık
+   görüntüsü + FrameBroadcaster.publish(). İzleyici yoksa maliyet bu kadardır.
+3) Yeni yol, yayın tarafı: izleyici varken kare başına bir render_overlay()
+   (tek cv2.polylines çağrısı).
+
+Kullanım:
+    python3 benchmarks/bench_overlay.py [--iterations 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from frame_pipeline import FramePipeline  # noqa: E402
+from overlay import OverlayInfo, TrajectoryRing, render_overlay  # noqa: E402
+from web_server import FrameBroadcaster  # noqa: E402
+
+BOX = (250, 140, 330, 340)
+
+
+def walk(n):
+    """Kalman tahmini benzeri yumuşak rastgele yürüyüş (x, y) noktaları."""
+    rng = np.random.default_rng(0)
+    steps = rng.normal(0, 4, (n, 2)).cumsum(axis=0)
+    return (steps + (config.FRAME_WIDTH // 2, config.FRAME_HEIGHT // 2)).astype(int)
+
+
+def legacy_step(overlay, frame, points, x, y):
+    """Eski main.py çizimi (FramePipeline.overlay() yuvası yerine overlay tamponu)."""
+    points.append((x, y))
+    if len(points) > 100:
+        points.pop(0)
+    np.copyto(overlay, frame)
+    small_frame = overlay
+    x1, y1, x2, y2 = BOX
+    cv2.rectangle(small_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    cv2.circle(small_frame, (x, y), 5, (0, 0, 255), -1)
+    cv2.putText(small_frame, "ID 1", (x1, max(y1 - 8, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+    cv2.putText(small_frame, "MERKEZ | UZAK", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
+    for i in range(1, len(points)):
+        cv2.line(small_frame, points[i - 1], points[i], (0, 0, 255), 2)
+    cv2.putText(small_frame, "FPS: 30 | Tespit: 10.0 Hz", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+    cv2.putText(small_frame, "Sonuc yasi: 40 ms | Eski: 0", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    return small_frame
+
+
+def overlay_info(ring, x, y):
+    return OverlayInfo(BOX, 1, (int(x), int(y)), True, "MERKEZ", "UZAK", "", 30.0, 10.0, 0.04, 0, 0.0,
+                       ring.points())
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1e6
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    pipeline = FramePipeline()
+    rng = np.random.default_rng(1)
+    raw = rng.integers(0, 256, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8)
+    path = walk(args.iterations)
+
+    legacy, loop_side, render_side = [], [], []
+    points = []
+    ring = TrajectoryRing(100)
+    broadcaster = FrameBroadcaster()
+    canvas = np.empty_like(raw)
+    legacy_canvas = np.empty_like(raw)
+    for x, y in path:
+        frame = pipeline.push(raw)
+
+        start = time.perf_counter()
+        legacy_step(legacy_canvas, frame, points, int(x), int(y))
+        legacy.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ring.append(x, y)
+        info = overlay_info(ring, x, y)
+        broadcaster.publish(frame, info)
+        loop_side.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        render_overlay(canvas, frame, info)
+        render_side.append(time.perf_counter() - start)
+
+    print(f"{'yol':>34} | {'p50 µs':>8} | {'p99 µs':>8}")
+    for label, samples in (("eski: kontrol döngüsünde çizim", legacy),
+                           ("yeni: kontrol döngüsü (yayınla)", loop_side),
+                           ("yeni: yayın tarafında çizim", render_side)):
+        p50, p99 = percentiles(samples)
+        print(f"{label:>34} | {p50:>8.1f} | {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
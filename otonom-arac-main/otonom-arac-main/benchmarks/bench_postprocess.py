@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Eski kutu-kutu döngü ile vektörel post-processing karşılaştırması.
+
+Kullanım:
+    python3 benchmarks/bench_postprocess.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from postprocess import postprocess  # noqa: E402
+
+
+class FakeTensor:
+    """torch.Tensor'un .cpu().numpy() zincirini taklit eder (cihaz senkronu dahil değildir)."""
+    def __init__(self, array):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+    def __getitem__(self, idx):
+        return FakeTensor(self._array[idx])
+
+
+class FakeBox:
+    def __init__(self, row):
+        self.xyxy = FakeTensor(row[None, :4])
+        self.conf = FakeTensor(row[None, 4])
+        self.cls = FakeTensor(row[None, 5])
+
+
+class FakeBoxes:
+    """ultralytics.engine.results.Boxes arayüzünün benchmark için gereken kısmı."""
+    def __init__(self, data):
+        self.data = FakeTensor(data)
+        self._boxes = [FakeBox(row) for row in data]
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __iter__(self):
+        return iter(self._boxes)
+
+
+def legacy_postprocess(boxes):
+    """detector.py'deki eski döngü (karşılaştırma için birebir kopya)."""
+    preds_v8_format = []
+    for box in boxes:
+        class_id = int(box.cls[0].cpu().numpy())
+        if class_id == 0:
+            x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
+            conf = float(box.conf[0].cpu().numpy())
+            if conf > 0.25:
+                preds_v8_format.append([x1, y1, x2, y2, conf, class_id])
+
+    target = None
+    max_area = 0
+    for row in preds_v8_format:
+        x1, y1, x2, y2 = map(int, row[:4])
+        area = (x2 - x1) * (y2 - y1)
+        if area > max_area:
+            max_area = area
+            target = row
+    return target
+
+
+def make_boxes(n, rng):
+    xy = rng.uniform(0, 600, size=(n, 2))
+    wh = rng.uniform(10, 200, size=(n, 2))
+    conf = rng.uniform(0.05, 1.0, size=(n, 1))
+    cls = rng.integers(0, 3, size=(n, 1))
+    data = np.hstack([xy, xy + wh, conf, cls]).astype(np.float32)
+    return FakeBoxes(data)
+
+
+def time_it(fn, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'kutu':>6} | {'eski (us)':>10} | {'yeni (us)':>10} | {'hızlanma':>8}")
+    for n in (1, 10, 100):
+        boxes = make_boxes(n, rng)
+        legacy_us = time_it(legacy_postprocess, boxes, args.repeat)
+        new_us = time_it(postprocess, boxes, args.repeat)
+        print(f"{n:>6} | {legacy_us:>10.1f} | {new_us:>10.1f} | {legacy_us / new_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
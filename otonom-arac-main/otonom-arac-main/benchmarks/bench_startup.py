@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Soğuk açılış: süreç başlangıcından ilk takip edilen kareye kadar zaman çizelgesi.
+
+Her mod ayrı (soğuk) bir Python sürecinde çalıştırılır. 'sequential' modda
+model yüklenip ısındıktan sonra kamera açılır (eski sıra), 'parallel' modda
+model tespit thread'inde yüklenirken kamera açılır (main.py'deki sıra).
+Kamera açılışı --camera-ms ile, scripted motorun model yüklemesi --load-ms
+ile taklit edilir; --backend ultralytics/onnx ile gerçek model ve model
+önbelleği (MODEL_CACHE_DIR) ölçülür. İlk çalıştırma önbelleği doldurur.
+
+Kullanım:
+    python3 benchmarks/bench_startup.py [--camera-ms 1500 --load-ms 2000]
+    python3 benchmarks/bench_startup.py --backend onnx --runs 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from startup import STARTUP  # noqa: E402  (zaman çizelgesi importlardan önce başlar)
+import config  # noqa: E402
+from backends import create_backend  # noqa: E402
+from bench_end_to_end import ScriptedBackend  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+PHASES = ["imports", "model_load", "warmup", "camera", "first_frame", "first_result", "first_tracked"]
+
+
+class SlowLoadBackend(ScriptedBackend):
+    """Model yüklemesini load_ms uyku ile taklit eden scripted motor."""
+    def __init__(self, load_ms, latency_ms=30.0):
+        super().__init__(latency_ms)
+        self.load_ms = load_ms
+
+    def _load(self):
+        time.sleep(self.load_ms / 1000)
+
+
+def start_camera(camera_ms):
+    time.sleep(camera_ms / 1000) # Picamera2 açılışı taklidi
+    source = SyntheticSource(count=300, realtime=True)
+    source.start()
+    STARTUP.mark("camera")
+    return source
+
+
+def run_child(args):
+    """Tek soğuk açılış; zaman çizelgesini JSON olarak son satıra yazar."""
+    config.DETECT_SCHEDULE = "every_frame"
+    if args.backend == "scripted":
+        backend = SlowLoadBackend(args.load_ms)
+    else:
+        backend = create_backend(args.backend, device="cpu")
+
+    detection_thread = start_detection_thread(backend)
+    if args.mode == "sequential":
+        while detection_thread.is_alive() and "warmup" not in STARTUP.phases:
+            time.sleep(0.005)
+    source = start_camera(args.camera_ms)
+
+    try:
+        control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False),
+                     max_frames=args.frames, verbose=False)
+    finally:
+        detection_thread.stop()
+        detection_thread.join()
+        source.stop()
+    print(json.dumps(STARTUP.summary()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="scripted", help="'scripted', 'ultralytics' veya 'onnx'")
+    parser.add_argument("--camera-ms", type=float, default=1500.0)
+    parser.add_argument("--load-ms", type=float, default=2000.0, help="scripted motor yükleme süresi")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=1, help="Mod başına soğuk açılış sayısı (son çalıştırma raporlanır)")
+    parser.add_argument("--mode", choices=["sequential", "parallel"], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        run_child(args)
+        return
+
+    timelines = {}
+    for mode in ("sequential", "parallel"):
+        for _ in range(args.runs):
+            cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode, "--backend", args.backend,
+                   "--camera-ms", str(args.camera_ms), "--load-ms", str(args.load_ms), "--frames", str(args.frames)]
+            output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            timelines[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"motor: {args.backend} | kamera açılışı: {args.camera_ms:.0f} ms")
+    print(f"{'aşama (ms)':>14} | {'sequential':>10} | {'parallel':>10}")
+    for phase in PHASES:
+        row = [timelines[mode].get(phase) for mode in ("sequential", "parallel")]
+        print(f"{phase:>14} | " + " | ".join(f"{v:>10.1f}" if v is not None else f"{'-':>10}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
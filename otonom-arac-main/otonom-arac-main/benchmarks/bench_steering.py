@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Simüle hedefte direksiyon karşılaştırması: P-kontrol vs gecikme telafili PID.
+
+Basit bir araç modeli: hedefin görüntüdeki yatay sapması e (piksel), aracın
+dönüş hızı motor farkı ile orantılıdır ve birinci dereceden gecikmeyle oturur.
+Kamera --fps hızında kare alır, her karenin tespiti --latency-ms sonra
+kontrolcüye ulaşır; kontrolcü CONTROL_RATE_HZ ile adım atar.
+Senaryolar: "basamak" (hedef 200 px yanda, sabit) ve "yürüyen" (hedef sabit
+hızla yana kayar). Raporlanan: yerleşme süresi (|e| ölü bölgede kalana kadar),
+aşım (%), ikinci yarıdaki RMS hata ve hatanın ölü bölgenin bir tarafından
+diğerine geçiş sayısı (salınım).
+
+Sonda main.control_loop pid modunda, kare başına adımla (CONTROL_THREADED
+kapalı) main() ile aynı kurulumla çalıştırılır: tahmin edilen hedef kareden
+çok uzağa düşerse veya döngü hata verirse çıkış kodu 1'dir (kare saati ile
+kontrolcü saatinin karışmasına karşı regresyon kontrolü).
+
+Kullanım:
+    python3 benchmarks/bench_steering.py [--latency-ms 120 --fps 30]
+"""
+import argparse
+import os
+import queue
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from bench_end_to_end import ScriptedBackend  # noqa: E402
+from controller import ControllerEngine  # noqa: E402
+from frame_source import SyntheticSource  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+SIM_DT = 0.002   # Fizik adımı (s)
+YAW_GAIN = 400.0 # Birim motor farkı başına dönüş hızı (piksel/s)
+MOTOR_TAU = 0.08 # Motor tepkisi zaman sabiti (s)
+
+
+class SimMotor:
+    """drive() arayüzünü sağlayan motor; son komutu tutar."""
+    def __init__(self):
+        self.speed_a = 0.0
+        self.speed_b = 0.0
+
+    def drive(self, speed_a, speed_b):
+        self.speed_a, self.speed_b = speed_a, speed_b
+
+
+def simulate(mode, scenario, latency, fps, seconds, width):
+    clock = {"t": 0.0}
+    motor = SimMotor()
+    engine = ControllerEngine(motor, StateLogger(log_enabled=False), clock=lambda: clock["t"], mode=mode)
+
+    e0 = 200.0 if scenario == "basamak" else 0.0
+    target_rate = 0.0 if scenario == "basamak" else 60.0
+    e, omega = e0, 0.0
+    control_period = 1.0 / config.CONTROL_RATE_HZ
+    frame_period = 1.0 / fps
+    next_control, next_frame = 0.0, 0.0
+    in_flight = [] # (teslim zamanı, yakalama zamanı, e)
+    errors = []
+
+    for i in range(int(seconds / SIM_DT)):
+        t = i * SIM_DT
+        clock["t"] = t
+        if t >= next_frame:
+            in_flight.append((t + latency, t, e))
+            next_frame += frame_period
+        while in_flight and in_flight[0][0] <= t:
+            _, captured, measured = in_flight.pop(0)
+            cx = config.FRAME_WIDTH / 2 + measured
+            engine.update_target([cx - width / 2, 140, cx + width / 2, 140 + 2 * width], track_id=1,
+                                 age=t - captured)
+        if t >= next_control:
+            engine.step(t)
+            next_control += control_period
+
+        command = YAW_GAIN * (motor.speed_a - motor.speed_b)
+        omega += (command - omega) * SIM_DT / MOTOR_TAU
+        e += (target_rate - omega) * SIM_DT
+        errors.append(e)
+
+    errors = np.array(errors)
+    outside = np.flatnonzero(np.abs(errors) > config.DEADZONE)
+    settle = (outside[-1] + 1) * SIM_DT if outside.size else 0.0
+    if settle >= seconds - SIM_DT:
+        settle = float("inf")
+    overshoot = max(0.0, -errors.min() / e0 * 100) if e0 else float("nan")
+    sides = np.sign(errors[np.abs(errors) > config.DEADZONE])
+    reversals = int(np.count_nonzero(np.diff(sides)))
+    rms = float(np.sqrt(np.mean(errors[len(errors) // 2:] ** 2)))
+    return settle, overshoot, rms, reversals
+
+
+class PredictionCheck:
+    """control_loop'a recorder olarak verilir; her turun Kalman tahminini toplar."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.predictions = []
+
+    def record(self, frame, frame_time, detections, kalman_state, motor, direction):
+        output = self.engine.output
+        self.predictions.append((output.pred_x, output.pred_y))
+
+
+def loop_check(frames):
+    """pid + kare başına adım: main() kurulumu (varsayılan saatli ControllerEngine).
+    Tahminlerin hepsi kare çevresinde kaldıysa True."""
+    saved = config.STEERING_MODE, config.CONTROL_THREADED
+    config.STEERING_MODE, config.CONTROL_THREADED = "pid", False
+    frame_q, result_q = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+    detection_thread = start_detection_thread(ScriptedBackend(), frame_q, result_q)
+    source = SyntheticSource(count=frames)
+    source.start()
+    motor = RecordingMotorController()
+    state_logger = StateLogger(log_enabled=False)
+    engine = ControllerEngine(motor, state_logger)
+    check = PredictionCheck(engine)
+    try:
+        control_loop(source, motor, state_logger, frame_q=frame_q, result_q=result_q,
+                     verbose=False, recorder=check, engine=engine)
+    except Exception as e:
+        print(f"[HATA] control_loop (pid, kare başına) hata verdi: {e!r}")
+        return False
+    finally:
+        detection_thread.stop()
+        detection_thread.join()
+        config.STEERING_MODE, config.CONTROL_THREADED = saved
+
+    # Arama sırasında tahmin hafifçe dışarı taşabilir; saat karışması ~1e9 px verir
+    points = np.array(check.predictions, dtype=np.float64).reshape(-1, 2)
+    limit = 2 * max(config.FRAME_WIDTH, config.FRAME_HEIGHT)
+    worst = float(np.abs(points).max()) if points.size else 0.0
+    print(f"[INFO] control_loop pid kontrolü: {len(points)} tur, en büyük |tahmin| {worst:.0f} px")
+    if worst > limit:
+        print(f"[HATA] Tahmin kare dışında ({worst:.0f} px > {limit} px): saatler karışmış olabilir")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=120.0, help="Tespit gecikmesi")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--width", type=float, default=80.0, help="Hedef kutu genişliği (piksel)")
+    parser.add_argument("--loop-frames", type=int, default=150, help="control_loop kontrolündeki kare sayısı")
+    args = parser.parse_args()
+
+    print(f"gecikme: {args.latency_ms:.0f} ms | kamera: {args.fps:.0f} FPS | kontrol: {config.CONTROL_RATE_HZ:.0f} Hz")
+    print(f"{'senaryo':>8} | {'mod':>4} | {'yerleşme s':>10} | {'aşım %':>7} | {'RMS px':>7} | {'salınım':>7}")
+    for scenario in ("basamak", "yürüyen"):
+        for mode in ("p", "pid"):
+            settle, overshoot, rms, reversals = simulate(mode, scenario, args.latency_ms / 1000, args.fps,
+                                                         args.seconds, args.width)
+            print(f"{scenario:>8} | {mode:>4} | {settle:>10.2f} | {overshoot:>7.1f} | {rms:>7.1f} | {reversals:>7}")
+
+    if not loop_check(args.loop_frames):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
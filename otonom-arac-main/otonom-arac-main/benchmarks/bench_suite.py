@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Tekrarlanabilir benchmark paketi: aşama aşama ve uçtan uca, JSON çıktı ve taban karşılaştırması.
+
+Kamera, GPIO ve model gerektirmez (sentetik veya kayıtlı kareler, sahte GPIO,
+scripted motor). Her aşama ayrı bir Python sürecinde --repeats kez ölçülür ve her ölçünün
+medyanı alınır; böylece aşamalar birbirinin belleğini etkilemez, tepe RSS
+aşamaya aittir ve tek seferlik zamanlama gürültüsü sonucu belirlemez.
+
+Aşamalar:
+    frame       kare okuma + halka yuvasına dönüştürme (aynalama dahil)
+    detect      detect_frame: çıkarım + vektörel post-processing
+    kalman      StateLogger Kalman tahmin + düzeltme
+    control     ControllerEngine.step (sahte GPIO ile motor yazması dahil)
+    log         takip logu kaydı (ikili log yazıcı, diske yazma dahil)
+    mjpeg       yayın: overlay çizimi + JPEG kodlama (FrameBroadcaster)
+    end_to_end  control_loop + DetectionThread, kare başına döngü süresi
+
+Her aşama için işlem/s, p50/p99 (ms) ve tepe RSS (MB) raporlanır. --baseline
+dosyası varsa sonuçlar onunla karşılaştırılır; --tolerance'tan (p99 için daha
+gürültülü olduğundan --tail-tolerance'tan) fazla kötüleşme GERİLEME olarak
+işaretlenir ve çıkış kodu 1 olur. Taban, referans makinede
+--save-baseline ile oluşturulur (sonuçlar makineye bağlıdır).
+
+Kullanım:
+    python3 benchmarks/bench_suite.py --save-baseline                 # Referans makinede
+    python3 benchmarks/bench_suite.py --output sonuc.json             # Karşılaştır + JSON kaydet
+    python3 benchmarks/bench_suite.py --source replay --path kayit.mp4 --stages frame detect end_to_end
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+
+STAGES = ["frame", "detect", "kalman", "control", "log", "mjpeg", "end_to_end"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def make_source(args):
+    from frame_source import ReplaySource, SyntheticSource
+    if args.source == "replay":
+        source = ReplaySource(args.path or config.REPLAY_PATH, realtime=False, loop=True)
+    else:
+        source = SyntheticSource(realtime=False)
+    source.start()
+    return source
+
+
+def make_backend(args):
+    from backends import create_backend
+    from bench_end_to_end import ScriptedBackend
+    if args.backend == "scripted":
+        return ScriptedBackend(args.latency_ms)
+    return create_backend(args.backend, device="cpu")
+
+
+def timed(fn, count, warmup=0):
+    """fn(i)'yi i = 0..warmup-1 için ölçülmeden, sonra i = warmup..warmup+count-1
+    için ölçerek çağırır (indeks kesintisiz ilerler, zaman geri gitmez);
+    (çağrı başına ns dizisi, toplam s)."""
+    for i in range(warmup):
+        fn(i)
+    samples = np.empty(count, dtype=np.int64)
+    start = time.perf_counter()
+    for n in range(count):
+        t0 = time.perf_counter_ns()
+        fn(warmup + n)
+        samples[n] = time.perf_counter_ns() - t0
+    return samples, time.perf_counter() - start
+
+
+def stage_frame(args):
+    source = make_source(args)
+    samples, elapsed = timed(lambda i: source.read(), args.frames)
+    source.stop()
+    return samples, elapsed, args.frames
+
+
+def stage_detect(args):
+    from detector import detect_frame
+    source = make_source(args)
+    frames = [source.read().copy() for _ in range(min(args.frames, 16))]
+    backend = make_backend(args)
+    backend.load()
+    backend.warmup()
+    samples, elapsed = timed(lambda i: detect_frame(backend, frames[i % len(frames)], None), args.frames,
+                             warmup=len(frames))
+    return samples, elapsed, args.frames
+
+
+def box_path(count):
+    """Sağa sola giden hedefin (cx, cy, genişlik) dizisi."""
+    t = np.arange(count) / config.CONTROL_RATE_HZ
+    cx = config.FRAME_WIDTH / 2 + 150 * np.sin(np.pi * t / 2)
+    width = 60 + 50 * (1 + np.sin(np.pi * t / 5))
+    return np.stack([cx, np.full(count, config.FRAME_HEIGHT / 2), width], axis=1)
+
+
+STEP_WARMUP = 100 # Kalman / kontrol aşamalarında ölçülmeyen ilk adım sayısı
+
+
+def stage_kalman(args):
+    from logger import StateLogger
+    state_logger = StateLogger(log_enabled=False)
+    path = box_path(STEP_WARMUP + args.iterations)
+    dt = 1.0 / config.CONTROL_RATE_HZ
+
+    def step(i):
+        state_logger.kalman_predict(dt)
+        state_logger.kalman_correct(np.array([[np.float32(path[i, 0])], [np.float32(path[i, 1])]]))
+
+    samples, elapsed = timed(step, args.iterations, warmup=STEP_WARMUP)
+    return samples, elapsed, args.iterations
+
+
+def stage_control(args):
+    from controller import ControllerEngine
+    from logger import StateLogger
+    from motor_control import RecordingMotorController
+    engine = ControllerEngine(RecordingMotorController(suppress_redundant=config.MOTOR_SUPPRESS_REDUNDANT),
+                              StateLogger(log_enabled=False))
+    path = box_path(STEP_WARMUP + args.iterations)
+    dt = 1.0 / config.CONTROL_RATE_HZ
+
+    def step(i):
+        cx, cy, w = path[i]
+        engine.update_target([cx - w / 2, cy - 100, cx + w / 2, cy + 100], track_id=1)
+        engine.step(i * dt)
+
+    samples, elapsed = timed(step, args.iterations, warmup=STEP_WARMUP)
+    return samples, elapsed, args.iterations
+
+
+def stage_log(args):
+    from logger import StateLogger
+    with tempfile.TemporaryDirectory() as directory:
+        config.LOG_DIR = directory
+        state_logger = StateLogger(log_enabled=True)
+        path = box_path(args.iterations)
+        samples, elapsed = timed(lambda i: state_logger.update_log_buffer(
+            path[i, 0], path[i, 1], "SAG", "YOLOv8+Kalman"), args.iterations)
+        # İşlem/s diske yazma dahil hesaplanır
+        start = time.perf_counter()
+        state_logger.close()
+        elapsed += time.perf_counter() - start
+    return samples, elapsed, args.iterations
+
+
+def stage_mjpeg(args):
+    from overlay import OverlayInfo, TrajectoryRing
+    from web_server import FrameBroadcaster
+    source = make_source(args)
+    broadcaster = FrameBroadcaster()
+    broadcaster.subscribe() # Tek izleyici: yayınlanan kare kopyalanır ve kodlanır
+    ring = TrajectoryRing(100)
+    warmup = 10
+    path = box_path(warmup + args.frames)
+    last_seq = [0]
+
+    def step(i):
+        cx, cy, w = (int(v) for v in path[i])
+        ring.append(cx, cy)
+        info = OverlayInfo((cx - w // 2, cy - 100, cx + w // 2, cy + 100), 1, (cx, cy), True, "SAG", "UZAK", "",
+                           30.0, 10.0, 0.04, 0, 0.0, ring.points())
+        broadcaster.publish(source.read(), info)
+        last_seq[0], _ = broadcaster.wait_jpeg(last_seq[0])
+
+    samples, elapsed = timed(step, args.frames, warmup=warmup)
+    source.stop()
+    return samples, elapsed, args.frames
+
+
+def stage_end_to_end(args):
+    import queue
+    from logger import StateLogger
+    from main import control_loop, start_detection_thread
+    from metrics import METRICS
+    from motor_control import RecordingMotorController
+    METRICS.capacity = args.frames # Tüm turlar tutulsun
+    source = make_source(args)
+    backend = make_backend(args)
+    frame_q, result_q = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+    detection_thread = start_detection_thread(backend, frame_q, result_q)
+    while detection_thread.is_alive() and backend.load_time is None:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    try:
+        frames = control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False),
+                              frame_q=frame_q, result_q=result_q, max_frames=args.frames, verbose=False)
+    finally:
+        elapsed = time.perf_counter() - start
+        detection_thread.stop()
+        detection_thread.join()
+        source.stop()
+    return METRICS.recent("loop"), elapsed, frames
+
+
+def run_stage(args):
+    """Tek aşama (alt süreç): sonucu JSON olarak son satıra yazar."""
+    samples, elapsed, ops = globals()[f"stage_{args.stage}"](args)
+    samples = np.asarray(samples) / 1e6
+    p50, p99 = np.percentile(samples, [50, 99])
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # Linux: KB
+    print(json.dumps({
+        "ops_per_s": round(ops / elapsed, 1),
+        "p50_ms": round(float(p50), 4),
+        "p99_ms": round(float(p99), 4),
+        "peak_rss_mb": round(peak_rss, 1),
+    }))
+
+
+def compare(results, baseline, tolerance, tail_tolerance):
+    """Aşama başına {ölçü: değişim oranı} ve gerileme listesi. İşlem/s için
+    düşüş, diğerleri için artış kötüleşmedir."""
+    deltas, regressions = {}, []
+    for stage, stats in results.items():
+        base = baseline.get(stage)
+        if base is None:
+            continue
+        deltas[stage] = {}
+        for key, value in stats.items():
+            if not base.get(key):
+                continue
+            change = value / base[key] - 1
+            deltas[stage][key] = change
+            worse = -change if key == "ops_per_s" else change
+            if worse > (tail_tolerance if key == "p99_ms" else tolerance):
+                regressions.append((stage, key, base[key], value))
+    return deltas, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--source", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--path", default=None, help="replay için video dosyası veya resim dizini")
+    parser.add_argument("--backend", default="scripted", help="'scripted', 'ultralytics' veya 'onnx'")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="scripted motor çıkarım süresi")
+    parser.add_argument("--frames", type=int, default=300, help="Kare işleyen aşamalarda kare sayısı")
+    parser.add_argument("--iterations", type=int, default=5000, help="Kalman/kontrol/log aşamalarında adım sayısı")
+    parser.add_argument("--repeats", type=int, default=3, help="Aşama başına süreç sayısı (medyan alınır)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları --baseline dosyasına yaz")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Gerileme eşiği (oran, 0.25 = %%25)")
+    parser.add_argument("--tail-tolerance", type=float, default=0.5, help="p99 için gerileme eşiği")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--stage", choices=STAGES, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage is not None:
+        run_stage(args)
+        return
+
+    results = {}
+    for stage in args.stages:
+        cmd = [sys.executable, os.path.abspath(__file__), "--stage", stage, "--source", args.source,
+               "--backend", args.backend, "--latency-ms", str(args.latency_ms),
+               "--frames", str(args.frames), "--iterations", str(args.iterations)]
+        if args.path:
+            cmd += ["--path", args.path]
+        runs = []
+        for _ in range(args.repeats):
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"[HATA] '{stage}' aşaması başarısız oldu:\n{proc.stderr.strip()}")
+                sys.exit(2)
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        results[stage] = {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "source": args.source,
+            "backend": args.backend,
+            "frames": args.frames,
+            "iterations": args.iterations,
+            "repeats": args.repeats,
+        },
+        "stages": results,
+    }
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    deltas, regressions = compare(results, baseline["stages"], args.tolerance, args.tail_tolerance) if baseline else ({}, [])
+    if baseline:
+        report["baseline"] = {"path": args.baseline, "meta": baseline.get("meta"), "change": deltas,
+                              "regressions": [list(r) for r in regressions]}
+
+    print(f"kaynak: {args.source} | motor: {args.backend} | {report['meta']['machine']}, "
+          f"{report['meta']['cpu_count']} çekirdek")
+    print(f"{'aşama':>10} | {'işlem/s':>10} | {'p50 ms':>8} | {'p99 ms':>8} | {'RSS MB':>7}"
+          + (" | değişim (işlem/s, p50, p99, RSS)" if baseline else ""))
+    for stage, stats in results.items():
+        line = (f"{stage:>10} | {stats['ops_per_s']:>10.1f} | {stats['p50_ms']:>8.3f} | "
+                f"{stats['p99_ms']:>8.3f} | {stats['peak_rss_mb']:>7.1f}")
+        if stage in deltas:
+            line += " | " + ", ".join(f"{deltas[stage].get(key, 0.0):+.0%}"
+                                      for key in ("ops_per_s", "p50_ms", "p99_ms", "peak_rss_mb"))
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Taban kaydedildi: {args.baseline}")
+    elif baseline is None:
+        print(f"[UYARI] Taban bulunamadı ({args.baseline}); karşılaştırma yapılmadı.")
+
+    for stage, key, base, value in regressions:
+        print(f"[UYARI] GERİLEME: {stage} {key} {base} -> {value}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Sentetik kesişen yörüngelerle MultiObjectTracker benchmark'ı.
+
+1) Ölçek: N kişi (yatay gidip gelen, birbirini kesen yörüngeler, gürültü ve
+   kaçırılan tespitler) için update() süresi ve ID değişimi sayısı.
+2) Kesişme: takip edilen kişinin önünden daha büyük biri geçerken eski "en
+   büyük kutu" seçimi ile kilitli iz seçiminin hedefi kaç kez değiştirdiği.
+
+Kullanım:
+    python3 benchmarks/bench_tracker.py [--steps 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from postprocess import select_largest  # noqa: E402
+from tracker import MultiObjectTracker, iou_matrix  # noqa: E402
+
+
+def crossing_scene(n, steps, rng, miss_rate=0.05, noise=2.0):
+    """(steps, n, 4) gerçek kutular: kişiler karşı yönlerde yürüyerek kesişir."""
+    start_x = rng.uniform(0, 560, n)
+    speed = rng.uniform(2, 6, n) * rng.choice([-1, 1], n)
+    y = rng.uniform(100, 300, n)
+    w = rng.uniform(40, 90, n)
+    h = w * 2.2
+
+    t = np.arange(steps)[:, None]
+    x = start_x[None, :] + speed[None, :] * t
+    x = np.abs((x + 560) % 1120 - 560)  # 0..560 arasında gidip gelir
+    gt = np.stack([x, np.broadcast_to(y, x.shape), x + w, np.broadcast_to(y + h, x.shape)], axis=2)
+
+    frames = []
+    for k in range(steps):
+        keep = rng.random(n) > miss_rate
+        boxes = gt[k, keep] + rng.normal(0, noise, (keep.sum(), 4))
+        conf = rng.uniform(0.4, 0.95, (keep.sum(), 1))
+        frames.append((np.hstack([boxes, conf, np.zeros_like(conf)]).astype(np.float32), np.flatnonzero(keep)))
+    return gt, frames
+
+
+def count_id_switches(gt_frame, tracks, assigned):
+    """Her gerçek kişiye eşleşen iz ID'si değiştiyse sayar."""
+    switches = 0
+    if tracks.shape[0] == 0:
+        return 0
+    iou = iou_matrix(gt_frame, tracks[:, :4])
+    best = iou.argmax(axis=1)
+    for person, (track_idx, score) in enumerate(zip(best, iou.max(axis=1))):
+        if score < 0.3:
+            continue
+        track_id = int(tracks[track_idx, 5])
+        if person in assigned and assigned[person] != track_id:
+            switches += 1
+        assigned[person] = track_id
+    return switches
+
+
+def bench_scale(steps):
+    rng = np.random.default_rng(0)
+    print(f"{'kişi':>5} | {'ort ms':>7} | {'p99 ms':>7} | {'ID değişimi':>11}")
+    for n in (1, 10, 30, 50):
+        gt, frames = crossing_scene(n, steps, rng)
+        tracker = MultiObjectTracker()
+        timings, assigned, switches = [], {}, 0
+        for k, (dets, _) in enumerate(frames):
+            start = time.perf_counter()
+            tracks = tracker.update(dets)
+            timings.append((time.perf_counter() - start) * 1000)
+            switches += count_id_switches(gt[k], tracks, assigned)
+        timings = np.array(timings)
+        print(f"{n:>5} | {timings.mean():>7.3f} | {np.percentile(timings, 99):>7.3f} | {switches:>11}")
+
+
+def bench_crossing(steps):
+    """İki kişi: takip edilen (uzak, küçük) kişinin önünden yakındaki (büyük) biri geçer."""
+    t = np.arange(steps, dtype=np.float32)
+    a_x = 100 + 2.0 * t          # takip edilen kişi sağa yürüyor
+    b_x = 500 - 2.5 * t          # diğeri sola yürüyor
+    a = np.stack([a_x, np.full_like(t, 150), a_x + 80, np.full_like(t, 350)], axis=1)
+    b = np.stack([b_x, np.full_like(t, 100), b_x + 110, np.full_like(t, 380)], axis=1)
+    b_visible = (t >= 20) & (t < steps - 20)  # ikinci kişi sahneye sonradan girip çıkar
+
+    def target_person(box):
+        return int(np.argmax(iou_matrix(box[None, :4], np.stack([a_k, b_k]))[0]))
+
+    tracker = MultiObjectTracker()
+    largest_prev = lock_prev = None
+    largest_switches = lock_switches = 0
+    for k in range(steps):
+        a_k, b_k = a[k], b[k]
+        dets = [[*a_k, 0.9, 0]] + ([[*b_k, 0.8, 0]] if b_visible[k] else [])
+        dets = np.array(dets, dtype=np.float32)
+
+        person = target_person(select_largest(dets))
+        largest_switches += largest_prev is not None and person != largest_prev
+        largest_prev = person
+
+        tracker.update(dets)
+        locked = tracker.locked_target()
+        if locked is not None:
+            person = target_person(locked)
+            lock_switches += lock_prev is not None and person != lock_prev
+            lock_prev = person
+
+    print(f"kesişme senaryosu: en büyük kutu hedef değişimi = {largest_switches}, "
+          f"kilitli iz hedef değişimi = {lock_switches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=300)
+    args = parser.parse_args()
+    bench_scale(args.steps)
+    bench_crossing(min(args.steps, 160))
+
+
+if __name__ == "__main__":
+    main()
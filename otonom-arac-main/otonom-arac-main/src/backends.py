@@ -0,0 +1,256 @@
+import os
+import platform
+import time
+import cv2
+import numpy as np
+import config
+from model_cache import artifact_path, temp_path
+from postprocess import EMPTY_DETECTIONS, boxes_to_array
+
+
+class InferenceBackend:
+    """Çıkarım motoru arayüzü. infer() BGR kare alır ve (N, 6) ham tespit dizisi
+    döndürür: x1, y1, x2, y2, conf, class_id (orijinal kare koordinatlarında)."""
+    name = "base"
+
+    def __init__(self):
+        self.load_time = None
+
+    def load(self):
+        """Modeli yükler ve yükleme süresini (saniye) kaydeder."""
+        start = time.perf_counter()
+        self._load()
+        self.load_time = time.perf_counter() - start
+        return self.load_time
+
+    def _load(self):
+        raise NotImplementedError
+
+    def warmup(self, imgsz=None):
+        """İlk çağrı gecikmesini döngü dışına almak için boş kare ile çıkarım yapar."""
+        self.infer(np.zeros((config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8), imgsz)
+
+    def infer(self, image, imgsz=None):
+        raise NotImplementedError
+
+    def infer_batch(self, images, imgsz=None):
+        """Aynı giriş boyutundaki birden fazla kare; kare başına (N, 6) dizi listesi.
+        Toplu çıkarımı desteklemeyen motorlarda tek tek çağrılır."""
+        return [self.infer(image, imgsz) for image in images]
+
+
+class UltralyticsBackend(InferenceBackend):
+    """Mevcut Ultralytics/PyTorch yolu.
+
+    torch/ultralytics ancak _load() içinde (tespit thread'inde) import edilir.
+    MODEL_CACHE_ENABLED ise Conv+BN katmanları birleştirilmiş (fuse) model
+    önbelleğe yazılır ve sonraki açılışlarda doğrudan yüklenir.
+    """
+    name = "ultralytics"
+
+    def __init__(self, model_path, device):
+        super().__init__()
+        self.model_path = model_path
+        self.device = device
+        self.model = None
+
+    def _load(self):
+        import torch
+        from ultralytics import YOLO
+        if str(self.device).startswith("cuda") and not torch.cuda.is_available():
+            print("[UYARI] CUDA kullanılamıyor, model CPU'da çalışacak.")
+            self.device = "cpu"
+        model = self._load_fused(YOLO, torch) if config.MODEL_CACHE_ENABLED else YOLO(self.model_path)
+        self.model = model.to(self.device)
+
+    def _load_fused(self, YOLO, torch):
+        cached = artifact_path(self.model_path, "fused", suffix=".pt")
+        if os.path.exists(cached):
+            try:
+                return YOLO(cached)
+            except Exception as e:
+                print(f"[UYARI] Önbellekteki model okunamadı ({e}), yeniden oluşturuluyor.")
+        model = YOLO(self.model_path)
+        model.fuse()
+        tmp = temp_path(cached)
+        torch.save(dict(model.ckpt or {}, model=model.model, ema=None), tmp)
+        os.replace(tmp, cached)
+        print(f"[INFO] Birleştirilmiş model önbelleğe yazıldı: {cached}")
+        return model
+
+    def infer(self, image, imgsz=None):
+        imgsz = imgsz or config.INFERENCE_IMGSZ
+        # Ultralytics numpy girişini BGR kabul eder ve RGB'ye kendi çevirir
+        result = self.model(image, imgsz=imgsz, verbose=False)[0]
+        return boxes_to_array(result.boxes)
+
+    def infer_batch(self, images, imgsz=None):
+        # Liste girişi tek ileri geçişte (batch) işlenir
+        results = self.model(list(images), imgsz=imgsz or config.INFERENCE_IMGSZ, verbose=False)
+        return [boxes_to_array(result.boxes) for result in results]
+
+
+def letterbox(image, imgsz, pad_value=114):
+    """En-boy oranını koruyarak imgsz x imgsz kareye sığdırır.
+    (kare, ölçek, (pad_x, pad_y)) döndürür."""
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    pad_x = (imgsz - new_w) / 2
+    pad_y = (imgsz - new_h) / 2
+
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT,
+                               value=(pad_value, pad_value, pad_value))
+    return image, scale, (left, top)
+
+
+def nms(boxes, scores, iou_threshold):
+    """Numpy ile açgözlü Non-Maximum Suppression. Tutulan indeksleri döndürür."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        xx1 = np.maximum(x1[i], x1[rest])
+        yy1 = np.maximum(y1[i], y1[rest])
+        xx2 = np.minimum(x2[i], x2[rest])
+        yy2 = np.minimum(y2[i], y2[rest])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+class OnnxBackend(InferenceBackend):
+    """Dışa aktarılmış YOLOv8 ONNX modeli (FP32 veya INT8) için CPU çalışma zamanı.
+    Ultralytics'e ihtiyaç duymaz; letterbox ve NMS burada yapılır.
+
+    MODEL_CACHE_ENABLED ise ONNX Runtime'ın optimize ettiği grafik önbelleğe
+    yazılır; sonraki açılışlarda grafik optimizasyonu atlanır. Optimize grafik
+    donanıma ve sürüme özgü olduğundan bunlar da anahtara eklenir.
+    """
+    name = "onnx"
+
+    def __init__(self, model_path, providers=None, num_threads=None):
+        super().__init__()
+        self.model_path = model_path
+        self.providers = providers or config.ONNX_PROVIDERS
+        self.num_threads = num_threads or config.ONNX_NUM_THREADS
+        self.session = None
+        self.input_name = None
+        self.input_size = None
+        self.dynamic_batch = False
+
+    def _load(self):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.MODEL_CACHE_ENABLED:
+            self.session = self._cached_session(ort, options)
+        else:
+            self.session = ort.InferenceSession(self.model_path, sess_options=options,
+                                                providers=self.providers)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Sabit girişli modellerde (1, 3, H, W) -> H; dinamikse None
+        size = model_input.shape[2]
+        self.input_size = size if isinstance(size, int) else None
+        # Toplu çıkarım için batch boyutu dinamik dışa aktarılmış olmalı (export_onnx.py --dynamic)
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+    def _cached_session(self, ort, options):
+        cached = artifact_path(self.model_path, f"ort{ort.__version__}_{platform.machine()}", suffix=".onnx")
+        if os.path.exists(cached):
+            try:
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                return ort.InferenceSession(cached, sess_options=options, providers=self.providers)
+            except Exception as e:
+                print(f"[UYARI] Önbellekteki ONNX grafiği açılamadı ({e}), yeniden oluşturuluyor.")
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        tmp = temp_path(cached)
+        options.optimized_model_filepath = tmp
+        session = ort.InferenceSession(self.model_path, sess_options=options, providers=self.providers)
+        if os.path.exists(tmp):
+            os.replace(tmp, cached)
+            print(f"[INFO] Optimize ONNX grafiği önbelleğe yazıldı: {cached}")
+        return session
+
+    def preprocess(self, image, imgsz):
+        padded, scale, pad = letterbox(image, imgsz)
+        # BGR -> RGB çevrimi float dönüşümündeki tek kopyaya katılır
+        blob = padded[..., ::-1].transpose(2, 0, 1)[None].astype(np.float32) * (1.0 / 255.0)
+        return np.ascontiguousarray(blob), scale, pad
+
+    def decode(self, output, scale, pad, shape):
+        """YOLOv8 çıktısını (1, 4+nc, A) kare koordinatlarında (N, 6) diziye çevirir.
+        shape: karenin (yükseklik, genişlik) boyutu; kutular Ultralytics'teki
+        gibi kare sınırlarına kırpılır."""
+        preds = output[0].T  # (A, 4+nc)
+        class_scores = preds[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confs = class_scores[np.arange(class_scores.shape[0]), class_ids]
+
+        mask = confs > config.CONF_THRESHOLD
+        if not mask.any():
+            return EMPTY_DETECTIONS
+        preds, confs, class_ids = preds[mask], confs[mask], class_ids[mask]
+
+        cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        boxes[:, [0, 2]] -= pad[0]
+        boxes[:, [1, 3]] -= pad[1]
+        boxes /= scale
+
+        # Sınıf bazlı NMS: kutuları sınıfa göre kaydırarak tek çağrıda yapılır
+        offsets = class_ids[:, None].astype(np.float32) * 4096.0
+        keep = nms(boxes + offsets, confs, config.NMS_IOU_THRESHOLD)[:config.MAX_DETECTIONS]
+        boxes = boxes[keep]
+        # Ultralytics (scale_boxes) gibi: NMS'ten sonra kare sınırlarına kırpılır
+        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, shape[1])
+        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, shape[0])
+
+        return np.hstack([boxes, confs[keep, None],
+                          class_ids[keep, None].astype(np.float32)]).astype(np.float32)
+
+    def infer(self, image, imgsz=None):
+        imgsz = self.input_size or imgsz or config.INFERENCE_IMGSZ
+        blob, scale, pad = self.preprocess(image, imgsz)
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return self.decode(output, scale, pad, image.shape[:2])
+
+    def infer_batch(self, images, imgsz=None):
+        if not self.dynamic_batch or len(images) == 1:
+            return super().infer_batch(images, imgsz)
+        imgsz = self.input_size or imgsz or config.INFERENCE_IMGSZ
+        prepared = [self.preprocess(image, imgsz) for image in images]
+        blob = np.concatenate([blob for blob, _, _ in prepared])
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return [self.decode(output[i:i + 1], scale, pad, image.shape[:2])
+                for i, ((_, scale, pad), image) in enumerate(zip(prepared, images))]
+
+
+def create_backend(name=None, model_path=None, device=None):
+    """config.INFERENCE_BACKEND'e göre çıkarım motorunu oluşturur."""
+    name = name or config.INFERENCE_BACKEND
+
+    if name == "ultralytics":
+        return UltralyticsBackend(model_path or config.YOLO_MODEL_PATH, device or config.DEVICE)
+
+    if name == "onnx":
+        if model_path is None:
+            model_path = config.ONNX_INT8_MODEL_PATH if config.ONNX_USE_INT8 else config.ONNX_MODEL_PATH
+        return OnnxBackend(model_path)
+
+    raise ValueError(f"Bilinmeyen çıkarım motoru: {name}")
@@ -4,13 +4,103 @@ Kp = 0.100 	                # P-Kontrol Kazancı: Dönüş hassasiyeti (Çok kri
 DEADZONE = 20 	            # Merkezdeki piksel toleransı (piksel)
 SCAN_SPEED = 0.9            # Arama modundaki yerinde dönüş hızı (0.0 - 1.0)
 TOTAL_SEARCH_TIMEOUT = 30.0 # Hedef kayıp sayacı (saniye)
+CONTROL_RATE_HZ = 50.0      # Kontrolcünün (controller.py) sabit adım hızı
+CONTROL_THREADED = True     # True: kontrolcü kendi thread'inde, False: kare başına bir adım
+STEERING_MODE = "p"         # 'p': P-kontrol (Kp * dx), 'pid': gecikme telafili PID + hız modülasyonu
+STEER_KP = 0.006            # PID oransal kazanç (1 / piksel)
+STEER_KI = 0.005            # PID integral kazancı (1 / piksel*s)
+STEER_KD = 0.0002           # PID türev kazancı; hedefin Kalman yatay hızı ile (1 / (piksel/s))
+STEER_I_LIMIT = 0.2         # Anti-windup: integral teriminin azami katkısı
+STEER_FAR_WIDTH = 100       # Bu kutu genişliğinden itibaren hız düşürülür (piksel)
+STEER_MIN_SPEED = 0.4       # Hedef yakınken temel hızın çarpanı (YAKIN'da durulur)
+ACTUATION_DELAY = 0.05      # Komut -> motor tepkisi süresi; tahmin ölçüm gecikmesine eklenir (s)
+KALMAN_Q_POS = 0.9          # Kalman süreç gürültüsü, konum (px^2 / s)
+KALMAN_Q_VEL = 810.0        # Kalman süreç gürültüsü, hız ((px/s)^2 / s)
 
 
 # SİSTEM AYARLARI
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
+CAMERA_HFLIP = True         # Kare aynalama (Picamera2'de ISP tarafından yapılır)
+FRAME_RING_SIZE = 4         # Yakalama halka tamponu yuva sayısı
+
+
+# KARE KAYNAĞI AYARLARI
+FRAME_SOURCE = "picamera2"  # 'picamera2', 'replay' (video/resim dizini) veya 'synthetic'
+REPLAY_PATH = "kayit.mp4"   # 'replay' için video dosyası veya resim dizini
+REPLAY_REALTIME = True      # True: kaynak FPS'inde, False: olabildiğince hızlı
+REPLAY_FPS = 30.0           # Resim dizini / FPS bilgisi olmayan videolar için
 YOLO_MODEL_PATH = "/home/pi/Desktop/otonom_arac/yolov8n.pt"
 DEVICE = 'cuda' # 'cuda' veya 'cpu'
+PERSON_CLASS_ID = 0         # COCO 'person' sınıfı
+CONF_THRESHOLD = 0.25       # Tespit güven eşiği
+NMS_IOU_THRESHOLD = 0.45    # ONNX motoru için NMS IoU eşiği
+MAX_DETECTIONS = 100        # Kare başına en fazla tespit
+INFERENCE_IMGSZ = 320       # Model giriş boyutu (piksel)
+
+
+# ÇOKLU KİŞİ TAKİBİ (tracker.py)
+TRACK_IOU_THRESHOLD = 0.3   # İz-tespit eşleşmesi için en düşük IoU
+TRACK_MAX_CENTER_DIST = 80  # IoU eşleşmezse merkezler arası en fazla uzaklık (piksel)
+TRACK_MIN_HITS = 2          # İzin onaylanması için gereken tespit sayısı
+TRACK_MAX_AGE = 5           # Tespitsiz geçen bu kadar sonuçtan sonra iz silinir
+
+
+# TESPİT ZAMANLAMASI (interframe.py)
+DETECT_SCHEDULE = "fixed"   # 'every_frame', 'fixed' (her N karede bir) veya 'adaptive'
+DETECT_EVERY_N = 3          # 'fixed' modunda tespit aralığı (kare)
+ADAPTIVE_MAX_N = 6          # 'adaptive' modunda en uzun tespit aralığı (kare)
+ADAPTIVE_MOTION_PX = 15.0   # Bu kadar hareketten sonra hemen tespit (piksel/kare)
+ADAPTIVE_MIN_CONF = 0.5     # Hedef güveni bunun altındaysa hemen tespit
+FLOW_SCALE = 0.5            # Optik akış için kare küçültme oranı
+RESULT_MAX_AGE = 0.5        # Bu yaştan eski tespit sonucu kullanılmaz (kare yakalama -> sonuç alımı, s)
+DETECT_MAX_BATCH = 4        # Tek model çağrısında işlenecek en fazla kare (çoklu kamera)
+BATCH_WINDOW_MS = 2.0       # Bir kamera karesi gelince diğer kameralar için bekleme (ms)
+MOTION_GATE_ENABLED = True  # Araç dururken sahne değişmiyorsa tespit atlanır
+MOTION_GATE_SCALE = 0.125   # Sahne farkı için kare küçültme oranı (640x480 -> 80x60)
+MOTION_GATE_PIXEL_DIFF = 20 # Bu kadar gri seviye değişen piksel "değişmiş" sayılır
+MOTION_GATE_MIN_CHANGE = 0.005 # Değişen piksel oranı bunun altındaysa sahne durgun
+MOTION_GATE_REFRESH_SEC = 1.0 # Durgun sahnede bile en geç bu aralıkla tespit (s)
+
+
+# KALİTE YÖNETİCİSİ (governor.py)
+GOVERNOR_ENABLED = True     # Çıkarım süresi ve SoC sıcaklığına göre imgsz / tespit aralığı ayarlanır
+GOVERNOR_TARGET_HZ = 8.0    # Korunmaya çalışılan tespit hızı (Hz)
+GOVERNOR_MARGIN = 0.15      # Hedefin bu oran altı: basamak düş, üstü (tahmini): basamak çık
+GOVERNOR_LEVELS = [(416, 2, 1.0), (320, 3, 1.0), (256, 3, 1.0), (224, 3, 0.85), (192, 3, 0.7)] # (imgsz, every_n, hız çarpanı), iyiden kötüye
+GOVERNOR_INTERVAL_SEC = 1.0 # Sensör okuma / karar aralığı (s)
+GOVERNOR_HOLD_SEC = 5.0     # Son değişiklikten bu kadar sonra basamak çıkılabilir (s)
+GOVERNOR_WINDOW = 20        # Kapasite için tutulan son çıkarım süresi sayısı
+GOVERNOR_MIN_SAMPLES = 3    # Karar için gereken en az ölçüm
+GOVERNOR_HOT_C = 75.0       # Bu sıcaklıkta basamak düşülür (Pi 4 80 °C'de kısar)
+GOVERNOR_COOL_C = 65.0      # Basamak çıkmak için sıcaklık bunun altında olmalı
+GOVERNOR_THROTTLE_RATIO = 0.9 # Frekans azami frekansın bu oranının altındaysa kısılmış sayılır
+GOVERNOR_SYSFS_ROOT = "/sys" # Sahte sysfs dizini ile değiştirilebilir
+
+
+# ARKA KAMERA (multicam.py)
+REAR_CAMERA_ENABLED = False # True: arama modunda arka kamera da taranır
+REAR_CAMERA_SOURCE = "picamera2" # 'picamera2', 'replay' veya 'synthetic'
+REAR_CAMERA_NUM = 1         # Picamera2 kamera numarası (ön kamera 0)
+
+
+# PENCERE (ROI) ÇIKARIMI (roi.py)
+ROI_INFERENCE = True        # Hedef takip edilirken tahmin etrafındaki pencerede çıkarım
+ROI_FULL_EVERY_K = 5        # Her K tespitte bir tam kare çıkarımı
+ROI_SCALE = 2.5             # Pencere kenarı = son kutu genişliği x ROI_SCALE
+ROI_MIN_SIZE = 160          # En küçük pencere kenarı (piksel)
+
+
+# ÇIKARIM MOTORU AYARLARI
+DETECTION_WORKER = "thread" # 'thread' veya 'process' (ayrı süreç, paylaşımlı bellek; GIL paylaşılmaz)
+INFERENCE_BACKEND = "ultralytics" # 'ultralytics' (PyTorch) veya 'onnx' (ONNX Runtime, CPU)
+ONNX_MODEL_PATH = "/home/pi/Desktop/otonom_arac/yolov8n_320.onnx"
+ONNX_INT8_MODEL_PATH = "/home/pi/Desktop/otonom_arac/yolov8n_320_int8.onnx"
+ONNX_USE_INT8 = False       # True ise INT8 quantize edilmiş model kullanılır
+ONNX_NUM_THREADS = 4        # Pi 4B: 4 çekirdek
+ONNX_PROVIDERS = ["CPUExecutionProvider"] # ör. ["OpenVINOExecutionProvider", "CPUExecutionProvider"]
+MODEL_CACHE_ENABLED = True  # Birleştirilmiş / optimize edilmiş model diske yazılıp sonraki açılışta kullanılır
+MODEL_CACHE_DIR = "model_cache" # Önbellek dizini (model özeti + giriş boyutu ile anahtarlanır)
 
 
 # MOTOR PIN AYARLARI (GPIO Zero için)
@@ -20,8 +110,40 @@ MOTOR_ENA = 12
 MOTOR_IN3 = 27
 MOTOR_IN4 = 24
 MOTOR_ENB = 13
+MOTOR_ASYNC = True          # True: komutlar ayrı motor thread'inde (eğim sınırı + watchdog) yazılır
+MOTOR_RATE_HZ = 100.0       # Motor thread'inin en düşük yazma hızı
+MOTOR_SLEW_RATE = 4.0       # Hız değişimi sınırı (birim/s; 0 -> 1 en az 0.25 s)
+MOTOR_WATCHDOG_SEC = 0.3    # Bu kadar süre komut gelmezse motorlar durdurulur (s)
+MOTOR_SUPPRESS_REDUNDANT = True # Değeri değişmeyen pinlere tekrar yazılmaz
 
 
 # LOGLAMA AYARLARI 
-CSV_FILENAME = "takip_log.csv"
-LOG_WRITE_INTERVAL_SEC = 1.0
\ No newline at end of file
+LOG_ENABLED = True
+LOG_DIR = "logs"            # Her çalıştırma kendi takip_<tarih>_<parça>.bin dosyalarını açar
+LOG_WRITE_INTERVAL_SEC = 1.0 # Writer thread'inin diske yazma aralığı
+LOG_MAX_BYTES = 8 * 1024 * 1024 # Bu boyutu aşan dosya bir sonraki parçaya döner
+LOG_KEEP_RUNS = 50          # Saklanan en fazla çalıştırma sayısı (eskiler silinir)
+
+
+# UÇUŞ KAYDEDİCİ AYARLARI (flight_recorder.py)
+RECORDER_ENABLED = False    # True: kare + tespit + Kalman + motor kararları kaydedilir
+RECORDER_DIR = "recordings" # Her çalıştırma kendi kayit_<tarih> dizinini açar
+RECORDER_EVERY_N = 1        # Her N karede bir görüntü (kararlar her karede kaydedilir)
+RECORDER_CHUNK_FRAMES = 150 # Parça başına tur sayısı
+RECORDER_JPEG_QUALITY = 90
+RECORDER_RAM_BUDGET_MB = 64 # Kodlanmayı bekleyen karelerin azami belleği
+RECORDER_DISK_BUDGET_MB = 1024 # Aşılınca en eski parçalar silinir
+
+
+# WEB YAYINI AYARLARI (web_server.py)
+STREAM_DEFAULT_QUALITY = 70 # Varsayılan JPEG kalitesi
+STREAM_MAX_FPS = 30.0       # İstemci başına varsayılan azami FPS
+STREAM_WIDTHS = (640, 480, 320, 240, 160) # İzin verilen yayın genişlikleri
+STREAM_PROFILES = [(640, 70), (480, 60), (320, 50), (240, 40), (160, 30)] # Uyarlamalı basamaklar (genişlik, kalite)
+STREAM_SLOW_WRITE_RATIO = 0.5 # Yazma > kare bütçesi x oran ise bağlantı yavaş sayılır
+STREAM_UPGRADE_FRAMES = 60  # Bu kadar hızlı yazmadan sonra kalite bir basamak artırılır
+
+
+# ÖLÇÜM AYARLARI (metrics.py)
+METRICS_ENABLED = True      # Aşama gecikmelerini kaydet (/metrics)
+METRICS_RING_SIZE = 512     # Aşama başına tutulan son örnek sayısı
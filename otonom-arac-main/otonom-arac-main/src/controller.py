@@ -0,0 +1,275 @@
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+import config
+from metrics import METRICS
+
+# Bir kontrol adımının sonucu; çizim ve loglama bunu kullanır
+ControlOutput = namedtuple("ControlOutput", [
+    "direction", "proximity", "speed_a", "speed_b", "pred_x", "pred_y", "has_target", "message",
+])
+
+CLOSE_WIDTH = 200 # Bu genişlikten büyük kutu: YAKIN (dur)
+MID_WIDTH = 100   # Bu genişlikten büyük kutu: ORTA
+
+IDLE_OUTPUT = ControlOutput("BEKLEME", "", 0.0, 0.0, config.FRAME_WIDTH // 2, config.FRAME_HEIGHT // 2, False, "")
+
+
+class ControllerEngine:
+    """Takip kararlarını görüntü hızından bağımsız, sabit hızda veren kontrolcü.
+
+    Görüntü döngüsü update_target() ile kilitli hedefin son kutusunu bildirir;
+    step(now) Kalman'ı geçen süre (dt) kadar ilerletir, yeni ölçüm varsa
+    düzeltir ve P-kontrol / ölü bölge / yakınlık / arama modu kararını motor
+    arayüzüne (motor.drive(hız_a, hız_b), işaretli hızlar) yazar. start() ile
+    kendi thread'inde CONTROL_RATE_HZ hızında çalışır; start() çağrılmazsa
+    step() dışarıdan (kare başına veya simülasyonda sahte saatle) sürülür.
+
+    update_target()'e karenin yakalama anı (capture_ns) verilirse, o ölçümü
+    kullanan adım motora yazınca "frame_age" (yakalama -> motor komutu)
+    kaydedilir; thread'li modda da gecikme kontrol adımını içerir.
+
+    update_rear() ile arka kameranın gördüğü kişinin tarafı bildirilirse arama
+    o yöne döner ve kişi görüldükçe arama zaman aşımı işlemez.
+
+    update_speed_scale() ile kalite yöneticisinin hız çarpanı bildirilir:
+    tespit kalitesi düştüğünde motor hızları bu oranda kısılır.
+
+    mode="pid" (STEERING_MODE): Kalman ölçümün alındığı ana göre güncellenir ve
+    hedef ölçüm yaşı + ACTUATION_DELAY kadar ileri tahmin edilir; direksiyon
+    PID (türev = hedefin yatay hızı, anti-windup'lı integral) ile, temel hız
+    kutu büyüdükçe düşürülerek hesaplanır.
+    """
+    def __init__(self, motor, state_logger, rate_hz=None, clock=time.monotonic, mode=None):
+        self.motor = motor
+        self.state_logger = state_logger
+        self.rate_hz = rate_hz or config.CONTROL_RATE_HZ
+        self.mode = mode or config.STEERING_MODE
+        self.clock = clock
+        self.output = IDLE_OUTPUT
+        self.running = False
+        self.search_start_time = None
+        self.last_known_horizontal_direction = "SAG"
+
+        self._lock = threading.Lock()
+        self._target = None # (x1, y1, x2, y2) kilitli hedef kutusu
+        self._track_id = None
+        self._fresh = False # Son adımdan beri yeni ölçüm geldi mi
+        self._stamp = 0.0 # Ölçülen karenin saati (self.clock cinsinden)
+        self._capture_ns = None # Ölçülen karenin yakalanma anı (perf_counter_ns)
+        self._rear_direction = None # Arka kamerada görülen kişinin tarafı ("SAG"/"SOL")
+        self._speed_scale = 1.0 # Kalite yöneticisinden hız çarpanı
+        self._kalman_time = 0.0 # pid: Kalman durumunun ait olduğu an
+        self._integral = 0.0
+        self._followed_id = None
+        self._last_step = None
+        self._thread = None
+
+    def update_target(self, target, track_id=None, age=0.0, fresh=None, capture_ns=None):
+        """Görüntü döngüsünden: kilitli hedef kutusu [x1, y1, x2, y2, ...] veya None (kayıp).
+        age: kutunun ölçüldüğü kare yakalanalı geçen süre (s). fresh: kutu bu
+        turda yeni ölçüldü mü (tespit sonucu veya optik akış); False ise aynı
+        kutu tekrar bildirilmiştir ve Kalman onunla yeniden düzeltilmez.
+        Verilmezse kutu varsa yeni sayılır. capture_ns: karenin yakalandığı
+        an (time.perf_counter_ns), frame_age ölçümü için."""
+        if fresh is None:
+            fresh = target is not None
+        stamp = self.clock() - age
+        with self._lock:
+            self._target = None if target is None else tuple(int(v) for v in target[:4])
+            self._track_id = track_id
+            if target is None:
+                self._fresh = False
+            elif fresh:
+                self._fresh = True # Henüz adımda kullanılmamış ölçüm silinmez
+                self._stamp = stamp
+                self._capture_ns = capture_ns
+
+    def update_rear(self, direction):
+        """Arka kameradan: kişinin bulunduğu taraf ("SAG"/"SOL") veya None."""
+        with self._lock:
+            self._rear_direction = direction
+
+    def update_speed_scale(self, scale):
+        """Kalite yöneticisinden: motor hızlarına uygulanacak çarpan (0-1]."""
+        with self._lock:
+            self._speed_scale = scale
+
+    def step(self, now=None):
+        """Tek kontrol adımı: kararı motora yazar ve ControlOutput döndürür."""
+        now = self.clock() if now is None else now
+        dt = 0.0 if self._last_step is None else now - self._last_step
+        self._last_step = now
+        with self._lock:
+            target, track_id, fresh, stamp = self._target, self._track_id, self._fresh, self._stamp
+            rear_direction = self._rear_direction
+            speed_scale = self._speed_scale
+            capture_ns = self._capture_ns if fresh else None
+            self._fresh = False
+
+        if target is not None:
+            output = self._track(target, track_id, fresh, stamp, now, dt)
+        else:
+            output = self._search(now, dt, rear_direction)
+        if speed_scale != 1.0:
+            output = output._replace(speed_a=output.speed_a * speed_scale, speed_b=output.speed_b * speed_scale)
+
+        self.motor.drive(output.speed_a, output.speed_b)
+        if capture_ns is not None:
+            METRICS.record_ns("frame_age", time.perf_counter_ns() - capture_ns) # Yakalama -> motor komutu
+        self.state_logger.update_log_buffer(output.pred_x, output.pred_y, output.direction,
+                                            "YOLOv8+Kalman" if output.has_target else "Kalman Search")
+        self.output = output
+        return output
+
+    def _predict(self, dt):
+        prediction = self.state_logger.kalman_predict(dt)
+        return int(prediction[0][0]), int(prediction[1][0])
+
+    def _predict_ahead(self, cx, cy, fresh, stamp, now):
+        """pid: Kalman'ı ölçüm anına göre günceller, hedefi eyleme anına kadar ileri taşır."""
+        if fresh:
+            self.state_logger.kalman_predict(max(0.0, stamp - self._kalman_time))
+            self.state_logger.kalman_correct(np.array([[np.float32(cx)], [np.float32(cy)]]))
+            self._kalman_time = max(stamp, self._kalman_time)
+        x, y, vx, vy = self.state_logger.kalman.statePost[:, 0]
+        # Ölçülen gecikme (ölçüm -> şimdi) + motorun tepki süresi
+        lead = now - self._kalman_time + config.ACTUATION_DELAY
+        METRICS.record_ns("steer_lead", int(lead * 1e9))
+        return int(x + vx * lead), int(y + vy * lead), float(vx)
+
+    def _track(self, target, track_id, fresh, stamp, now, dt):
+        self.search_start_time = None
+        x1, y1, x2, y2 = target
+        cx = (x1 + x2) // 2
+        cy = (y1 + y2) // 2
+        width = x2 - x1
+
+        # Takip edilen kişi değiştiyse eski kişinin Kalman durumu kullanılmaz
+        if track_id != self._followed_id:
+            self._followed_id = track_id
+            self.state_logger.reset_kalman(cx, cy)
+            self._kalman_time = stamp
+            self._integral = 0.0
+
+        if self.mode == "pid":
+            pred_x, pred_y, target_vx = self._predict_ahead(cx, cy, fresh, stamp, now)
+        else:
+            # Kalman: dt kadar ilerlet, yeni ölçüm geldiyse düzelt
+            pred_x, pred_y = self._predict(dt)
+            if fresh:
+                corrected = self.state_logger.kalman_correct(np.array([[np.float32(cx)], [np.float32(cy)]]))
+                pred_x, pred_y = int(corrected[0][0]), int(corrected[1][0])
+
+        dx = pred_x - config.FRAME_WIDTH // 2 # Merkezden yatay sapma (HATA)
+
+        # Yakınlık Hesaplama
+        proximity = "UZAK"
+        if width > CLOSE_WIDTH: proximity = "YAKIN"
+        elif width > MID_WIDTH: proximity = "ORTA"
+
+        # Son bilinen yatay yönü güncelle
+        if dx > config.DEADZONE: self.last_known_horizontal_direction = "SAG"
+        elif dx < -config.DEADZONE: self.last_known_horizontal_direction = "SOL"
+
+        if proximity == "YAKIN":
+            self._integral = 0.0
+            return ControlOutput("YAKIN", proximity, 0.0, 0.0, pred_x, pred_y, True, "")
+
+        if self.mode == "pid":
+            speed_a, speed_b = self._pid(dx, target_vx, width, dt)
+            direction = "MERKEZ" if abs(dx) <= config.DEADZONE else ("SAG" if dx > 0 else "SOL")
+            return ControlOutput(direction, proximity, speed_a, speed_b, pred_x, pred_y, True, "")
+
+        if abs(dx) <= config.DEADZONE:
+            return ControlOutput("MERKEZ", proximity, config.BASE_SPEED, config.BASE_SPEED,
+                                 pred_x, pred_y, True, "")
+
+        # P-KONTROL HIZ HESAPLAMASI
+        turn_adjustment = config.Kp * dx
+        turn_adjustment = max(-config.BASE_SPEED, min(config.BASE_SPEED, turn_adjustment))
+        speed_a = max(0.0, min(1.0, config.BASE_SPEED + turn_adjustment))
+        speed_b = max(0.0, min(1.0, config.BASE_SPEED - turn_adjustment))
+        direction = "SAG" if dx > 0 else "SOL"
+        return ControlOutput(direction, proximity, speed_a, speed_b, pred_x, pred_y, True, "")
+
+    def _pid(self, dx, target_vx, width, dt):
+        # Hız modülasyonu: kutu STEER_FAR_WIDTH'ten CLOSE_WIDTH'e büyürken temel hız azalır
+        closeness = (width - config.STEER_FAR_WIDTH) / (CLOSE_WIDTH - config.STEER_FAR_WIDTH)
+        base = config.BASE_SPEED * min(1.0, max(config.STEER_MIN_SPEED, 1.0 - closeness))
+
+        # Türev terimi hatanın türevi yerine hedefin Kalman hızıdır (ölçüm gürültüsü türevlenmez)
+        p_term = config.STEER_KP * dx
+        d_term = config.STEER_KD * target_vx
+        candidate = self._integral + dx * dt
+        unclamped = p_term + config.STEER_KI * candidate + d_term
+
+        # Anti-windup: çıkış doymuşken doygunluğu artıracak yönde integral alınmaz
+        if abs(unclamped) < base or np.sign(dx) != np.sign(unclamped):
+            self._integral = candidate
+        if config.STEER_KI > 0:
+            limit = config.STEER_I_LIMIT / config.STEER_KI
+            self._integral = max(-limit, min(limit, self._integral))
+
+        turn = p_term + config.STEER_KI * self._integral + d_term
+        turn = max(-base, min(base, turn))
+        return max(0.0, min(1.0, base + turn)), max(0.0, min(1.0, base - turn))
+
+    def _search(self, now, dt, rear_direction=None):
+        if self.search_start_time is None:
+            self.search_start_time = now
+            self._integral = 0.0
+            if self.mode == "pid":
+                # Arama sırasında Kalman ölçümsüz ilerler; hedef dönünce sıfırdan başla
+                self._followed_id = None
+        if rear_direction is not None:
+            # Kişi arka kamerada: o tarafa dön, görüldükçe arama süresi dolmaz
+            self.last_known_horizontal_direction = rear_direction
+            self.search_start_time = now
+        total_elapsed = now - self.search_start_time
+        pred_x, pred_y = self._predict(dt)
+
+        if total_elapsed > config.TOTAL_SEARCH_TIMEOUT:
+            # Zaman aşımı: dur ve aramayı bir sonraki adımda yeniden başlat
+            self.search_start_time = None
+            return ControlOutput("BEKLEME", "", 0.0, 0.0, pred_x, pred_y, False, "ARAMA SIFIRLANDI")
+
+        # Yerinde dönüş: bir taraf ileri, diğer taraf daha yavaş geri
+        turn_speed = config.SCAN_SPEED
+        remaining = config.TOTAL_SEARCH_TIMEOUT - total_elapsed
+        if self.last_known_horizontal_direction == "SOL":
+            message = "ARKA KAMERA (SOL)" if rear_direction else f"ARANIYOR (SAG Taraniyor {remaining:.1f}s)"
+            return ControlOutput("ARAMA_SAG", "", -(turn_speed - 0.4), turn_speed, pred_x, pred_y, False, message)
+        message = "ARKA KAMERA (SAG)" if rear_direction else f"ARANIYOR (SOL Taraniyor {remaining:.1f}s)"
+        return ControlOutput("ARAMA_SOL", "", turn_speed, -(turn_speed - 0.4), pred_x, pred_y, False, message)
+
+    # --- Sabit hızlı thread ---
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="controller", daemon=True)
+        self._thread.start()
+        print(f"[INFO] Kontrolcü {self.rate_hz:.0f} Hz ile başlatıldı.")
+
+    def stop(self):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.monotonic()
+        while self.running:
+            tick_start = time.monotonic()
+            METRICS.record_ns("tick_late", int((tick_start - next_tick) * 1e9))
+            self.step(self.clock())
+            METRICS.record_ns("control_step", int((time.monotonic() - tick_start) * 1e9))
+
+            # Mutlak zamanlama: adım süresi periyoda eklenmez
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Geride kalındıysa kaçırılan adımları art arda çalıştırma
+                next_tick = time.monotonic()
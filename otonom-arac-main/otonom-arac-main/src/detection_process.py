@@ -0,0 +1,177 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+import config
+from detector import detect_frame
+from handoff import DetectionResult
+from metrics import METRICS
+from startup import STARTUP
+
+# Yuva başına meta: seq, capture_ns, roi var mı, x1, y1, x2, y2, imgsz (0: varsayılan)
+_META_FIELDS = 8
+
+
+def _worker_main(backend_factory, shm_name, shape, meta, pending, busy, lock, wake, stop, conn):
+    """Tespit sürecinin ana fonksiyonu (ayrı Python yorumlayıcısında, GIL paylaşılmaz)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        backend = backend_factory()
+        print(f"[INFO] Tespit Süreci: Model yükleniyor ({backend.name})...")
+        load_time = backend.load()
+        backend.warmup()
+        conn.send(("ready", load_time))
+    except Exception as e:
+        # Hata ana süreçte gösterilir (_receive)
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        shm.close()
+        return
+
+    while not stop.is_set():
+        if not wake.wait(0.5):
+            continue
+        with lock:
+            wake.clear()
+            slot = pending.value
+            pending.value = -1
+            if slot < 0:
+                continue
+            busy.value = slot
+            seq, capture_ns, has_roi, x1, y1, x2, y2, imgsz = meta[slot * _META_FIELDS:(slot + 1) * _META_FIELDS]
+
+        roi = (x1, y1, x2, y2) if has_roi else None
+        queue_wait_ns = time.perf_counter_ns() - capture_ns
+        target, detections, inference_ns, postprocess_ns = detect_frame(backend, frames[slot], roi, imgsz or None)
+        with lock:
+            busy.value = -1
+        conn.send(("result", DetectionResult(seq, capture_ns, target, detections, infer_ns=inference_ns),
+                   (queue_wait_ns, inference_ns, postprocess_ns)))
+    shm.close()
+
+
+class DetectionProcess:
+    """Tespiti ayrı bir süreçte çalıştıran, DetectionThread yerine geçen çalışan.
+
+    Kareler paylaşımlı bellekteki halka yuvalarına kopyalanır (pickle yok);
+    sürece sadece yuva numarası bir posta kutusu (Value) ile bildirilir. Posta
+    kutusu tek kare tutar: süreç meşgulken gelen yeni kare bekleyen eskisinin
+    yerine geçer (en eski düşer). Sonuçlar küçük olduğu için Pipe ile döner;
+    get_nowait() bekleyen sonuçların en yenisini verir.
+    control_loop'a frame_q ve result_q olarak aynı nesne verilir.
+    Süreç modeli yükleyemezse hata ana süreçte yazdırılır ve error'a konur;
+    wait_ready() RuntimeError fırlatır. Paylaşımlı bellek join()'de (süreç
+    erken ölmüş olsa da) silinir.
+    """
+    def __init__(self, backend_factory, slots=3):
+        if slots < 3:
+            raise ValueError("DetectionProcess en az 3 yuva gerektirir") # yazılan + bekleyen + işlenen
+        self.shape = (slots, config.FRAME_HEIGHT, config.FRAME_WIDTH, 3)
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.shape)))
+        self.frames = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+        # fork, Flask/log thread'leri çalışırken güvenli değil; spawn kullanılır
+        ctx = mp.get_context("spawn")
+        self.meta = ctx.Array("q", slots * _META_FIELDS, lock=False)
+        self.pending = ctx.Value("i", -1, lock=False)
+        self.busy = ctx.Value("i", -1, lock=False)
+        self.lock = ctx.Lock()
+        self.wake = ctx.Event()
+        self.stop_event = ctx.Event()
+        self.conn, child_conn = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=_worker_main, name="detection-process", daemon=True,
+            args=(backend_factory, self.shm.name, self.shape, self.meta, self.pending, self.busy,
+                  self.lock, self.wake, self.stop_event, child_conn),
+        )
+        self.next_slot = 0
+        self.load_time = None
+        self.error = None # Süreçteki model yükleme hatası
+        self.frames_dropped = 0
+        self.results_received = 0
+
+    def start(self):
+        self.process.start()
+
+    def wait_ready(self, timeout=None):
+        """Süreç modeli yükleyene kadar bekler; yükleme süresini döndürür.
+        Model yüklenemediyse RuntimeError fırlatır."""
+        if self.conn.poll(timeout):
+            self._receive()
+        if self.error is not None:
+            raise RuntimeError(f"Tespit Süreci modeli yükleyemedi: {self.error}")
+        return self.load_time
+
+    # --- control_loop kuyruk arayüzü ---
+    copies_frames = True # put_nowait kareyi paylaşılan belleğe kopyalar
+
+    def put_nowait(self, packet):
+        seq, capture_ns, frame, roi = packet.seq, packet.capture_ns, packet.frame, packet.roi
+        with self.lock:
+            taken = (self.pending.value, self.busy.value)
+        slot = self.next_slot
+        while slot in taken:
+            slot = (slot + 1) % self.slots
+        self.next_slot = (slot + 1) % self.slots
+
+        # Yuva ne bekliyor ne işleniyor: kilitsiz kopyalanabilir
+        np.copyto(self.frames[slot], frame)
+        self.meta[slot * _META_FIELDS:(slot + 1) * _META_FIELDS] = \
+            [seq, capture_ns, roi is not None] + (list(roi) if roi is not None else [0, 0, 0, 0]) + [packet.imgsz or 0]
+        with self.lock:
+            if self.pending.value >= 0:
+                self.frames_dropped += 1
+            self.pending.value = slot
+            self.wake.set()
+
+    def get_nowait(self):
+        latest = None
+        while self.conn.poll():
+            message = self._receive()
+            if message is not None:
+                latest = message
+        if latest is None:
+            raise queue.Empty
+        return latest
+
+    def _receive(self):
+        kind, *message = self.conn.recv()
+        if kind == "ready":
+            self.load_time = message[0]
+            STARTUP.mark("warmup") # Süreçte yükleme + ısınma bitti (mesajın alındığı an)
+            print(f"[INFO] Tespit Süreci: Model {self.load_time:.2f} sn'de yüklendi. Döngü başlıyor.")
+            return None
+        if kind == "error":
+            self.error = message[0]
+            print(f"[HATA] Tespit Süreci modeli yükleyemedi: {self.error}")
+            return None
+        result, (queue_wait_ns, inference_ns, postprocess_ns) = message
+        METRICS.record_ns("queue_wait", queue_wait_ns)
+        METRICS.record_ns("inference", inference_ns)
+        METRICS.record_ns("postprocess", postprocess_ns)
+        self.results_received += 1
+        return result
+
+    # --- DetectionThread ile aynı yaşam döngüsü ---
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+
+    def join(self, timeout=5.0):
+        try:
+            if self.process.pid is not None:
+                self.process.join(timeout)
+                if self.process.is_alive():
+                    self.process.terminate()
+        finally:
+            # Süreç yüklemede ölmüş veya hiç başlamamış olsa da /dev/shm'de segment kalmasın
+            if self.shm is not None:
+                self.conn.close()
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = None
@@ -1,35 +1,102 @@
 import threading
 import queue
-import torch
-from ultralytics import YOLO
-import numpy as np
-# import time # Gerekli değilse kaldırılabilir
+import time
 import config
+from postprocess import postprocess_array
+from roi import map_to_frame, roi_imgsz
+from metrics import METRICS
+from handoff import DetectionResult
+from startup import STARTUP
 
-# Kuyruklar (Thread'ler arası iletişim için)
+# Kuyruklar (Thread'ler arası iletişim için): FramePacket -> DetectionResult
 frame_queue = queue.Queue(maxsize=1)
 result_queue = queue.Queue(maxsize=1)
 
+def detect_frame(backend, frame, roi, imgsz=None):
+    """Tek karede çıkarım + filtreleme. (hedef, tespitler, çıkarım_ns, postprocess_ns) döndürür.
+    Thread ve süreç tabanlı tespit çalışanları ortak kullanır. imgsz: model giriş
+    boyutu (None: INFERENCE_IMGSZ), pencere bundan büyük işlenmez."""
+    imgsz = imgsz or config.INFERENCE_IMGSZ
+    infer_start_ns = time.perf_counter_ns()
+    if roi is None:
+        data = backend.infer(frame, imgsz)
+    else:
+        # Pencere view'ı doğal çözünürlükte işlenir, kutular kareye geri taşınır
+        x1, y1, x2, y2 = roi
+        data = map_to_frame(backend.infer(frame[y1:y2, x1:x2], roi_imgsz(roi, imgsz)), roi)
+    post_start_ns = time.perf_counter_ns()
+
+    # Vektörel filtreleme ve hedef seçimi
+    target, detections = postprocess_array(data)
+    return target, detections, post_start_ns - infer_start_ns, time.perf_counter_ns() - post_start_ns
+
+
+def detect_batch(backend, packets):
+    """Birden fazla kamera karesinde çıkarım. Aynı giriş boyutundaki kareler tek
+    infer_batch() çağrısında işlenir (pencereli kareler boyutlarına göre gruplanır).
+    ([(hedef, tespitler), ...], çıkarım_ns, postprocess_ns) döndürür."""
+    infer_start_ns = time.perf_counter_ns()
+    groups = {} # imgsz -> paket indeksleri
+    for i, packet in enumerate(packets):
+        limit = packet.imgsz or config.INFERENCE_IMGSZ
+        imgsz = limit if packet.roi is None else roi_imgsz(packet.roi, limit)
+        groups.setdefault(imgsz, []).append(i)
+
+    data = [None] * len(packets)
+    for imgsz, indices in groups.items():
+        images = []
+        for i in indices:
+            frame, roi = packets[i].frame, packets[i].roi
+            images.append(frame if roi is None else frame[roi[1]:roi[3], roi[0]:roi[2]])
+        outputs = backend.infer_batch(images, imgsz) if len(images) > 1 else [backend.infer(images[0], imgsz)]
+        for i, output in zip(indices, outputs):
+            data[i] = map_to_frame(output, packets[i].roi)
+    post_start_ns = time.perf_counter_ns()
+
+    results = [postprocess_array(d) for d in data]
+    return results, post_start_ns - infer_start_ns, time.perf_counter_ns() - post_start_ns
+
+
 class DetectionThread(threading.Thread):
-    def __init__(self, model_pt_path, device, frame_q, result_q):
+    """frame_q'dan gelen kareleri işler. Birden fazla kamera (handoff.CameraMailbox)
+    kullanılıyorsa aynı anda bekleyen kareler tek model çağrısında (en fazla
+    DETECT_MAX_BATCH) işlenir. result_q tek kuyruk veya {kamera: kuyruk}
+    sözlüğüdür; sonuçlar paketin kamerasına göre yönlendirilir."""
+    def __init__(self, backend, frame_q, result_q, max_batch=None):
         super().__init__()
         
-        self.model_pt_path = model_pt_path
-        self.device = device
+        self.backend = backend # backends.InferenceBackend
         self.frame_q = frame_q
         self.result_q = result_q
-        self.model = None 
+        self.max_batch = max_batch or config.DETECT_MAX_BATCH
         self.running = True
 
     def stop(self):
         self.running = False
 
+    def _publish(self, result):
+        result_q = self.result_q[result.camera] if isinstance(self.result_q, dict) else self.result_q
+        try:
+            result_q.put_nowait(result)
+        except queue.Full:
+            # Alınmamış eski sonuç yenisiyle değiştirilir
+            try:
+                result_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                result_q.put_nowait(result)
+            except queue.Full:
+                pass
+
     def run(self):
-        print("[INFO] Tespit Thread'i: YOLOv8 Modeli yükleniyor...")
+        print(f"[INFO] Tespit Thread'i: Model yükleniyor ({self.backend.name})...")
         try:
-            self.model = YOLO(self.model_pt_path).to(self.device)
-            self.model(np.zeros((config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8), verbose=False)
-            print("[INFO] Tespit Thread'i: Model yüklendi. Döngü başlıyor.")
+            load_time = self.backend.load()
+            STARTUP.mark("model_load")
+            self.backend.warmup()
+            STARTUP.mark("warmup")
+            print(f"[INFO] Tespit Thread'i: Model {load_time:.2f} sn'de yüklendi. Döngü başlıyor.")
         except Exception as e:
             print(f"[HATA] Tespit Thread'i modeli yükleyemedi: {e}")
             self.running = False 
@@ -37,36 +104,26 @@ class DetectionThread(threading.Thread):
             
         while self.running:
             try:
-                # img_rgb, small_frame (small_frame kullanılmıyor ama uyumluluk için alınabilir)
-                img_rgb, _ = self.frame_q.get(timeout=1)
+                # BGR kare (FramePacket; kare FramePipeline halka yuvasının view'ı)
+                packets = [self.frame_q.get(timeout=1)]
             except queue.Empty:
                 continue 
+            # Diğer kameralardan bekleyen kareler aynı partiye alınır
+            while len(packets) < self.max_batch:
+                try:
+                    packets.append(self.frame_q.get_nowait())
+                except queue.Empty:
+                    break
 
-            results_list = self.model(img_rgb, imgsz=320, verbose=False)
-            result = results_list[0]
-            
-            preds_v8_format = []
-            for box in result.boxes:
-                class_id = int(box.cls[0].cpu().numpy())
-                if class_id == 0: # Sadece 'person' sınıfı
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                    conf = float(box.conf[0].cpu().numpy())
-                    if conf > 0.25:
-                        preds_v8_format.append([x1, y1, x2, y2, conf, class_id])
-            
-            # En büyük alanı (hedefi) bul
-            target = None
-            max_area = 0
-
-            for row in preds_v8_format: 
-                x1, y1, x2, y2 = map(int, row[:4])
-                area = (x2 - x1) * (y2 - y1)
-                
-                if area > max_area:
-                    max_area = area
-                    target = row 
+            infer_start_ns = time.perf_counter_ns()
+            for packet in packets:
+                METRICS.record_ns("queue_wait", infer_start_ns - packet.capture_ns) # Yakalama -> çıkarım başlangıcı
+            outputs, inference_ns, postprocess_ns = detect_batch(self.backend, packets)
+            METRICS.record_ns("inference", inference_ns)
+            METRICS.record_ns("postprocess", postprocess_ns)
 
-            try:
-                self.result_q.put_nowait(target)
-            except queue.Full:
-                pass
\ No newline at end of file
+            # Sıra numarası, yakalama zamanı ve kamera sonuçla döner (tazelik kontrolü, yönlendirme)
+            # infer_ns partinin tamamının süresidir: sonuç bu kadar sürede hazır olur
+            for packet, (target, detections) in zip(packets, outputs):
+                self._publish(DetectionResult(packet.seq, packet.capture_ns, target, detections, packet.camera,
+                                              inference_ns))
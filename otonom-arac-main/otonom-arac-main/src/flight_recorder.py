@@ -0,0 +1,204 @@
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+import config
+from frame_pipeline import FramePipeline
+from frame_source import FrameSource
+from log_writer import DIRECTIONS, _code
+from motor_control import AsyncMotorDriver, commanded_pins
+
+MOTOR_PINS = ("in1", "in2", "in3", "in4", "ena", "enb")
+
+
+def motor_state(motor):
+    """Motor pinlerinin o anki değerleri (MotorController ve RecordingMotorController için).
+    AsyncMotorDriver'da pinler eğimle hedefe yaklaştığından komut verilen hedefin
+    pin değerleri kaydedilir; replay eğimsiz motorla aynı kararı karşılaştırabilir."""
+    if isinstance(motor, AsyncMotorDriver):
+        pins = commanded_pins(*motor.target)
+        return tuple(float(pins[pin]) for pin in MOTOR_PINS)
+    return tuple(float(getattr(motor, pin).value) for pin in MOTOR_PINS)
+
+
+def config_snapshot():
+    """Replay'in aynı ayarlarla çalışabilmesi için JSON'a yazılabilen config değerleri."""
+    snapshot = {}
+    for key in dir(config):
+        value = getattr(config, key)
+        if key.isupper() and isinstance(value, (bool, int, float, str, list, tuple)):
+            snapshot[key] = value
+    return snapshot
+
+
+class FlightRecorder:
+    """Saha olaylarını off-vehicle yeniden oynatmak için kare + karar kaydedici.
+
+    Her kontrol turu için tespitler (yeni sonuç geldiyse), Kalman durumu, motor
+    pin değerleri, yön ve döngü saati kaydedilir; kare her RECORDER_EVERY_N
+    turda bir eklenir. record() sadece kareyi kopyalayıp kuyruğa koyar; JPEG
+    kodlama ve diske yazma arka plan thread'inde yapılır. Bekleyen kareler
+    RECORDER_RAM_BUDGET_MB'ı aşarsa kare atlanır (karar yine kaydedilir).
+    Kayıt, RECORDER_CHUNK_FRAMES turluk sıkıştırılmış .npz parçalarına bölünür;
+    toplam boyut RECORDER_DISK_BUDGET_MB'ı aşınca en eski parça silinir.
+    """
+    def __init__(self, directory=None, every_n=None, chunk_frames=None,
+                 ram_budget_mb=None, disk_budget_mb=None, jpeg_quality=None):
+        self.every_n = every_n or config.RECORDER_EVERY_N
+        self.chunk_frames = chunk_frames or config.RECORDER_CHUNK_FRAMES
+        self.ram_budget = (ram_budget_mb or config.RECORDER_RAM_BUDGET_MB) * 1024 * 1024
+        self.disk_budget = (disk_budget_mb or config.RECORDER_DISK_BUDGET_MB) * 1024 * 1024
+        self.jpeg_quality = jpeg_quality or config.RECORDER_JPEG_QUALITY
+        self.path = os.path.join(directory or config.RECORDER_DIR, time.strftime("kayit_%Y%m%d_%H%M%S"))
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump({"every_n": self.every_n, "directions": DIRECTIONS,
+                       "motor_pins": MOTOR_PINS, "config": config_snapshot()}, f, indent=1)
+
+        self.index = 0
+        self.frames_recorded = 0
+        self.frames_dropped = 0
+        self.chunks = [] # (yol, bayt) - diskteki parçalar, eskiden yeniye
+        self.chunk_index = 0
+        self._pending_bytes = 0
+        self._pending_lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="flight-recorder", daemon=True)
+        self._thread.start()
+        print(f"[INFO] Uçuş kaydedici açık: {self.path} (her {self.every_n} karede bir görüntü)")
+
+    def record(self, frame, t, detections, kalman_state, motor, direction):
+        """Kontrol döngüsünden tur başına bir kez çağrılır. detections: bu turda
+        tespit thread'inden yeni sonuç geldiyse (N, 6) dizi, gelmediyse None."""
+        image = None
+        if self.index % self.every_n == 0:
+            with self._pending_lock:
+                fits = self._pending_bytes + frame.nbytes <= self.ram_budget
+                if fits:
+                    self._pending_bytes += frame.nbytes
+            if fits:
+                # Kare halka yuvasıdır; birkaç kare sonra üzerine yazılacağı için kopyalanır
+                image = frame.copy()
+            else:
+                self.frames_dropped += 1
+        self._queue.put((self.index, t, image, detections, np.asarray(kalman_state, dtype=np.float32).ravel()[:4],
+                         motor_state(motor), _code(DIRECTIONS, direction)))
+        self.index += 1
+
+    def close(self):
+        """Bekleyen turları yazar ve thread'i durdurur."""
+        self._queue.put(None)
+        self._thread.join()
+        print(f"[INFO] Uçuş kaydı kapatıldı: {self.frames_recorded} kare, "
+              f"{self.frames_dropped} kare RAM bütçesi nedeniyle atlandı, {len(self.chunks)} parça.")
+
+    def _run(self):
+        chunk = []
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            index, t, image, detections, kalman, motor, direction = entry
+            jpeg = b""
+            if image is not None:
+                ok, buf = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+                with self._pending_lock:
+                    self._pending_bytes -= image.nbytes
+                if ok:
+                    jpeg = buf.tobytes()
+                    self.frames_recorded += 1
+            chunk.append((index, t, jpeg, detections, kalman, motor, direction))
+            if len(chunk) >= self.chunk_frames:
+                self._write_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._write_chunk(chunk)
+
+    def _write_chunk(self, chunk):
+        jpegs = [entry[2] for entry in chunk]
+        dets = [entry[3] if entry[3] is not None else np.zeros((0, 6), np.float32) for entry in chunk]
+        arrays = {
+            "index": np.array([entry[0] for entry in chunk], dtype=np.int64),
+            "t": np.array([entry[1] for entry in chunk], dtype=np.float64),
+            "jpeg": np.frombuffer(b"".join(jpegs), dtype=np.uint8),
+            "jpeg_offsets": np.cumsum([0] + [len(j) for j in jpegs]),
+            "has_result": np.array([entry[3] is not None for entry in chunk]),
+            "det": np.concatenate(dets).astype(np.float32).reshape(-1, 6),
+            "det_offsets": np.cumsum([0] + [len(d) for d in dets]),
+            "kalman": np.stack([entry[4] for entry in chunk]),
+            "motor": np.array([entry[5] for entry in chunk], dtype=np.float32),
+            "direction": np.array([entry[6] for entry in chunk], dtype=np.uint8),
+        }
+        path = os.path.join(self.path, f"parca_{self.chunk_index:06d}.npz")
+        # Önce geçici dosyaya yaz: güç kesilirse yarım parça kalmasın
+        with open(path + ".tmp", "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(path + ".tmp", path)
+        self.chunk_index += 1
+        self.chunks.append((path, os.path.getsize(path)))
+
+        # Disk bütçesi: en yeni kayıt korunur, en eski parçalar silinir
+        while len(self.chunks) > 1 and sum(size for _, size in self.chunks) > self.disk_budget:
+            old_path, _ = self.chunks.pop(0)
+            os.remove(old_path)
+
+
+def read_recording(path):
+    """Kayıt dizinini (meta, tur sözlükleri üreteci) olarak okur. Görüntüsüz
+    turlarda "image" None'dır."""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    def entries():
+        for chunk_path in sorted(glob.glob(os.path.join(path, "parca_*.npz"))):
+            with np.load(chunk_path) as data:
+                arrays = {key: data[key] for key in data.files}
+            jpeg, jpeg_offsets, det_offsets = arrays["jpeg"], arrays["jpeg_offsets"], arrays["det_offsets"]
+            for i in range(len(arrays["index"])):
+                encoded = jpeg[jpeg_offsets[i]:jpeg_offsets[i + 1]]
+                yield {
+                    "index": int(arrays["index"][i]),
+                    "t": float(arrays["t"][i]),
+                    "image": cv2.imdecode(encoded, cv2.IMREAD_COLOR) if encoded.size else None,
+                    "detections": arrays["det"][det_offsets[i]:det_offsets[i + 1]] if arrays["has_result"][i] else None,
+                    "kalman": arrays["kalman"][i],
+                    "motor": arrays["motor"][i],
+                    "direction": meta["directions"][arrays["direction"][i]]
+                                 if arrays["direction"][i] < len(meta["directions"]) else "?",
+                }
+
+    return meta, entries()
+
+
+class RecordingSource(FrameSource):
+    """Uçuş kaydındaki görüntülü turları sırayla oynatır. O anki tur
+    (detections, motor, t, ...) self.current'tadır; replay aracı kontrol
+    döngüsünün saatini ve tespit sonuçlarını buradan alır."""
+    name = "recording"
+
+    def __init__(self, path, pipeline=None):
+        # Kayıttaki kareler zaten aynalanmış
+        super().__init__(pipeline or FramePipeline(mirror=False))
+        self.path = path
+        self.meta = None
+        self.entries = None
+        self.current = None
+
+    def start(self):
+        self.meta, self.entries = read_recording(self.path)
+        print(f"[INFO] Uçuş kaydı oynatılıyor: {self.path}")
+
+    def read(self):
+        for entry in self.entries:
+            if entry["image"] is not None:
+                self.current = entry
+                return self.pipeline.push(entry["image"])
+        return None
+
+    def clock(self):
+        """Kontrol döngüsü için kaydedilmiş tur saati (deterministik arama zamanlaması)."""
+        return self.current["t"] if self.current is not None else 0.0
@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+import config
+
+
+class FramePipeline:
+    """Yakalama -> tespit kare yolu için önceden ayrılmış halka tampon.
+
+    Kamera kareyi doğrudan BGR (OpenCV düzeni) ve ISP'de aynalanmış olarak
+    verir; push() kareyi sıradaki halka yuvasına tek kopya ile yazar. Kontrol
+    döngüsü bu yuvaların view'larını kullanır; yuva ring_size kare sonra
+    yeniden yazılır. Çıkarım ve JPEG kodlaması bundan uzun sürebileceği için
+    tespite giden kare ResultHandoff.submit'te (tespit aralığı kadar seyrek),
+    yayına giden kare izleyici varsa FrameBroadcaster.publish'te kopyalanır.
+    """
+    def __init__(self, width=None, height=None, ring_size=None, mirror=False):
+        width = width or config.FRAME_WIDTH
+        height = height or config.FRAME_HEIGHT
+        ring_size = ring_size or config.FRAME_RING_SIZE
+        if ring_size < 3:
+            raise ValueError("FramePipeline en az 3 yuva gerektirir")
+
+        self.mirror = mirror # Kaynak aynalamayı kendisi yapamıyorsa True
+        self.frames = np.empty((ring_size, height, width, 3), dtype=np.uint8)
+        self.ring_size = ring_size
+        self.index = -1
+
+    def push(self, raw):
+        """Ham kareyi sıradaki yuvaya yazar ve yuvanın view'ını döndürür."""
+        self.index = (self.index + 1) % self.ring_size
+        dst = self.frames[self.index]
+        if self.mirror:
+            cv2.flip(raw, 1, dst=dst)
+        else:
+            np.copyto(dst, raw)
+        return dst
@@ -0,0 +1,210 @@
+import glob
+import os
+import time
+import cv2
+import numpy as np
+import config
+from frame_pipeline import FramePipeline
+
+
+class FrameSource:
+    """Kare kaynağı arayüzü. read() BGR, aynalanmış ve FramePipeline halka
+    yuvasına yazılmış kareyi döndürür; kaynak bittiyse None döndürür."""
+    name = "base"
+
+    def __init__(self, pipeline=None):
+        self.pipeline = pipeline
+
+    def start(self):
+        pass
+
+    def read(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _Pacer:
+    """Gerçek zamanlı oynatmada kareleri kaynak FPS'ine göre zamanlar."""
+    def __init__(self, fps, realtime):
+        self.period = 1.0 / fps if fps and fps > 0 else 0.0
+        self.realtime = realtime
+        self.next_time = None
+
+    def wait(self):
+        if not self.realtime or self.period == 0.0:
+            return
+        now = time.monotonic()
+        if self.next_time is None:
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        # Geride kalındıysa birikmiş gecikmeyi telafi etmeye çalışma
+        self.next_time = max(self.next_time, now) + self.period
+
+
+class Picamera2Source(FrameSource):
+    """Picamera2 kamerası (araç üzerindeki varsayılan kaynak)."""
+    name = "picamera2"
+
+    def __init__(self, pipeline=None, camera_num=0):
+        # Aynalama ISP'de yapılır, pipeline'da flip gerekmez
+        super().__init__(pipeline or FramePipeline(mirror=False))
+        self.camera_num = camera_num
+        self.picam2 = None
+
+    def start(self):
+        from picamera2 import Picamera2
+        from libcamera import Transform
+
+        self.picam2 = Picamera2(self.camera_num)
+        # Picamera2'de "RGB888" bellekte B,G,R sırasıdır: OpenCV ve çizim için
+        # doğrudan uygun. Aynalama ISP'de yapılır, CPU'da flip gerekmez.
+        camera_config = self.picam2.create_video_configuration(
+            main={"size": (config.FRAME_WIDTH, config.FRAME_HEIGHT), "format": "RGB888"},
+            transform=Transform(hflip=int(config.CAMERA_HFLIP)),
+        )
+        self.picam2.configure(camera_config)
+        self.picam2.start()
+        time.sleep(1)
+        print(f"[INFO] Picamera2 ({self.camera_num}) başlatıldı. Çözünürlük: {config.FRAME_WIDTH}x{config.FRAME_HEIGHT}")
+
+    def read(self):
+        from picamera2 import MappedArray
+
+        # Kamera tamponu doğrudan eşlenir, halka yuvasına tek kopya ile yazılır
+        request = self.picam2.capture_request()
+        try:
+            with MappedArray(request, "main") as mapped:
+                return self.pipeline.push(mapped.array)
+        finally:
+            request.release()
+
+    def stop(self):
+        if self.picam2:
+            self.picam2.stop()
+
+
+class ReplaySource(FrameSource):
+    """Video dosyası veya resim dizininden kare oynatır.
+    realtime=True kaynak FPS'ine göre, False ise olabildiğince hızlı oynatır."""
+    name = "replay"
+
+    def __init__(self, path, realtime=True, loop=False, fps=None, pipeline=None):
+        super().__init__(pipeline or FramePipeline(mirror=config.CAMERA_HFLIP))
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.fps = fps
+        self.capture = None
+        self.image_paths = None
+        self.image_index = 0
+        self.pacer = None
+
+    def start(self):
+        if os.path.isdir(self.path):
+            self.image_paths = sorted(
+                p for p in glob.glob(os.path.join(self.path, "*"))
+                if p.lower().endswith((".jpg", ".jpeg", ".png", ".bmp"))
+            )
+            if not self.image_paths:
+                raise FileNotFoundError(f"Resim bulunamadı: {self.path}")
+            fps = self.fps or config.REPLAY_FPS
+        else:
+            self.capture = cv2.VideoCapture(self.path)
+            if not self.capture.isOpened():
+                raise FileNotFoundError(f"Video açılamadı: {self.path}")
+            fps = self.fps or self.capture.get(cv2.CAP_PROP_FPS) or config.REPLAY_FPS
+        self.pacer = _Pacer(fps, self.realtime)
+        print(f"[INFO] Oynatma kaynağı: {self.path} ({fps:.1f} FPS, gerçek zamanlı: {self.realtime})")
+
+    def _next_raw(self):
+        if self.capture is not None:
+            ok, frame = self.capture.read()
+            if not ok and self.loop:
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = self.capture.read()
+            return frame if ok else None
+
+        if self.image_index >= len(self.image_paths):
+            if not self.loop:
+                return None
+            self.image_index = 0
+        frame = cv2.imread(self.image_paths[self.image_index])
+        self.image_index += 1
+        return frame
+
+    def read(self):
+        raw = self._next_raw()
+        if raw is None:
+            return None
+        if raw.shape[:2] != (config.FRAME_HEIGHT, config.FRAME_WIDTH):
+            raw = cv2.resize(raw, (config.FRAME_WIDTH, config.FRAME_HEIGHT))
+        self.pacer.wait()
+        return self.pipeline.push(raw)
+
+    def stop(self):
+        if self.capture is not None:
+            self.capture.release()
+
+
+class SyntheticSource(FrameSource):
+    """Yatayda gidip gelen kişi benzeri bir dikdörtgen üreten deterministik kaynak.
+    Kareler doğrudan halka yuvasına çizilir."""
+    name = "synthetic"
+
+    def __init__(self, count=None, realtime=False, fps=30.0, pipeline=None):
+        super().__init__(pipeline or FramePipeline(mirror=False))
+        self.count = count
+        self.realtime = realtime
+        self.fps = fps
+        self.frame_index = 0
+        self.pacer = None
+        self.background = None
+
+    def start(self):
+        rng = np.random.default_rng(0)
+        self.background = rng.integers(40, 80, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3), dtype=np.uint8)
+        self.pacer = _Pacer(self.fps, self.realtime)
+
+    def target_box(self, index):
+        """index. karedeki sentetik hedefin (x1, y1, x2, y2) kutusu."""
+        w, h = 80, 200
+        span = config.FRAME_WIDTH - w
+        phase = (index * 4) % (2 * span)
+        x1 = phase if phase < span else 2 * span - phase
+        y1 = (config.FRAME_HEIGHT - h) // 2
+        return x1, y1, x1 + w, y1 + h
+
+    def read(self):
+        if self.count is not None and self.frame_index >= self.count:
+            return None
+        self.pacer.wait()
+
+        frame = self.pipeline.push(self.background)
+        x1, y1, x2, y2 = self.target_box(self.frame_index)
+        frame[y1:y2, x1:x2] = (60, 120, 200)
+        self.frame_index += 1
+        return frame
+
+
+def create_frame_source(kind=None, path=None, camera_num=0):
+    """config.FRAME_SOURCE'a göre kare kaynağını oluşturur."""
+    kind = kind or config.FRAME_SOURCE
+
+    if kind == "picamera2":
+        return Picamera2Source(camera_num=camera_num)
+    if kind == "replay":
+        return ReplaySource(path or config.REPLAY_PATH, realtime=config.REPLAY_REALTIME)
+    if kind == "synthetic":
+        return SyntheticSource(realtime=True)
+
+    raise ValueError(f"Bilinmeyen kare kaynağı: {kind}")
@@ -0,0 +1,171 @@
+import os
+import threading
+from collections import deque, namedtuple
+import numpy as np
+import config
+
+# Tespit kalitesi basamağı: model giriş boyutu, tespit aralığı (kare) ve
+# kontrolcünün uygulayacağı hız çarpanı (algı yavaşlayınca araç da yavaşlar)
+OperatingPoint = namedtuple("OperatingPoint", ["level", "imgsz", "every_n", "speed_scale"])
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+class SocSensor:
+    """SoC sıcaklığını ve CPU frekansını sysfs'ten okur.
+
+    root ile sysfs yerine aynı dizin yapısına sahip sahte bir dizin verilebilir
+    (benchmark / iz oynatma). Dosya yoksa (Pi dışı makine) değerler None döner.
+    """
+    TEMP_PATH = "class/thermal/thermal_zone0/temp"                    # mili °C
+    FREQ_PATH = "devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"    # kHz
+    MAX_FREQ_PATH = "devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq" # kHz
+
+    def __init__(self, root=None):
+        self.root = root or config.GOVERNOR_SYSFS_ROOT
+
+    def read(self):
+        """(sıcaklık °C, frekans MHz, azami frekans MHz); okunamayanlar None."""
+        temp = _read_int(os.path.join(self.root, self.TEMP_PATH))
+        freq = _read_int(os.path.join(self.root, self.FREQ_PATH))
+        max_freq = _read_int(os.path.join(self.root, self.MAX_FREQ_PATH))
+        return (None if temp is None else temp / 1000.0,
+                None if freq is None else freq / 1000.0,
+                None if max_freq is None else max_freq / 1000.0)
+
+
+class QualityGovernor:
+    """Ölçülen çıkarım süresine ve SoC sıcaklığına göre tespit kalitesini ayarlar.
+
+    GOVERNOR_LEVELS en yüksek kaliteden en düşüğe (imgsz, every_n, hız çarpanı)
+    basamaklarıdır; başlangıç basamağı INFERENCE_IMGSZ / DETECT_EVERY_N'ye en
+    yakın olandır (tam eşleşme yoksa [UYARI] yazılır).
+    observe() ile tespit çalışanından gelen çıkarım süreleri toplanır; update()
+    en fazla GOVERNOR_INTERVAL_SEC'te bir sensörü okur ve:
+    - ölçülen kapasite (1 / medyan çıkarım süresi) GOVERNOR_TARGET_HZ'in
+      GOVERNOR_MARGIN kadar altındaysa bir basamak düşer; SoC GOVERNOR_HOT_C'ye
+      ulaştıysa (kısma başlamadan yükü azaltmak için) GOVERNOR_HOLD_SEC'te bir
+      basamak düşer,
+    - SoC GOVERNOR_COOL_C'nin altında, frekans kısılmamış ve bir üst basamakta
+      tahmini kapasite (süre imgsz^2 ile ölçeklenir) hedefin margin kadar
+      üstündeyse, son değişiklikten GOVERNOR_HOLD_SEC sonra bir basamak çıkar.
+    Basamak değişince eski boyuttaki ölçümler atılır ve (verbose ise) ayarlı
+    değerlerin yerine geçen basamak [UYARI] ile yazılır. observe() tespit
+    thread'inden, update() kontrol döngüsünden çağrılabilir.
+    """
+    def __init__(self, levels=None, target_hz=None, sensor=None, verbose=True):
+        self.levels = [tuple(level) for level in (levels or config.GOVERNOR_LEVELS)]
+        self.target_hz = target_hz or config.GOVERNOR_TARGET_HZ
+        self.sensor = sensor or SocSensor()
+        self.verbose = verbose
+        # Ayarlı giriş boyutuna, sonra tespit aralığına en yakın basamak
+        self.level = min(range(len(self.levels)),
+                         key=lambda i: (abs(self.levels[i][0] - config.INFERENCE_IMGSZ),
+                                        abs(self.levels[i][1] - config.DETECT_EVERY_N)))
+        imgsz, every_n, _ = self.levels[self.level]
+        if verbose and (imgsz, every_n) != (config.INFERENCE_IMGSZ, config.DETECT_EVERY_N):
+            print(f"[UYARI] Kalite yöneticisi: INFERENCE_IMGSZ={config.INFERENCE_IMGSZ}, "
+                  f"DETECT_EVERY_N={config.DETECT_EVERY_N} hiçbir basamağa uymuyor; "
+                  f"en yakın basamakla ({imgsz}px N={every_n}) başlanıyor.")
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=config.GOVERNOR_WINDOW)
+        self._next_check = None
+        self._last_change = None
+        self.temp_c = None
+        self.freq_mhz = None
+        self.throttled = False
+        self.capacity_hz = None # Bu basamakta sürdürülebilir tespit hızı (1 / medyan çıkarım)
+        self.reason = ""
+        self.changes = 0
+
+    @property
+    def point(self):
+        imgsz, every_n, speed_scale = self.levels[self.level]
+        return OperatingPoint(self.level, imgsz, every_n, speed_scale)
+
+    def observe(self, latency):
+        """Tespit çalışanından tek karenin çıkarım süresi (s)."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def update(self, now):
+        """Gerekirse basamağı değiştirir; güncel OperatingPoint döndürür."""
+        if self._next_check is None:
+            self._next_check = now + config.GOVERNOR_INTERVAL_SEC
+            self._last_change = now
+        if now < self._next_check:
+            return self.point
+        self._next_check = now + config.GOVERNOR_INTERVAL_SEC
+
+        self.temp_c, self.freq_mhz, max_freq = self.sensor.read()
+        self.throttled = (self.freq_mhz is not None and max_freq is not None
+                          and self.freq_mhz < max_freq * config.GOVERNOR_THROTTLE_RATIO)
+        with self._lock:
+            latencies = list(self._latencies)
+        if len(latencies) >= config.GOVERNOR_MIN_SAMPLES:
+            self.capacity_hz = 1.0 / max(float(np.median(latencies)), 1e-6)
+
+        hot = self.temp_c is not None and self.temp_c >= config.GOVERNOR_HOT_C
+        slow = self.capacity_hz is not None and self.capacity_hz < self.target_hz * (1 - config.GOVERNOR_MARGIN)
+        hot_step = hot and now - self._last_change >= config.GOVERNOR_HOLD_SEC
+        if (slow or hot_step) and self.level < len(self.levels) - 1:
+            self._change(self.level + 1, now, "yavas" if slow else "sicak")
+        elif not hot and not slow and self.level > 0 and self._can_step_up(now):
+            self._change(self.level - 1, now, "kapasite")
+        return self.point
+
+    def _can_step_up(self, now):
+        if now - self._last_change < config.GOVERNOR_HOLD_SEC or self.capacity_hz is None or self.throttled:
+            return False
+        if self.temp_c is not None and self.temp_c >= config.GOVERNOR_COOL_C:
+            return False
+        # Çıkarım süresi kabaca giriş piksel sayısıyla (imgsz^2) ölçeklenir
+        ratio = (self.levels[self.level][0] / self.levels[self.level - 1][0]) ** 2
+        return self.capacity_hz * ratio >= self.target_hz * (1 + config.GOVERNOR_MARGIN)
+
+    def _change(self, level, now, reason):
+        if self.verbose:
+            old, new = self.levels[self.level], self.levels[level]
+            print(f"[UYARI] Kalite yöneticisi ({reason}): {old[0]}px N={old[1]} -> {new[0]}px N={new[1]} "
+                  f"(ayarlı: {config.INFERENCE_IMGSZ}px N={config.DETECT_EVERY_N}).")
+        self.level = level
+        self._last_change = now
+        self.reason = reason
+        self.changes += 1
+        self.capacity_hz = None
+        with self._lock:
+            self._latencies.clear()
+
+    def status(self):
+        """Web arayüzü için anlık durum."""
+        point = self.point
+        return {
+            "level": point.level,
+            "imgsz": point.imgsz,
+            "every_n": point.every_n,
+            "speed_scale": point.speed_scale,
+            "target_hz": self.target_hz,
+            "capacity_hz": None if self.capacity_hz is None else round(self.capacity_hz, 2),
+            "temp_c": self.temp_c,
+            "freq_mhz": self.freq_mhz,
+            "throttled": self.throttled,
+            "reason": self.reason,
+            "changes": self.changes,
+        }
+
+    def describe(self):
+        """Overlay için kısa durum satırı."""
+        point = self.point
+        text = f"Kalite: {point.imgsz}px N={point.every_n}"
+        if self.temp_c is not None:
+            text += f" | {self.temp_c:.0f}C"
+        if self.freq_mhz is not None:
+            text += f" {self.freq_mhz:.0f}MHz"
+        return text
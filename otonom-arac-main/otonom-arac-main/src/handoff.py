@@ -0,0 +1,155 @@
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+import config
+from metrics import METRICS
+
+# Tespit çalışanına giden kare: sıra numarası, yakalama anı (time.perf_counter_ns),
+# karenin geldiği kamera (sıra numaraları kamera başınadır) ve model giriş
+# boyutu (None: INFERENCE_IMGSZ; kalite yöneticisi değiştirir)
+FramePacket = namedtuple("FramePacket", ["seq", "capture_ns", "frame", "roi", "camera", "imgsz"],
+                         defaults=("front", None))
+
+# Tespit çalışanından dönen sonuç: karenin seq/capture_ns/camera değerleri aynen geri gelir.
+# target None / detections boş: karede kimse yok (yeni sonuç yok ile karıştırılmaz).
+# infer_ns: karenin işlendiği model çağrısının süresi (toplu çağrıda partinin tamamı)
+DetectionResult = namedtuple("DetectionResult", ["seq", "capture_ns", "target", "detections", "camera", "infer_ns"],
+                             defaults=("front", None))
+
+
+class ResultHandoff:
+    """Kontrol döngüsü tarafında kare gönderimi ve sonuç tazelik kontrolü.
+
+    submit() kareyi artan bir sıra numarasıyla kuyruğa koyar (bekleyen eski
+    karenin yerine geçer) ve karenin saatini (döngünün clock'u; replay'de
+    kaydedilmiş saat) saklar. Kare yakalama halkasının bir yuvasıdır ve çıkarım
+    sürerken yakalama aynı yuvaya yeniden yazabilir; bu yüzden kareyi kendi
+    tamponuna kopyalamayan (copies_frames özniteliği olmayan) kuyruklara
+    kopyası gönderilir. keep_frames=True ise gönderilen karelerin kopyası
+    sonuç gelene kadar saklanır (pop_frame; optik akış sonucun ait olduğu
+    kareden başlatılır). poll() sonuç kuyruğundan bir sonuç alır ve
+    yaşını (şimdi - karenin saati) hesaplar:
+    max_age'den eski, daha yeni bir sonuçtan sonra gelen veya eşlemesi
+    halkadan düşmüş sonuçlar kullanılmaz. Kabul edilen sonucun yaşı
+    "result_age", reddedilenlerinki "result_stale" aşamasına kaydedilir.
+    """
+    def __init__(self, max_age=None, size=32, camera="front", keep_frames=False):
+        self.max_age = config.RESULT_MAX_AGE if max_age is None else max_age
+        self.size = size
+        self.camera = camera
+        self.keep_frames = keep_frames
+        self._times = OrderedDict() # seq -> kare saati
+        self._frames = OrderedDict() # seq -> gönderilen kare (keep_frames, sonucu beklenenler)
+        self._next_seq = 0
+        self.last_seq = -1  # Son kabul edilen sonucun sırası
+        self.age = None     # Son kabul edilen sonucun yaşı (s)
+        self.accepted = 0
+        self.rejected = 0
+
+    def submit(self, frame_q, frame, roi, capture_ns, frame_time, imgsz=None):
+        """Kareyi FramePacket olarak frame_q'ya koyar. Kuyruk doluysa bekleyen
+        (henüz işlenmemiş, daha eski) kare çıkarılır; yine de konamazsa False döndürür."""
+        seq = self._next_seq
+        if self.keep_frames or not getattr(frame_q, "copies_frames", False):
+            frame = frame.copy()
+        packet = FramePacket(seq, capture_ns, frame, roi, self.camera, imgsz)
+        try:
+            frame_q.put_nowait(packet)
+        except queue.Full:
+            try:
+                frame_q.get_nowait()
+                frame_q.put_nowait(packet)
+            except (queue.Empty, queue.Full):
+                return False
+        self._next_seq += 1
+        self._times[seq] = frame_time
+        if len(self._times) > self.size:
+            self._times.popitem(last=False)
+        if self.keep_frames:
+            self._frames[seq] = frame
+            if len(self._frames) > 4: # Kuyrukta + çıkarımda olanlardan fazlası gerekmez
+                self._frames.popitem(last=False)
+        return True
+
+    def pop_frame(self, seq):
+        """keep_frames: seq sıralı gönderilmiş kare (saklanmıyorsa None)."""
+        return self._frames.pop(seq, None)
+
+    def frame_time(self, seq):
+        """Gönderilmiş karenin saati (bilinmiyorsa None)."""
+        return self._times.get(seq)
+
+    def poll(self, result_q, now):
+        """Yeni ve taze bir sonuç varsa DetectionResult, yoksa None döndürür."""
+        try:
+            result = result_q.get_nowait()
+        except queue.Empty:
+            return None
+        # Bu sonuçtan önceki karelerin sonucu artık gelmeyecek
+        while self._frames and next(iter(self._frames)) < result.seq:
+            self._frames.popitem(last=False)
+
+        frame_time = self._times.get(result.seq)
+        age = None if frame_time is None else now - frame_time
+        if age is None or result.seq < self.last_seq or age > self.max_age:
+            self.rejected += 1
+            METRICS.record_ns("result_stale", int((age if age is not None else self.max_age) * 1e9))
+            return None
+
+        self.last_seq = result.seq
+        self.age = age
+        self.accepted += 1
+        METRICS.record_ns("result_age", int(age * 1e9))
+        return result
+
+
+class CameraMailbox:
+    """Birden fazla kameranın karelerini tespit çalışanına taşıyan, kamera başına
+    tek yuvalı kuyruk (frame_q olarak queue.Queue yerine geçer).
+
+    put_nowait() aynı kameranın bekleyen karesinin yerine yazar; hiçbir zaman
+    dolu olmaz. get() bir kare gelince, son partide birlikte gelen diğer
+    kameralar için en fazla BATCH_WINDOW_MS bekler; böylece aynı turda
+    gönderilen kareler tek model çağrısında işlenebilir. Kalan kareler
+    get_nowait() ile alınır.
+    """
+    def __init__(self, cameras, window_ms=None):
+        self.cameras = tuple(cameras)
+        self.window = (config.BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000.0
+        self._slots = {camera: None for camera in self.cameras}
+        self._served = {camera: 0 for camera in self.cameras} # Son alındığı sıra (adil sıralama)
+        self._pops = 0
+        self._expected = set() # Son partideki kameralar
+        self._cond = threading.Condition()
+
+    def _waiting(self):
+        return [camera for camera, packet in self._slots.items() if packet is not None]
+
+    def _pop(self):
+        # En uzun süredir alınmayan kamera önce: her turda yazan kameralar
+        # sırayla işlenir, hiçbiri diğerini aç bırakmaz
+        camera = min(self._waiting(), key=self._served.get)
+        self._pops += 1
+        self._served[camera] = self._pops
+        packet, self._slots[camera] = self._slots[camera], None
+        return packet
+
+    def put_nowait(self, packet):
+        with self._cond:
+            self._slots[packet.camera] = packet
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(self._waiting, timeout):
+                raise queue.Empty
+            if self.window > 0:
+                self._cond.wait_for(lambda: self._expected <= set(self._waiting()), self.window)
+            self._expected = set(self._waiting())
+            return self._pop()
+
+    def get_nowait(self):
+        with self._cond:
+            if not self._waiting():
+                raise queue.Empty
+            return self._pop()
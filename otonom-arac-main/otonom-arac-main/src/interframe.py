@@ -0,0 +1,178 @@
+import time
+import cv2
+import numpy as np
+import config
+
+
+class DetectionScheduler:
+    """Hangi karelerin tespit thread'ine gönderileceğine karar verir.
+
+    'every_frame': her kare (eski davranış), 'fixed': her N karede bir,
+    'adaptive': hedef kayıpsa, hareket büyükse veya güven düşükse hemen,
+    aksi halde en geç ADAPTIVE_MAX_N karede bir.
+    """
+    def __init__(self, mode=None, every_n=None):
+        self.mode = mode or config.DETECT_SCHEDULE
+        self.every_n = every_n or config.DETECT_EVERY_N
+        self.frames_since = self.every_n # ilk kare tespit edilsin
+
+    def should_detect(self, has_target=True, motion=0.0, conf=1.0):
+        self.frames_since += 1
+        if self.mode == "every_frame":
+            due = True
+        elif self.mode == "fixed":
+            due = self.frames_since >= self.every_n
+        elif self.mode == "adaptive":
+            due = (not has_target
+                   or motion > config.ADAPTIVE_MOTION_PX
+                   or conf < config.ADAPTIVE_MIN_CONF
+                   or self.frames_since >= config.ADAPTIVE_MAX_N)
+        else:
+            raise ValueError(f"Bilinmeyen tespit zamanlaması: {self.mode}")
+
+        if due:
+            self.frames_since = 0
+        return due
+
+
+class MotionGate:
+    """Araç dururken sahne değişmediyse tespiti atlayan ucuz ön filtre.
+
+    Kare çok küçük gri görüntüye indirilir ve son tespite gönderilen kareyle
+    piksel piksel karşılaştırılır; MOTION_GATE_PIXEL_DIFF'ten fazla değişen
+    piksellerin oranı MOTION_GATE_MIN_CHANGE'in altındaysa sahne durgun sayılır.
+    Araç hareket ederken (veya sahne değişince) her kare geçer; durgunken de en
+    geç MOTION_GATE_REFRESH_SEC'te bir tespit zorlanır.
+    """
+    def __init__(self, scale=None, pixel_diff=None, min_change=None, refresh_sec=None):
+        self.scale = scale or config.MOTION_GATE_SCALE
+        self.pixel_diff = pixel_diff or config.MOTION_GATE_PIXEL_DIFF
+        self.min_change = config.MOTION_GATE_MIN_CHANGE if min_change is None else min_change
+        self.refresh_sec = refresh_sec or config.MOTION_GATE_REFRESH_SEC
+        w = max(1, int(config.FRAME_WIDTH * self.scale))
+        h = max(1, int(config.FRAME_HEIGHT * self.scale))
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self.reference = None # Son tespite gönderilen karenin küçük gri hali
+        self.reference_time = None
+        self.change = 0.0     # Son karşılaştırmada değişen piksel oranı
+        self.checked = 0      # Tespit zamanı gelen kare sayısı
+        self.skipped = 0      # Bunlardan atlananlar
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def allow(self, frame, stationary, now):
+        """Tespit zamanı gelen kare gerçekten gönderilmeli mi.
+        stationary: araç duruyor mu (motor komutu sıfır), now: kare saati."""
+        self.checked += 1
+        if not stationary:
+            # Araç hareketliyken sahne zaten değişir; fark hesaplanmaz
+            self.reference = None
+            return True
+
+        cv2.resize(frame, (self._small.shape[1], self._small.shape[0]), dst=self._small,
+                   interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self.reference is not None and now - self.reference_time < self.refresh_sec:
+            cv2.absdiff(self._gray, self.reference, dst=self._diff)
+            self.change = np.count_nonzero(self._diff > self.pixel_diff) / self._diff.size
+            if self.change < self.min_change:
+                self.skipped += 1
+                return False
+
+        # Referans sadece gönderilen karede yenilenir: yavaş kayma da birikip yakalanır
+        if self.reference is None:
+            self.reference = np.empty_like(self._gray)
+        self.reference[:] = self._gray
+        self.reference_time = now
+        return True
+
+
+class FlowBoxPropagator:
+    """Son tespit kutusunu tespitler arasında Lucas-Kanade optik akışı ile taşır.
+
+    Kareler küçültülmüş gri görüntüde işlenir; gri tamponlar önceden ayrılır.
+    Kutu içindeki noktaların medyan yer değiştirmesi kadar kaydırılır.
+    """
+    def __init__(self, scale=None, max_points=30, min_points=5):
+        self.scale = scale or config.FLOW_SCALE
+        self.max_points = max_points
+        self.min_points = min_points
+        w = int(config.FRAME_WIDTH * self.scale)
+        h = int(config.FRAME_HEIGHT * self.scale)
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._grays = [np.empty((h, w), dtype=np.uint8), np.empty((h, w), dtype=np.uint8)]
+        self._current = 0
+        self.box = None      # [x1, y1, x2, y2, conf, track_id] (kare koordinatları)
+        self.points = None   # (P, 1, 2) küçük görüntü koordinatları
+        self.motion = 0.0    # son adımdaki medyan hareket (piksel, tam çözünürlük)
+
+    def _to_gray(self, frame):
+        self._current ^= 1
+        gray = self._grays[self._current]
+        cv2.resize(frame, (self._small.shape[1], self._small.shape[0]), dst=self._small,
+                   interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=gray)
+        return gray
+
+    def seed(self, frame, box):
+        """Yeni tespit kutusu ile izlemeyi başlatır."""
+        gray = self._to_gray(frame)
+        self.box = np.array(box, dtype=np.float32)
+        self.motion = 0.0
+
+        x1, y1, x2, y2 = (self.box[:4] * self.scale).astype(int)
+        mask = np.zeros_like(gray)
+        mask[max(y1, 0):max(y2, 0), max(x1, 0):max(x2, 0)] = 255
+        self.points = cv2.goodFeaturesToTrack(gray, self.max_points, 0.01, 3, mask=mask)
+        if self.points is None or len(self.points) < self.min_points:
+            self.reset()
+
+    def reset(self):
+        self.box = None
+        self.points = None
+        self.motion = 0.0
+
+    def update(self, frame):
+        """Kutuyu yeni kareye taşır. İzleme kaybolduysa None döndürür."""
+        if self.box is None:
+            return None
+
+        prev_gray = self._grays[self._current]
+        gray = self._to_gray(frame)
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, self.points, None,
+                                                         winSize=(15, 15), maxLevel=2)
+        good = status.ravel() == 1
+        if good.sum() < self.min_points:
+            self.reset()
+            return None
+
+        shift = np.median(new_points[good] - self.points[good], axis=0).ravel() / self.scale
+        self.box[[0, 2]] += shift[0]
+        self.box[[1, 3]] += shift[1]
+        self.points = new_points[good].reshape(-1, 1, 2)
+        self.motion = float(np.hypot(shift[0], shift[1]))
+        return self.box
+
+
+class RateCounter:
+    """Olay sayısından periyodik Hz hesaplar (kontrol döngüsü ve tespit için)."""
+    def __init__(self, window_sec=1.0):
+        self.window_sec = window_sec
+        self.count = 0
+        self.start = time.monotonic()
+        self.hz = 0.0
+
+    def tick(self, events=1):
+        """Her döngü turunda çağrılır; events bu turdaki olay sayısıdır."""
+        self.count += events
+        now = time.monotonic()
+        elapsed = now - self.start
+        if elapsed >= self.window_sec:
+            self.hz = self.count / elapsed
+            self.count = 0
+            self.start = now
+        return self.hz
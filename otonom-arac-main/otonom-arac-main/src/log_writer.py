@@ -0,0 +1,140 @@
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+import config
+
+# Sabit genişlikli kayıt: monotonik zaman (ns), tahmini konum, yön ve kaynak kodları
+RECORD_DTYPE = np.dtype([
+    ("t_ns", "<i8"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("direction", "u1"),
+    ("source", "u1"),
+])
+DIRECTIONS = ["BEKLEME", "MERKEZ", "YAKIN", "SAG", "SOL", "ARAMA_SAG", "ARAMA_SOL"]
+SOURCES = ["YOLOv8+Kalman", "Kalman Search"]
+UNKNOWN_CODE = 255
+
+MAGIC = b"OTLOG01\n"
+
+
+def _code(table, value):
+    try:
+        return table.index(value)
+    except ValueError:
+        return UNKNOWN_CODE
+
+
+def write_header(f, meta):
+    """Dosya başı: MAGIC + 4 bayt uzunluk + JSON meta (dtype, kod tabloları, saat eşlemesi)."""
+    data = json.dumps(meta).encode("utf-8")
+    f.write(MAGIC)
+    f.write(len(data).to_bytes(4, "little"))
+    f.write(data)
+
+
+def read_log(path):
+    """Bir log dosyasını (meta, kayıt dizisi) olarak okur. Yarım kalmış son kayıt atlanır."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} bir takip logu değil")
+        size = int.from_bytes(f.read(4), "little")
+        meta = json.loads(f.read(size).decode("utf-8"))
+        body = f.read()
+    usable = len(body) - len(body) % RECORD_DTYPE.itemsize
+    return meta, np.frombuffer(body[:usable], dtype=RECORD_DTYPE)
+
+
+class BinaryLogWriter:
+    """Takip loglarını arka plan thread'inde sabit genişlikli ikili kayıtlar olarak yazar.
+
+    Kontrol döngüsü log() ile sadece kuyruğa bir tuple koyar; dönüştürme ve disk
+    yazması LOG_WRITE_INTERVAL_SEC aralıklarla writer thread'inde yapılır. Her
+    çalıştırma kendi dosyalarını açar (önceki çalıştırmalar silinmez); dosya
+    LOG_MAX_BYTES'ı aşınca bir sonraki parçaya geçilir. En eski çalıştırmalar
+    LOG_KEEP_RUNS sınırını aşınca temizlenir.
+    """
+    def __init__(self, directory=None, interval=None, max_bytes=None, keep_runs=None):
+        self.directory = directory or config.LOG_DIR
+        self.interval = interval or config.LOG_WRITE_INTERVAL_SEC
+        self.max_bytes = max_bytes or config.LOG_MAX_BYTES
+        self.keep_runs = keep_runs or config.LOG_KEEP_RUNS
+        self.run_id = time.strftime("%Y%m%d_%H%M%S")
+        self.part = 0
+        self.paths = []
+        self.records_written = 0
+        self._queue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._prune_old_runs()
+        self._open_part()
+        self._thread.start()
+
+    def log(self, x, y, direction, source):
+        """Sıcak yol: tek bir kuyruk ekleme, dosya işlemi yok."""
+        self._queue.put((time.monotonic_ns(), x, y, _code(DIRECTIONS, direction), _code(SOURCES, source)))
+
+    def close(self):
+        """Kuyrukta kalanları yazar ve dosyayı kapatır."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not rows:
+            return
+        records = np.array(rows, dtype=RECORD_DTYPE)
+        if self._file.tell() + records.nbytes > self.max_bytes:
+            self._file.close()
+            self.part += 1
+            self._open_part()
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.records_written += len(rows)
+
+    def _open_part(self):
+        path = os.path.join(self.directory, f"takip_{self.run_id}_{self.part:03d}.bin")
+        # Aynı saniyede başlayan iki çalıştırma birbirinin üzerine yazmasın
+        while os.path.exists(path):
+            self.part += 1
+            path = os.path.join(self.directory, f"takip_{self.run_id}_{self.part:03d}.bin")
+        self._file = open(path, "wb")
+        # Monotonik saati duvar saatine çevirebilmek için iki saat aynı anda kaydedilir
+        write_header(self._file, {
+            "dtype": RECORD_DTYPE.descr,
+            "directions": DIRECTIONS,
+            "sources": SOURCES,
+            "run_id": self.run_id,
+            "part": self.part,
+            "anchor_monotonic_ns": time.monotonic_ns(),
+            "anchor_unix_ns": time.time_ns(),
+        })
+        self.paths.append(path)
+
+    def _prune_old_runs(self):
+        runs = sorted({os.path.basename(p)[len("takip_"):][:15]
+                       for p in glob.glob(os.path.join(self.directory, "takip_*.bin"))})
+        # Yeni çalıştırma için bir yer bırak
+        for run_id in runs[:max(0, len(runs) - self.keep_runs + 1)]:
+            for path in glob.glob(os.path.join(self.directory, f"takip_{run_id}_*.bin")):
+                os.remove(path)
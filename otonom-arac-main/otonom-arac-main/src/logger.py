@@ -1,20 +1,16 @@
 import numpy as np
 import cv2
-import pandas as pd
-import os
-import time
 import config # Loglama ayarları ve çözünürlük için
+from log_writer import BinaryLogWriter
+from overlay import TrajectoryRing
 
 class StateLogger:
-    """Kalman filtresini, loglamayı (CSV) ve hedef yörüngesini (trajectory) yönetir."""
-    def __init__(self):
+    """Kalman filtresini, loglamayı (arka planda ikili dosya) ve hedef yörüngesini (trajectory) yönetir."""
+    def __init__(self, log_enabled=None):
         self.kalman = self._init_kalman()
-        self.trajectory_points = []
-        self.log_buffer = []
-        self.last_write_time = time.time()
-        self._init_csv_log()
-        self.search_start_time = None
-        self.last_known_horizontal_direction = "SAG"
+        self.trajectory = TrajectoryRing(100)
+        log_enabled = config.LOG_ENABLED if log_enabled is None else log_enabled
+        self.log_writer = BinaryLogWriter() if log_enabled else None
 
     def _init_kalman(self):
         """Kalman filtresini başlatır ve sıfırlar."""
@@ -30,45 +26,36 @@ class StateLogger:
         
         return kalman
 
-    def _init_csv_log(self):
-        """Log dosyasını hazırlar (varsa siler)."""
-        if os.path.exists(config.CSV_FILENAME):
-            os.remove(config.CSV_FILENAME)
-        log_df = pd.DataFrame(columns=["timestamp", "x", "y", "direction", "source"])
-        log_df.to_csv(config.CSV_FILENAME, index=False)
-    
     def update_log_buffer(self, x, y, direction, source):
-        """Log tamponuna bir satır ekler."""
-        timestamp = time.strftime("%H:%M:%S", time.localtime())
-        self.log_buffer.append([timestamp, x, y, direction, source])
-        
-    def write_logs_to_disk(self):
-        """Tampondaki logları diske yazar (belirli aralıklarla veya çıkışta)."""
-        current_time_log = time.time()
-        
-        # Periyodik yazma (main döngüsü içinde)
-        if current_time_log - self.last_write_time >= config.LOG_WRITE_INTERVAL_SEC:
-            if self.log_buffer:
-                temp_df = pd.DataFrame(self.log_buffer, columns=["timestamp", "x", "y", "direction", "source"])
-                temp_df.to_csv(config.CSV_FILENAME, mode='a', header=False, index=False)
-                self.log_buffer = []
-            self.last_write_time = current_time_log
-        
-        # Çıkışta kalanları yazma (finally bloğu için)
-        elif self.log_buffer and current_time_log - self.last_write_time < config.LOG_WRITE_INTERVAL_SEC:
-             temp_df = pd.DataFrame(self.log_buffer, columns=["timestamp", "x", "y", "direction", "source"])
-             temp_df.to_csv(config.CSV_FILENAME, mode='a', header=False, index=False)
-             self.log_buffer = [] # tamponu temizle
+        """Log kuyruğuna bir kayıt ekler; diske yazma writer thread'inde yapılır."""
+        if self.log_writer is not None:
+            self.log_writer.log(x, y, direction, source)
+
+    def close(self):
+        """Kalan logları diske yazar (çıkışta)."""
+        if self.log_writer is not None:
+            self.log_writer.close()
 
     def update_trajectory(self, x, y):
-        """Yörünge noktalarını günceller."""
-        self.trajectory_points.append((x, y))
-        if len(self.trajectory_points) > 100:
-            self.trajectory_points.pop(0)
+        """Yörünge noktalarını günceller (son 100 nokta tutulur)."""
+        self.trajectory.append(x, y)
+
+    def reset_kalman(self, x, y):
+        """Kalman durumunu verilen konuma sıfırlar (takip edilen kişi değiştiğinde)."""
+        state = np.array([[x], [y], [0], [0]], dtype=np.float32)
+        self.kalman.statePre = state.copy()
+        self.kalman.statePost = state
+        self.kalman.errorCovPost = np.eye(4, dtype=np.float32)
 
     # Main döngüsünün kullanacağı Kalman metodları
     def kalman_correct(self, measurement):
         return self.kalman.correct(measurement)
 
-    def kalman_predict(self):
+    def kalman_predict(self, dt=None):
+        """dt verilirse durum dt saniye ilerletilir (hız px/s); verilmezse kare başına model."""
+        if dt is not None:
+            self.kalman.transitionMatrix = np.array([[1, 0, dt, 0], [0, 1, 0, dt], [0, 0, 1, 0], [0, 0, 0, 1]], np.float32)
+            self.kalman.processNoiseCov = np.diag(np.array(
+                [config.KALMAN_Q_POS, config.KALMAN_Q_POS, config.KALMAN_Q_VEL, config.KALMAN_Q_VEL],
+                np.float32) * max(dt, 1e-3))
         return self.kalman.predict()
\ No newline at end of file
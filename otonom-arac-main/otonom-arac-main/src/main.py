@@ -1,278 +1,373 @@
 #!/usr/bin/env python3
-import torch
 import cv2
 import time
-import threading
 import sys
-import numpy as np
 import queue 
+import functools
 
 import config
-from motor_control import MotorController 
+from motor_control import AsyncMotorDriver, MotorController 
 from detector import DetectionThread, frame_queue, result_queue 
+from detection_process import DetectionProcess
+from handoff import CameraMailbox, ResultHandoff
+from multicam import RearCamera
+from backends import create_backend
+from frame_source import create_frame_source
 from logger import StateLogger 
-import web_server 
+from tracker import MultiObjectTracker
+from interframe import DetectionScheduler, FlowBoxPropagator, MotionGate, RateCounter
+from roi import RoiPlanner
+from metrics import METRICS
+from flight_recorder import FlightRecorder
+from controller import ControllerEngine
+from overlay import OverlayInfo
+from governor import QualityGovernor
+from startup import STARTUP
+
+# torch/ultralytics tespit çalışanında, flask main() içinde import edilir
+STARTUP.mark("imports")
+
+
+def start_detection_thread(backend, frame_q=frame_queue, result_q=result_queue):
+    """Tespit thread'ini verilen çıkarım motoru ile başlatır."""
+    print(f"[INFO] Çıkarım motoru başlatılıyor: {backend.name}")
+    detection_thread = DetectionThread(backend, frame_q, result_q)
+    detection_thread.daemon = True 
+    detection_thread.start()
+    return detection_thread
+
+
+def start_detection_worker(device=None, kind=None, cameras=("front",)):
+    """config.DETECTION_WORKER'a göre tespit thread'i veya süreci başlatır.
+    (çalışan, frame_q, result_q) döndürür. Birden fazla kamerada frame_q bir
+    CameraMailbox, result_q {kamera: kuyruk} sözlüğüdür."""
+    kind = kind or config.DETECTION_WORKER
+    if len(cameras) > 1:
+        if kind != "thread":
+            raise ValueError("Çoklu kamera yalnızca 'thread' tespit çalışanı ile desteklenir")
+        frame_q = CameraMailbox(cameras)
+        result_q = {camera: queue.Queue(maxsize=1) for camera in cameras}
+        return start_detection_thread(create_backend(config.INFERENCE_BACKEND, device=device), frame_q, result_q), frame_q, result_q
+    if kind == "process":
+        # Model alt süreçte oluşturulur; sürece sadece fabrika fonksiyonu gönderilir
+        worker = DetectionProcess(functools.partial(create_backend, config.INFERENCE_BACKEND, device=device))
+        worker.start()
+        return worker, worker, worker
+    if kind == "thread":
+        return start_detection_thread(create_backend(config.INFERENCE_BACKEND, device=device)), frame_queue, result_queue
+    raise ValueError(f"Bilinmeyen tespit çalışanı: {kind}")
 
-# Picamera2'yi import et
-try:
-    from picamera2 import Picamera2
-except ImportError:
-    print("[HATA] Picamera2 yüklenemedi. Kamerayı devre dışı bırakıyorum.")
-    Picamera2 = None
-
-# ==================================================================
-# --- SİSTEM BAŞLATMA ---
-# ==================================================================
-
-# 1. Donanım ve Sistem Durumu Hazırlığı
-device = config.DEVICE if torch.cuda.is_available() else 'cpu'
-print(f"[INFO] CUDA kullanılabilir mi?: {torch.cuda.is_available()}")
-
-motor = MotorController() # Motor kontrolcüsünü başlat
-
-state_logger = StateLogger() # Kalman, Log ve Trajectory yöneticisini başlat
-
-# 2. Kamera Başlatma
-picam2 = None
-if Picamera2:
-    try:
-        picam2 = Picamera2()
-        camera_config = picam2.create_video_configuration(
-            main={"size": (config.FRAME_WIDTH, config.FRAME_HEIGHT), "format": "BGR888"},
-        )
-        picam2.configure(camera_config)
-        picam2.start()
-        time.sleep(1)
-        print(f"[INFO] Picamera2 başlatıldı. Çözünürlük: {config.FRAME_WIDTH}x{config.FRAME_HEIGHT}")
-    except Exception as e:
-        print(f"[HATA] Picamera2 başlatılamadı: {e}. Programı sonlandırıyorum.")
-        sys.exit(1)
-
-
-# 3. Threadleri Başlatma
-print(f"[INFO] YOLOv8 modeli başlatılıyor: {config.YOLO_MODEL_PATH}")
-detection_thread = DetectionThread(
-    config.YOLO_MODEL_PATH, device, 
-    frame_queue, result_queue
-)
-detection_thread.daemon = True 
-detection_thread.start()
-
-web_server_thread = web_server.start_server_thread() # Flask sunucusunu başlat
 
 # ==================================================================
 # --- ANA KONTROL DÖNGÜSÜ ---
 # ==================================================================
 
-print("[INFO] Ana kontrol döngüsü P-Kontrol ile başlıyor...")
-last_known_target = None 
-frame_count = 0
-fps = 0
-start_fps_time = time.time()
+def control_loop(source, motor, state_logger, frame_q=frame_queue, result_q=result_queue,
+                 frame_sink=None, max_frames=None, verbose=True, tracker=None,
+                 recorder=None, clock=None, engine=None, rear=None, gate=None,
+                 governor=None):
+    """Kare kaynağından bağımsız ana kontrol döngüsü.
+
+    source: frame_source.FrameSource, motor: MotorController (veya
+    RecordingMotorController), frame_sink: ham kareyi ve overlay.OverlayInfo
+    anlık görüntüsünü alan fonksiyon (ör. web_server.set_global_frame; çizim
+    yayın tarafında, izleyici varsa yapılır), recorder: flight_recorder.FlightRecorder,
+    clock: kare ve kontrolcü saati (replay'de kaydedilmiş saat; verilmezse
+    engine.clock, o da yoksa time.monotonic), engine: controller.ControllerEngine
+    (verilmezse kare başına adım atan bir tane; saati clock ile aynı olmalıdır,
+    ölçüm yaşı ve pid ileri tahmini iki saatin farkından hesaplanır),
+    rear: multicam.RearCamera (hedef yokken arka kamera da taranır; frame_q
+    handoff.CameraMailbox olmalı), gate: interframe.MotionGate (verilmezse
+    MOTION_GATE_ENABLED ise bir tane; araç dururken durgun sahnede tespit atlanır),
+    governor: governor.QualityGovernor (verilmezse GOVERNOR_ENABLED ise bir tane;
+    imgsz, tespit aralığı ve hız çarpanını çıkarım süresi / SoC sıcaklığına göre seçer).
+    İşlenen kare sayısını döndürür.
+    """
+    print("[INFO] Ana kontrol döngüsü P-Kontrol ile başlıyor...")
+    tracker = tracker or MultiObjectTracker()
+    # Kare saati ile kontrolcü saati tek olmalı (frame_time engine.step'e verilir)
+    if engine is None:
+        clock = clock or time.monotonic
+        engine = ControllerEngine(motor, state_logger, clock=clock)
+    elif clock is None:
+        clock = engine.clock
+    elif clock is not engine.clock:
+        raise ValueError("control_loop saati kontrolcünün saatiyle aynı olmalı (engine.clock)")
+    last_known_target = None # Kilitli izin kutusu [x1, y1, x2, y2, conf, track_id]
+    detections = None # Son tespit dizisi (N, 6)
+
+    # Tespitler arası hedef kutusu optik akışla kare hızında taşınır
+    scheduler = DetectionScheduler()
+    propagator = None if scheduler.mode == "every_frame" else FlowBoxPropagator()
+    detection_rate = RateCounter() # Kontrol döngüsü hızı = FPS
+
+    # Araç dururken sahne değişmiyorsa model çalıştırılmaz
+    if gate is None and config.MOTION_GATE_ENABLED:
+        gate = MotionGate()
+    stationary = False # Son kontrol çıktısında motorlar duruyor muydu
+
+    # Çıkarım yavaşlar veya SoC ısınırsa model girişi küçülür, tespit seyrekleşir
+    if governor is None and config.GOVERNOR_ENABLED:
+        governor = QualityGovernor(verbose=verbose)
+
+    # Hedef takip edilirken tespit Kalman tahmini etrafındaki pencerede yapılır
+    roi_planner = RoiPlanner()
+    pred_x, pred_y = config.FRAME_WIDTH // 2, config.FRAME_HEIGHT // 2
+
+    # Kareler sıra numarasıyla gönderilir; sonucun hangi kareye ait olduğu ve yaşı bilinir
+    handoff = ResultHandoff(keep_frames=propagator is not None)
+    measured_time = None # Hedef kutusunun ölçüldüğü karenin saati
+
+    frame_count = 0
+    fps = 0
+    start_fps_time = clock()
 
-try:
     while True:
         # --- 1. Görüntü Yakala (HIZLI) ---
-        if picam2 is None:
-            time.sleep(1)
-            continue
+        if max_frames is not None and frame_count >= max_frames:
+            break
 
-        frame_rgb = picam2.capture_array()
-        frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-            
+        loop_start_ns = time.perf_counter_ns()
+        frame = source.read() # BGR, aynalanmış halka yuvası
         if frame is None:
-            print("[HATA] Kameradan görüntü alınamadı.")
+            print("[HATA] Kaynaktan görüntü alınamadı.")
             break
-            
-        small_frame = cv2.flip(frame, 1) # BGR
-        img_rgb_for_yolo = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB) # RGB
+        STARTUP.mark("first_frame")
+        capture_ns = time.perf_counter_ns() # Kare yaşı bu andan ölçülür
+        frame_time = clock()
+        METRICS.record_ns("capture", capture_ns - loop_start_ns)
 
         # --- 2. Frame'i Tespit Thread'ine Gönder (HIZLI) ---
-        try:
-            frame_queue.put_nowait((img_rgb_for_yolo, small_frame)) 
-        except queue.Full:
-            pass 
+        imgsz = None
+        if governor is not None:
+            point = governor.update(frame_time)
+            imgsz = point.imgsz
+            scheduler.every_n = point.every_n
+            engine.update_speed_scale(point.speed_scale)
+        has_target = last_known_target is not None and (propagator is None or propagator.box is not None)
+        conf = float(last_known_target[4]) if last_known_target is not None else 0.0
+        motion = propagator.motion if propagator is not None else 0.0
+        due = scheduler.should_detect(has_target, motion, conf)
+        if due and gate is not None:
+            gate_start_ns = time.perf_counter_ns()
+            due = gate.allow(frame, stationary, frame_time)
+            METRICS.record_ns("motion_gate", time.perf_counter_ns() - gate_start_ns)
+        if due:
+            box_width = last_known_target[2] - last_known_target[0] if has_target else 0
+            roi = roi_planner.plan(has_target, pred_x, pred_y, box_width)
+            # Hedef yokken arka kamera karesi de aynı turda gönderilir (tek model çağrısı).
+            # Arka kamera okuması bloklar: iki kare de hazır olunca arka arkaya gönderilir
+            rear_frame = None
+            if rear is not None and not has_target:
+                rear_frame, rear_capture_ns = rear.read()
+            handoff.submit(frame_q, frame, roi, capture_ns, frame_time, imgsz)
+            if rear_frame is not None:
+                rear.submit(frame_q, rear_frame, rear_capture_ns, frame_time, imgsz)
 
         # --- 3. Sonucu Tespit Thread'inden Al (HIZLI) ---
-        try:
-            last_known_target = result_queue.get_nowait()
-        except queue.Empty:
-            pass 
-
-        direction = "BEKLEME" 
+        track_start_ns = time.perf_counter_ns()
+        result = handoff.poll(result_q, frame_time) # Eski (RESULT_MAX_AGE) sonuçlar None döner
+        new_result = result is not None
+        measured = False # Hedef kutusu bu turda ölçüldü mü (tespit veya optik akış)
+        if new_result:
+            STARTUP.mark("first_result")
+            if governor is not None and result.infer_ns is not None:
+                governor.observe(result.infer_ns / 1e9)
+            # Yeni sonuç; tespit yoksa "kimse yok" bilgisidir ve izler yaşlanır
+            detections = result.detections
+            measured_time = handoff.frame_time(result.seq)
+            tracker.update(detections)
+            last_known_target = tracker.locked_target()
+            measured = last_known_target is not None
+            if last_known_target is not None and "first_tracked" not in STARTUP.phases:
+                STARTUP.mark("first_tracked")
+                if verbose:
+                    STARTUP.report()
+            if propagator is not None:
+                if last_known_target is not None:
+                    # Kutu sonucun ait olduğu karede ölçüldü: akış o kareden
+                    # başlatılır ve kutu bu kareye taşınır
+                    result_frame = handoff.pop_frame(result.seq)
+                    if result_frame is None:
+                        propagator.seed(frame, last_known_target)
+                    else:
+                        propagator.seed(result_frame, last_known_target)
+                        propagated = propagator.update(frame)
+                        if propagated is not None:
+                            last_known_target = propagated
+                            measured_time = frame_time
+                else:
+                    propagator.reset()
+        else:
+            # Yeni sonuç yok: son kutu korunur, optik akışla bu kareye taşınır
+            if propagator is not None and last_known_target is not None:
+                propagated = propagator.update(frame)
+                if propagated is not None:
+                    last_known_target = propagated
+                    measured_time = frame_time
+                    measured = True
+
+        detection_hz = detection_rate.tick(int(new_result))
+        control_start_ns = time.perf_counter_ns()
+        METRICS.record_ns("track", control_start_ns - track_start_ns)
 
         # --- 4. MOTOR KONTROL VE LOJİK (HIZLI) ---
-        center_x = config.FRAME_WIDTH // 2
-
-        if last_known_target is not None:
-            # ==================================================================
-            # --- HEDEF GÖRÜNÜR DURUMDA (P-KONTROL TAKİP) ---
-            # ==================================================================
-            state_logger.search_start_time = None 
-            
-            x1, y1, x2, y2 = map(int, last_known_target[:4])
-            cx = (x1 + x2) // 2
-            cy = (y1 + y2) // 2
-            width = x2 - x1
-            
-            # Kalman ve Tahmin
-            measurement = np.array([[np.float32(cx)], [np.float32(cy)]])
-            state_logger.kalman_correct(measurement) 
-            prediction = state_logger.kalman_predict() 
-            pred_x = int(prediction[0][0])
-            pred_y = int(prediction[1][0])
-
-            dx = pred_x - center_x # Merkezden yatay sapma (HATA)
-
-            # Yakınlık Hesaplama
-            proximity = "UZAK"
-            if width > 200: proximity = "YAKIN"
-            elif width > 100: proximity = "ORTA"
-            
-            # Son bilinen yatay yönü güncelle
-            if dx > config.DEADZONE: state_logger.last_known_horizontal_direction = "SAG"
-            elif dx < -config.DEADZONE: state_logger.last_known_horizontal_direction = "SOL"
-
-            # ------------------------------------------------
-            # P-KONTROL HIZ HESAPLAMASI
-            # ------------------------------------------------
-            if proximity == "YAKIN":
-                motor.dur()
-                direction = "YAKIN"
-            
-            elif abs(dx) <= config.DEADZONE:
-                # Merkezde
-                motor.motor_a_hiz_ayarla(config.BASE_SPEED)
-                motor.motor_b_hiz_ayarla(config.BASE_SPEED)
-                motor.motor_a_ileri()
-                motor.motor_b_ileri()
-                direction = "MERKEZ"
-                
+        # Karar ControllerEngine'dedir: kendi thread'inde sabit hızda çalışıyorsa
+        # burada sadece hedef bildirilir, çalışmıyorsa kare başına bir adım atılır
+        age = frame_time - measured_time if measured_time is not None else 0.0
+        # Yakalama -> motor komutu (frame_age) bu ölçümü kullanan adımda kaydedilir
+        engine.update_target(last_known_target, tracker.locked_id, age, fresh=measured, capture_ns=capture_ns)
+        if rear is not None:
+            if last_known_target is None:
+                engine.update_rear(rear.poll(frame_time))
             else:
-                # Merkezde değil
-                turn_adjustment = config.Kp * dx
-                turn_adjustment = max(-config.BASE_SPEED, min(config.BASE_SPEED, turn_adjustment))
-                
-                motor_a_speed = config.BASE_SPEED + turn_adjustment
-                motor_b_speed = config.BASE_SPEED - turn_adjustment
-                
-                motor_a_speed = max(0.0, min(1.0, motor_a_speed))
-                motor_b_speed = max(0.0, min(1.0, motor_b_speed))
-
-                motor.motor_a_hiz_ayarla(motor_a_speed)
-                motor.motor_b_hiz_ayarla(motor_b_speed)
-                motor.motor_a_ileri() 
-                motor.motor_b_ileri()
-
-                direction = "SAG" if dx > 0 else "SOL"
-                
-            print(f"[YÖN]: {direction} | {proximity} | Hız A: {motor.ena.value:.2f}, Hız B: {motor.enb.value:.2f}")
-
-            # Çizim
-            cv2.rectangle(small_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cv2.circle(small_frame, (pred_x, pred_y), 5, (0, 0, 255), -1)
-            cv2.putText(small_frame, f"{direction} | {proximity}", (10, 40),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
-                            
-            state_logger.update_trajectory(pred_x, pred_y) 
-            state_logger.update_log_buffer(pred_x, pred_y, direction, "YOLOv8+Kalman") 
+                rear.clear()
+                engine.update_rear(None)
+        output = engine.output if engine.running else engine.step(frame_time)
+        direction = output.direction
+        pred_x, pred_y = output.pred_x, output.pred_y
+        stationary = output.speed_a == 0.0 and output.speed_b == 0.0
+        actuated_ns = time.perf_counter_ns()
 
-        else:
-            # ==================================================================
-            # --- HEDEF YOK (SPIN TURN ARAMA MODU) ---
-            # ==================================================================
-            current_time = time.time()
-            msg = "ARANIYOR"
-
-            if state_logger.search_start_time is None:
-                print("[BİLGİ] Arama modu başlatıldı.")
-                state_logger.search_start_time = current_time
-                motor.dur() # Başlangıçta dur
-
-            total_elapsed = current_time - state_logger.search_start_time
-            
-            if total_elapsed > config.TOTAL_SEARCH_TIMEOUT:
-                # Zaman aşımı
-                print(f"[UYARI] Hedef {config.TOTAL_SEARCH_TIMEOUT:.0f} saniyedir kayıp. Arama modu sıfırlanıyor.")
-                state_logger.search_start_time = None
-                motor.dur()
-                msg = "ARAMA SIFIRLANDI"
-            
-            else:
-                # Yerinde Dönüş
-                turn_speed = config.SCAN_SPEED 
-                
-                # Arama lojiği
-                if state_logger.last_known_horizontal_direction == "SOL":
-                    motor.motor_a_hiz_ayarla(turn_speed - 0.4) 
-                    motor.motor_b_hiz_ayarla(turn_speed)
-                    motor.motor_b_ileri() 
-                    motor.motor_a_geri() 
-                    msg = f"ARANIYOR (SAG Taraniyor {config.TOTAL_SEARCH_TIMEOUT - total_elapsed:.1f}s)"
-                    direction = "ARAMA_SAG"
-                else: # SAG
-                    motor.motor_a_hiz_ayarla(turn_speed) 
-                    motor.motor_b_hiz_ayarla(turn_speed - 0.4)
-                    motor.motor_a_ileri() 
-                    motor.motor_b_geri() 
-                    msg = f"ARANIYOR (SOL Taraniyor {config.TOTAL_SEARCH_TIMEOUT - total_elapsed:.1f}s)"
-                    direction = "ARAMA_SOL"
-
-            # Kalman tahmini 
-            prediction = state_logger.kalman_predict() 
-            pred_x = int(prediction[0][0])
-            pred_y = int(prediction[1][0])
-            state_logger.update_trajectory(pred_x, pred_y) 
-            
-            cv2.circle(small_frame, (pred_x, pred_y), 5, (255, 0, 0), -1)
-            cv2.putText(small_frame, msg, (10, 40),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-
-            state_logger.update_log_buffer(pred_x, pred_y, direction, "Kalman Search")
+        if verbose and not engine.running:
+            print(f"[YÖN]: {direction} | {output.proximity} | Hız A: {output.speed_a:.2f}, Hız B: {output.speed_b:.2f}")
 
+        state_logger.update_trajectory(pred_x, pred_y)
 
         # --- 5. Döngü Sonu İşlemleri (HER ZAMAN ÇALIŞIR) ---
-        state_logger.write_logs_to_disk() 
+        METRICS.record_ns("control", actuated_ns - control_start_ns)
+
+        if recorder is not None:
+            recorder.record(frame, frame_time, detections if new_result else None,
+                            state_logger.kalman.statePost, motor, direction)
 
-        # Yörünge çizimi
-        for i in range(1, len(state_logger.trajectory_points)):
-            cv2.line(small_frame, state_logger.trajectory_points[i - 1], state_logger.trajectory_points[i], (0, 0, 255), 2)
+        publish_start_ns = time.perf_counter_ns()
 
         # FPS Hesaplama
         frame_count += 1
         if frame_count % 10 == 0 and frame_count > 0:
-            curr_time = time.time()
+            curr_time = frame_time
             elapsed = curr_time - start_fps_time
             if elapsed > 0:
                 fps = 10 / elapsed
             start_fps_time = curr_time
 
-        cv2.putText(small_frame, f"FPS: {int(fps)}", (10, 80),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-
-        # KAREYİ GLOBAL YAYIN TAMPONUNA GÖNDER
-        web_server.set_global_frame(small_frame)
-
+        # KAREYİ GLOBAL YAYIN TAMPONUNA GÖNDER: çizim burada değil, yayın tarafında
+        if frame_sink is not None:
+            box = None
+            if output.has_target and last_known_target is not None:
+                box = tuple(int(v) for v in last_known_target[:4])
+            frame_sink(frame, OverlayInfo(
+                box, tracker.locked_id, (pred_x, pred_y), output.has_target, direction, output.proximity,
+                output.message, fps, detection_hz, handoff.age, handoff.rejected,
+                gate.skip_ratio if gate is not None else 0.0, state_logger.trajectory.points(),
+                governor.describe() if governor is not None else None))
+
+        loop_end_ns = time.perf_counter_ns()
+        METRICS.record_ns("publish", loop_end_ns - publish_start_ns)
+        METRICS.record_ns("loop", loop_end_ns - loop_start_ns)
+
+    if verbose and gate is not None:
+        print(f"[INFO] Hareket kapısı: {gate.checked} tespitten {gate.skipped} tanesi atlandı "
+              f"(%{gate.skip_ratio * 100:.1f}).")
+    if verbose and governor is not None:
+        print(f"[INFO] Kalite yöneticisi: {governor.changes} basamak değişikliği, son: {governor.describe()}")
+    return frame_count
+
+
+def main():
+    # ==================================================================
+    # --- SİSTEM BAŞLATMA ---
+    # ==================================================================
+
+    # 1. Model yükleme + ısınma en uzun aşama: kamera açılırken arka planda yapılır.
+    # Cihaz (CUDA yoksa CPU) tespit çalışanında torch import edilince seçilir.
+    cameras = ("front", RearCamera.name) if config.REAR_CAMERA_ENABLED else ("front",)
+    detection_thread, frame_q, result_q = start_detection_worker(cameras=cameras)
+    rear = None
+    if config.REAR_CAMERA_ENABLED:
+        rear = RearCamera(create_frame_source(config.REAR_CAMERA_SOURCE, camera_num=config.REAR_CAMERA_NUM),
+                          result_q[RearCamera.name])
+        result_q = result_q["front"]
+
+    # 2. Donanım ve Sistem Durumu Hazırlığı
+    motor = MotorController() # Motor kontrolcüsünü başlat
+    if config.MOTOR_ASYNC:
+        # Pin yazmaları ayrı thread'de: eğim sınırı ve komut watchdog'u
+        motor = AsyncMotorDriver(motor).start()
+    STARTUP.mark("motor")
+
+    state_logger = StateLogger() # Kalman, Log ve Trajectory yöneticisini başlat
+
+    # 3. Kare Kaynağını Başlatma (varsayılan: Picamera2)
+    source = create_frame_source()
+    try:
+        source.start()
+    except Exception as e:
+        print(f"[HATA] Kare kaynağı ({source.name}) başlatılamadı: {e}. Programı sonlandırıyorum.")
+        detection_thread.stop()
+        detection_thread.join() # Tespit süreci ise paylaşımlı belleği de siler
+        sys.exit(1)
+    if rear is not None:
+        try:
+            rear.start()
+        except Exception as e:
+            # Arka kamera olmadan da çalışılabilir: arama eskisi gibi körlemesine döner
+            print(f"[UYARI] Arka kamera başlatılamadı: {e}. Sadece ön kamera kullanılacak.")
+            rear = None
+    STARTUP.mark("camera")
+
+    import web_server
+    web_server_thread = web_server.start_server_thread() # Flask sunucusunu başlat
+    governor = QualityGovernor() if config.GOVERNOR_ENABLED else None
+    web_server.set_governor(governor)
+    STARTUP.mark("web")
+
+    # Sahadaki olayları off-vehicle oynatmak için isteğe bağlı kayıt
+    recorder = FlightRecorder() if config.RECORDER_ENABLED else None
+
+    # Motor kararları kamera hızından bağımsız, sabit hızda verilir
+    engine = ControllerEngine(motor, state_logger)
+    if config.CONTROL_THREADED:
+        engine.start()
 
-finally:
-    # --- GÜVENLİ ÇIKIŞ BLOĞU ---
-    print("\n[INFO] Program sonlandırılıyor (Ctrl+C algılandı)...")
-    
-    # Thread'i durdur
-    if 'detection_thread' in locals() and detection_thread.is_alive():
-        print("[INFO] Tespit thread'i durduruluyor...")
+    try:
+        control_loop(source, motor, state_logger, frame_q=frame_q, result_q=result_q,
+                     frame_sink=web_server.set_global_frame, recorder=recorder, engine=engine, rear=rear,
+                     governor=governor)
+
+    finally:
+        # --- GÜVENLİ ÇIKIŞ BLOĞU ---
+        print("\n[INFO] Program sonlandırılıyor (Ctrl+C algılandı)...")
+        
+        # Kontrolcü durdurulmadan motorlar kapatılmamalı (yeniden sürmesin)
+        engine.stop()
+        motor.dur() # Kapanış sürerken araç hareket etmesin
+
+        # Thread'i durdur (yüklemede ölmüş tespit süreci de join ile temizlenir)
+        if detection_thread.is_alive():
+            print("[INFO] Tespit thread'i durduruluyor...")
         detection_thread.stop()
-        detection_thread.join() 
+        detection_thread.join()
         print("[INFO] Tespit thread'i durduruldu.")
 
-    # Kalan logları diske yaz
-    print("[INFO] Kalan loglar diske yazılıyor...")
-    state_logger.write_logs_to_disk() 
-
-    print("[INFO] Donanımlar kapatılıyor...")
-    if picam2:
-        picam2.stop()
-    cv2.destroyAllWindows()
-    motor.dur() # Motorları mutlaka durdur
-    
-    print("[INFO] Temizlik tamamlandı. Çıkış yapıldı.")
\ No newline at end of file
+        # Kalan logları diske yaz
+        print("[INFO] Kalan loglar diske yazılıyor...")
+        state_logger.close()
+        if recorder is not None:
+            recorder.close()
+
+        print("[INFO] Donanımlar kapatılıyor...")
+        source.stop()
+        if rear is not None:
+            rear.stop()
+        cv2.destroyAllWindows()
+        motor.close() # Motorları mutlaka durdur (varsa motor thread'i de kapanır)
+        
+        if not STARTUP.reported:
+            STARTUP.report()
+        print("[INFO] Temizlik tamamlandı. Çıkış yapıldı.")
+
+
+if __name__ == "__main__":
+    main()
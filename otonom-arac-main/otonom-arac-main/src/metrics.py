@@ -0,0 +1,90 @@
+import time
+import numpy as np
+import config
+
+
+class _Span:
+    """`with METRICS.span("aşama"):` için hafif bağlam yöneticisi."""
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record_ns(self.stage, time.perf_counter_ns() - self.start)
+
+
+class StageMetrics:
+    """Aşama başına son N gecikme örneğini sabit boyutlu halka tamponda tutar.
+
+    Kayıt sıcak yolda sadece bir dizi yazması ve sayaç artırmasıdır; yüzdelikler
+    yalnızca summary() çağrıldığında (ör. /metrics isteğinde) hesaplanır. Her
+    aşama tek bir thread tarafından yazılır, bu yüzden kilit kullanılmaz.
+    """
+    def __init__(self, capacity=None, enabled=None):
+        self.capacity = capacity or config.METRICS_RING_SIZE
+        self.enabled = config.METRICS_ENABLED if enabled is None else enabled
+        self._samples = {} # aşama -> ns cinsinden int64 halka tampon
+        self._counts = {}
+
+    def record_ns(self, stage, duration_ns):
+        if not self.enabled:
+            return
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = np.zeros(self.capacity, dtype=np.int64)
+            self._counts[stage] = 0
+        count = self._counts[stage]
+        samples[count % self.capacity] = duration_ns
+        self._counts[stage] = count + 1
+
+    def record_since(self, stage, start_ns):
+        """start_ns (time.perf_counter_ns) anından bu yana geçen süreyi kaydeder."""
+        self.record_ns(stage, time.perf_counter_ns() - start_ns)
+
+    def span(self, stage):
+        return _Span(self, stage)
+
+    def recent(self, stage):
+        """Aşamanın halkada kalan son örnekleri (ns, sıra gözetilmez)."""
+        samples = self._samples.get(stage)
+        if samples is None:
+            return np.zeros(0, dtype=np.int64)
+        return samples[:min(self._counts[stage], self.capacity)].copy()
+
+    def summary(self):
+        """{aşama: {count, p50_ms, p95_ms, p99_ms, max_ms}} sözlüğü."""
+        result = {}
+        for stage, samples in list(self._samples.items()):
+            count = self._counts[stage]
+            recent = samples[:min(count, self.capacity)] / 1e6
+            if recent.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            result[stage] = {
+                "count": count,
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(recent.max()), 3),
+            }
+        return result
+
+    def prometheus(self, prefix="otonom_arac_stage"):
+        """summary() çıktısını Prometheus metin formatında döndürür."""
+        lines = [f"# HELP {prefix}_latency_ms Aşama gecikmesi (son {self.capacity} örnek)",
+                 f"# TYPE {prefix}_latency_ms summary"]
+        for stage, stats in self.summary().items():
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{prefix}_latency_ms{{stage="{stage}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'{prefix}_latency_ms_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Tüm thread'lerin paylaştığı örnek
+METRICS = StageMetrics()
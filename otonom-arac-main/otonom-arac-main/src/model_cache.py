@@ -0,0 +1,30 @@
+import hashlib
+import os
+import config
+
+
+def file_digest(path, length=16):
+    """Dosyanın SHA-256 özetinin ilk `length` karakteri."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def artifact_path(model_path, kind, imgsz=None, suffix=".bin"):
+    """Model dosyasından üretilmiş ön-işlenmiş ürünün önbellek yolu.
+
+    Anahtar modelin içerik özeti, giriş boyutu ve ürün türüdür; model dosyası
+    değişirse (aynı adla yeniden dışa aktarılsa bile) eski ürün kullanılmaz.
+    """
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    imgsz = imgsz or config.INFERENCE_IMGSZ
+    name = f"{stem}_{file_digest(model_path)}_{imgsz}_{kind}{suffix}"
+    return os.path.join(config.MODEL_CACHE_DIR, name)
+
+
+def temp_path(path):
+    """Yarım kalan yazmalar önbellekte görünmesin diye kullanılan geçici yol."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return f"{path}.{os.getpid()}.tmp"
@@ -1,26 +1,38 @@
-from gpiozero import PWMOutputDevice, DigitalOutputDevice
+import threading
+import time
 # from time import sleep # Gerekli değilse kaldırılabilir
 import config
+from metrics import METRICS
 
-# Motor A (Sağ Tekerler)
-in1 = DigitalOutputDevice(config.MOTOR_IN1)
-in2 = DigitalOutputDevice(config.MOTOR_IN2)
-ena = PWMOutputDevice(config.MOTOR_ENA)
-
-# Motor B (Sol Tekerler)
-in3 = DigitalOutputDevice(config.MOTOR_IN3)
-in4 = DigitalOutputDevice(config.MOTOR_IN4)
-enb = PWMOutputDevice(config.MOTOR_ENB)
+# gpiozero sadece araç üzerinde gerekli; yoksa RecordingMotorController kullanılabilir
+try:
+    from gpiozero import PWMOutputDevice, DigitalOutputDevice
+except ImportError:
+    PWMOutputDevice = None
+    DigitalOutputDevice = None
 
 class MotorController:
-    """GPIO Zero kütüphanesi ile motor kontrolünü yönetir."""
-    def __init__(self):
-        self.in1 = in1
-        self.in2 = in2
-        self.in3 = in3
-        self.in4 = in4
-        self.ena = ena
-        self.enb = enb
+    """GPIO Zero kütüphanesi ile motor kontrolünü yönetir.
+
+    suppress_redundant: drive() pinlere yalnızca değeri değişince yazar
+    (varsayılan MOTOR_SUPPRESS_REDUNDANT).
+    """
+    def __init__(self, suppress_redundant=None):
+        if PWMOutputDevice is None:
+            raise RuntimeError("gpiozero yüklenemedi; motorlar sürülemiyor.")
+        self.suppress_redundant = (config.MOTOR_SUPPRESS_REDUNDANT if suppress_redundant is None
+                                   else suppress_redundant)
+        self._written = {} # id(pin) -> son yazılan değer
+
+        # Motor A (Sağ Tekerler)
+        self.in1 = DigitalOutputDevice(config.MOTOR_IN1)
+        self.in2 = DigitalOutputDevice(config.MOTOR_IN2)
+        self.ena = PWMOutputDevice(config.MOTOR_ENA)
+
+        # Motor B (Sol Tekerler)
+        self.in3 = DigitalOutputDevice(config.MOTOR_IN3)
+        self.in4 = DigitalOutputDevice(config.MOTOR_IN4)
+        self.enb = PWMOutputDevice(config.MOTOR_ENB)
         self.hiz = 0.7
 
     def motor_a_ileri(self):
@@ -40,6 +52,7 @@ class MotorController:
         self.in4.on()
 
     def dur(self):
+        self._written.clear()
         self.in1.off()
         self.in2.off()
         self.in3.off()
@@ -51,4 +64,192 @@ class MotorController:
         self.ena.value = max(0.0, min(new_speed, 1.0))
 
     def motor_b_hiz_ayarla(self, new_speed):
-        self.enb.value = max(0.0, min(new_speed, 1.0))
\ No newline at end of file
+        self.enb.value = max(0.0, min(new_speed, 1.0))
+
+    def close(self):
+        self.dur()
+
+    def drive(self, speed_a, speed_b):
+        """İşaretli hızlar (-1.0 - 1.0): pozitif ileri, negatif geri, 0 serbest durma.
+        Yazılan pin sayısını döndürür."""
+        return (self._drive_side(self.in1, self.in2, self.ena, speed_a)
+                + self._drive_side(self.in3, self.in4, self.enb, speed_b))
+
+    def _write(self, pin, value):
+        if self.suppress_redundant and self._written.get(id(pin)) == value:
+            return 0
+        pin.value = value
+        self._written[id(pin)] = value
+        return 1
+
+    def _drive_side(self, forward_pin, reverse_pin, pwm, speed):
+        speed = max(-1.0, min(speed, 1.0))
+        # Yön değişiminde önce karşı pin kapatılır (iki pin aynı anda açık kalmaz)
+        if speed > 0:
+            writes = self._write(reverse_pin, 0) + self._write(forward_pin, 1)
+        elif speed < 0:
+            writes = self._write(forward_pin, 0) + self._write(reverse_pin, 1)
+        else:
+            writes = self._write(forward_pin, 0) + self._write(reverse_pin, 0)
+        return writes + self._write(pwm, abs(speed))
+
+
+class AsyncMotorDriver:
+    """Motor komutlarını kendi thread'inde pinlere yazan katman.
+
+    drive(hız_a, hız_b) beklemeden hedef hızı günceller ve thread'i uyandırır.
+    Thread hızları hedefe en fazla MOTOR_SLEW_RATE (birim/s) ile yaklaştırır ve
+    en az MOTOR_RATE_HZ hızında alt kontrolcüye yazar (değişmeyen pinler
+    yazılmaz). Durma komutu (0, 0; YAKIN, bekleme) güvenlik içindir: eğim
+    uygulanmadan, drive() içinde hemen yazılır. MOTOR_WATCHDOG_SEC boyunca yeni
+    komut gelmezse motorlar durdurulur. dur() beklemeden ve yumuşatmadan durdurur.
+    Pin nesneleri (in1, ena, ...) alt kontrolcüden okunur (uçuş kaydedici için).
+    Komut -> pin yazma gecikmesi motor thread'inde "actuation" aşamasına,
+    drive() içinde hemen yazılan durmalarınki "actuation_stop" aşamasına
+    kaydedilir (her aşamanın tek yazarı vardır).
+    """
+    def __init__(self, motor, rate_hz=None, slew_rate=None, watchdog_sec=None):
+        self.motor = motor
+        self.period = 1.0 / (rate_hz or config.MOTOR_RATE_HZ)
+        self.slew_rate = config.MOTOR_SLEW_RATE if slew_rate is None else slew_rate
+        self.watchdog_sec = config.MOTOR_WATCHDOG_SEC if watchdog_sec is None else watchdog_sec
+        self.current = [0.0, 0.0]
+        self.target = (0.0, 0.0)
+        self.command_ns = None # Son komutun zamanı (time.perf_counter_ns), watchdog için
+        self.changed_ns = None # Hedefi değiştiren son komutun zamanı, gecikme ölçümü için
+        self._applied_ns = None # Gecikmesi ölçülmüş son değişiklik
+        self.stale = False
+        self.watchdog_stops = 0
+        self.running = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def __getattr__(self, name):
+        return getattr(self.motor, name)
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="motor", daemon=True)
+        self._thread.start()
+        print(f"[INFO] Motor thread'i başlatıldı ({1 / self.period:.0f} Hz, eğim {self.slew_rate}/s, "
+              f"watchdog {self.watchdog_sec * 1000:.0f} ms).")
+        return self
+
+    def drive(self, speed_a, speed_b):
+        target = (max(-1.0, min(speed_a, 1.0)), max(-1.0, min(speed_b, 1.0)))
+        with self._lock:
+            self.command_ns = time.perf_counter_ns()
+            if target == self.target:
+                return # Aynı komut: sadece watchdog beslenir
+            self.target = target
+            self.changed_ns = self.command_ns
+            if target == (0.0, 0.0):
+                # Eski yoldaki motor.dur() gibi: rampa beklenmez
+                self.current = [0.0, 0.0]
+                self.motor.drive(0.0, 0.0)
+                self._applied_ns = self.changed_ns
+                METRICS.record_ns("actuation_stop", time.perf_counter_ns() - self.changed_ns)
+                return
+        self._wake.set()
+
+    def dur(self):
+        with self._lock:
+            self.target = (0.0, 0.0)
+            self.current = [0.0, 0.0]
+            self.command_ns = None # Bilinçli durma: watchdog yeni komuta kadar beklemez
+            self.motor.dur()
+
+    def close(self):
+        self.running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.dur()
+
+    def _slew(self, side, target, dt):
+        step = self.slew_rate * dt
+        current = self.current[side]
+        self.current[side] = current + max(-step, min(step, target - current))
+
+    def _run(self):
+        last = time.perf_counter()
+        while self.running:
+            self._wake.wait(self.period)
+            self._wake.clear()
+            now = time.perf_counter()
+            dt, last = now - last, now
+
+            with self._lock:
+                target, command_ns, changed_ns = self.target, self.command_ns, self.changed_ns
+                if command_ns is not None and now - command_ns / 1e9 > self.watchdog_sec:
+                    # Komut akışı kesildi (kontrolcü takıldı/çöktü): yumuşatmadan dur
+                    if not self.stale:
+                        self.stale = True
+                        self.watchdog_stops += 1
+                        print(f"[UYARI] {self.watchdog_sec * 1000:.0f} ms'dir motor komutu yok, motorlar durduruldu.")
+                    self.target = target = (0.0, 0.0)
+                    self.current = [0.0, 0.0]
+                elif self.stale and command_ns is not None:
+                    self.stale = False
+
+                for side in (0, 1):
+                    self._slew(side, target[side], dt)
+                writes = self.motor.drive(*self.current)
+
+            # Gecikme hedef değişikliğinden ilk pin yazmasına kadar ölçülür (eğim adımları hariç)
+            if writes and changed_ns is not None and changed_ns != self._applied_ns:
+                self._applied_ns = changed_ns
+                METRICS.record_ns("actuation", time.perf_counter_ns() - changed_ns)
+
+
+def commanded_pins(speed_a, speed_b):
+    """(hız_a, hız_b) komutunun MotorController.drive ile yazacağı pin değerleri:
+    {pin adı: değer}. Eğimli sürücüde pinler henüz hedefte olmayabilir."""
+    pins = {}
+    for (forward, reverse, pwm), speed in ((("in1", "in2", "ena"), speed_a), (("in3", "in4", "enb"), speed_b)):
+        speed = max(-1.0, min(speed, 1.0))
+        pins[forward] = 1 if speed > 0 else 0
+        pins[reverse] = 1 if speed < 0 else 0
+        pins[pwm] = abs(speed)
+    return pins
+
+
+class _RecordingPin:
+    """gpiozero çıkış cihazı taklidi: her yazmayı kaydediciye bildirir."""
+    def __init__(self, name, recorder):
+        self.name = name
+        self._recorder = recorder
+        self._value = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, new_value):
+        self._value = new_value
+        self._recorder.append((time.perf_counter(), self.name, new_value))
+
+    def on(self):
+        self.value = 1
+
+    def off(self):
+        self.value = 0
+
+
+class RecordingMotorController(MotorController):
+    """GPIO olmadan çalışan motor kontrolcüsü (sahte GPIO). Tüm pin yazmalarını
+    (zaman, pin, değer) olarak self.commands listesine kaydeder. Varsayılan
+    olarak her drive() tüm pinlere yazar (eski davranış, ölçümler için)."""
+    def __init__(self, suppress_redundant=False):
+        self.suppress_redundant = suppress_redundant
+        self._written = {}
+        self.commands = []
+        self.in1 = _RecordingPin("in1", self.commands)
+        self.in2 = _RecordingPin("in2", self.commands)
+        self.ena = _RecordingPin("ena", self.commands)
+        self.in3 = _RecordingPin("in3", self.commands)
+        self.in4 = _RecordingPin("in4", self.commands)
+        self.enb = _RecordingPin("enb", self.commands)
+        self.hiz = 0.7
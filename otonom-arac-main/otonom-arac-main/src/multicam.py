@@ -0,0 +1,57 @@
+import time
+import config
+from handoff import ResultHandoff
+
+
+class RearCamera:
+    """Arama modunda kişiyi arka kamerada arar.
+
+    Ön kamerada kilitli hedef yokken control_loop arka kamerayı da okur ve
+    karesini ön kamera karesiyle aynı turda gönderir (DetectionThread ikisini
+    tek model çağrısında işler). read() bloklayabildiği için önce iki kamera
+    okunur, sonra kareler arka arkaya gönderilir; yoksa ön kare BATCH_WINDOW_MS
+    dolunca tek başına işlenir. Arka kamerada kişi görülürse direction,
+    aracın dönmesi gereken taraftır ("SAG"/"SOL"); kontrolcü aramayı bu yöne
+    çevirir. Kamera geriye baktığı için görüntünün sağı aracın soluna düşer
+    (ön kamerayla aynı aynalama varsayılır).
+    """
+    name = "rear"
+
+    def __init__(self, source, result_q):
+        self.source = source
+        self.result_q = result_q
+        self.handoff = ResultHandoff(camera=self.name)
+        self.direction = None
+
+    def start(self):
+        self.source.start()
+
+    def stop(self):
+        self.source.stop()
+
+    def read(self):
+        """Arka kameradan bir kare okur; (kare, yakalama anı ns) veya (None, None)."""
+        frame = self.source.read()
+        if frame is None:
+            return None, None
+        return frame, time.perf_counter_ns()
+
+    def submit(self, frame_q, frame, capture_ns, frame_time, imgsz=None):
+        """read() ile okunan kareyi tespite gönderir (pencere yok, tam kare).
+        imgsz ön kamerayla aynı olmalı ki iki kare tek model çağrısında işlensin."""
+        return self.handoff.submit(frame_q, frame, None, capture_ns, frame_time, imgsz)
+
+    def poll(self, now):
+        """Yeni arka kamera sonucu varsa dönüş yönünü günceller; direction döndürür."""
+        result = self.handoff.poll(self.result_q, now)
+        if result is not None:
+            if result.target is None:
+                self.direction = None
+            else:
+                cx = (result.target[0] + result.target[2]) / 2
+                self.direction = "SOL" if cx > config.FRAME_WIDTH / 2 else "SAG"
+        return self.direction
+
+    def clear(self):
+        """Ön kamera hedefi bulunca eski arka kamera bilgisi unutulur."""
+        self.direction = None
@@ -0,0 +1,67 @@
+from collections import namedtuple
+import cv2
+import numpy as np
+
+# Bir kare için çizilecek her şeyin değişmez anlık görüntüsü. Kontrol döngüsü
+# bunu kareyle birlikte yayınlar; çizim yayın tarafında, izleyici varsa yapılır.
+# quality: kalite yöneticisinin durum satırı (yönetici yoksa None)
+OverlayInfo = namedtuple("OverlayInfo", [
+    "box", "track_id", "pred", "has_target", "direction", "proximity", "message",
+    "fps", "detection_hz", "result_age", "rejected", "skip_ratio", "trajectory", "quality",
+], defaults=(None,))
+
+
+class TrajectoryRing:
+    """Yörünge noktaları için sabit boyutlu halka tampon (en yeni capacity nokta).
+
+    Ekleme O(1) ve ayırmasızdır; points() noktaları eskiden yeniye, çizime
+    hazır (N, 2) int32 kopya olarak döndürür.
+    """
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self._points = np.empty((capacity, 2), dtype=np.int32)
+        self._head = 0 # Sıradaki yazma yuvası
+        self.count = 0
+
+    def append(self, x, y):
+        self._points[self._head] = (x, y)
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def points(self):
+        if self.count < self.capacity:
+            return self._points[:self.count].copy()
+        return np.concatenate((self._points[self._head:], self._points[:self._head]))
+
+
+def render_overlay(dst, frame, info):
+    """frame'i dst'ye kopyalar ve info'daki kutu, tahmin, yörünge ve yazıları çizer."""
+    np.copyto(dst, frame)
+    if info.has_target and info.box is not None:
+        x1, y1, x2, y2 = info.box
+        cv2.rectangle(dst, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.circle(dst, info.pred, 5, (0, 0, 255), -1)
+        cv2.putText(dst, f"ID {info.track_id}", (x1, max(y1 - 8, 12)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        cv2.putText(dst, f"{info.direction} | {info.proximity}", (10, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
+    else:
+        cv2.circle(dst, info.pred, 5, (255, 0, 0), -1)
+        cv2.putText(dst, info.message or "ARANIYOR", (10, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
+
+    # Yörünge: tüm parçalar tek çağrıda
+    if len(info.trajectory) > 1:
+        cv2.polylines(dst, [info.trajectory.reshape(-1, 1, 2)], False, (0, 0, 255), 2)
+
+    cv2.putText(dst, f"FPS: {int(info.fps)} | Tespit: {info.detection_hz:.1f} Hz", (10, 80),
+                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+    if info.result_age is not None:
+        cv2.putText(dst, f"Sonuc yasi: {info.result_age * 1000:.0f} ms | Eski: {info.rejected}", (10, 110),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    if info.skip_ratio:
+        cv2.putText(dst, f"Atlanan tespit: %{info.skip_ratio * 100:.0f}", (10, 135),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    if info.quality:
+        cv2.putText(dst, info.quality, (10, 160), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    return dst
@@ -0,0 +1,48 @@
+import numpy as np
+import config
+
+# Tespit dizisinin sütunları: x1, y1, x2, y2, conf, class_id
+EMPTY_DETECTIONS = np.zeros((0, 6), dtype=np.float32)
+
+
+def boxes_to_array(boxes):
+    """Ultralytics Boxes nesnesini tek seferde (N, 6) numpy dizisine aktarır."""
+    if boxes is None or len(boxes) == 0:
+        return EMPTY_DETECTIONS
+    # boxes.data: [x1, y1, x2, y2, conf, cls] -> tek cihaz senkronizasyonu
+    return boxes.data.cpu().numpy().astype(np.float32, copy=False)
+
+
+def filter_detections(data, class_id=None, conf_threshold=None):
+    """Sınıf ve güven eşiğine göre tespitleri vektörel olarak filtreler."""
+    if class_id is None:
+        class_id = config.PERSON_CLASS_ID
+    if conf_threshold is None:
+        conf_threshold = config.CONF_THRESHOLD
+
+    if data.shape[0] == 0:
+        return EMPTY_DETECTIONS
+
+    mask = (data[:, 5] == class_id) & (data[:, 4] > conf_threshold)
+    return data[mask]
+
+
+def select_largest(detections):
+    """En büyük alanlı tespiti (hedefi) döndürür, yoksa None."""
+    if detections.shape[0] == 0:
+        return None
+
+    widths = detections[:, 2] - detections[:, 0]
+    heights = detections[:, 3] - detections[:, 1]
+    return detections[np.argmax(widths * heights)]
+
+
+def postprocess_array(data, class_id=None, conf_threshold=None):
+    """(N, 6) ham tespit dizisinden (hedef, tüm_tespitler) döndürür."""
+    detections = filter_detections(data, class_id, conf_threshold)
+    return select_largest(detections), detections
+
+
+def postprocess(boxes, class_id=None, conf_threshold=None):
+    """Tek transfer + vektörel filtreleme. (hedef, tüm_tespitler) döndürür."""
+    return postprocess_array(boxes_to_array(boxes), class_id, conf_threshold)
@@ -0,0 +1,55 @@
+import numpy as np
+import config
+
+
+def _round_up(value, multiple=32):
+    return int(-(-value // multiple) * multiple)
+
+
+class RoiPlanner:
+    """Hedef takip edilirken çıkarımı Kalman tahmini etrafındaki bir pencereye daraltır.
+
+    Pencere kare şeklindedir, kenarı son kutu genişliğinin ROI_SCALE katıdır ve
+    kare sınırlarına kırpılır. Pencere, INFERENCE_IMGSZ'den küçükse doğal
+    çözünürlükte işlenir; böylece uzaktaki kişiler küçültülmez. Hedef kayıpsa
+    veya her ROI_FULL_EVERY_K tespitte bir tam kare kullanılır.
+    """
+    def __init__(self, enabled=None, full_every_k=None):
+        self.enabled = config.ROI_INFERENCE if enabled is None else enabled
+        self.full_every_k = full_every_k or config.ROI_FULL_EVERY_K
+        self.since_full = 0
+
+    def plan(self, has_target, pred_x, pred_y, box_width):
+        """Sıradaki tespit için (x1, y1, x2, y2) pencere veya tam kare için None döndürür."""
+        if not self.enabled or not has_target or self.since_full + 1 >= self.full_every_k:
+            self.since_full = 0
+            return None
+
+        size = int(max(config.ROI_MIN_SIZE, box_width * config.ROI_SCALE))
+        size = min(size, config.FRAME_WIDTH, config.FRAME_HEIGHT)
+        x1 = int(np.clip(pred_x - size // 2, 0, config.FRAME_WIDTH - size))
+        y1 = int(np.clip(pred_y - size // 2, 0, config.FRAME_HEIGHT - size))
+
+        # Pencere tüm yüksekliği kaplıyorsa tam kare ile aynı maliyette; tam kare kullan
+        if size >= config.FRAME_HEIGHT:
+            self.since_full = 0
+            return None
+
+        self.since_full += 1
+        return x1, y1, x1 + size, y1 + size
+
+
+def roi_imgsz(roi, limit=None):
+    """Pencere için model giriş boyutu: doğal çözünürlük, en fazla limit (INFERENCE_IMGSZ)."""
+    x1, y1, x2, y2 = roi
+    return min(_round_up(max(x2 - x1, y2 - y1)), limit or config.INFERENCE_IMGSZ)
+
+
+def map_to_frame(detections, roi):
+    """Pencere koordinatlarındaki (N, 6) tespitleri kare koordinatlarına taşır."""
+    if roi is None or detections.shape[0] == 0:
+        return detections
+    mapped = detections.copy()
+    mapped[:, [0, 2]] += roi[0]
+    mapped[:, [1, 3]] += roi[1]
+    return mapped
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+
+
+def _process_age():
+    """Sürecin başlamasından bu yana geçen süre (s); Linux dışında 0."""
+    try:
+        with open("/proc/self/stat") as f:
+            # comm alanı boşluk içerebilir; ')' sonrasından sayılır (22. alan: starttime)
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTimeline:
+    """Açılış aşamalarının süreç başlangıcına göre zamanları.
+
+    mark(aşama) her aşama için yalnızca ilk çağrıda zaman kaydeder; farklı
+    thread'lerden (tespit thread'i, kontrol döngüsü) çağrılabilir. Süreç
+    başlangıcı /proc'tan okunduğu için Python yorumlayıcısı ve import süreleri
+    de zaman çizelgesine dahildir.
+    """
+    def __init__(self):
+        self.origin = time.perf_counter() - _process_age()
+        self.phases = {} # aşama -> süreç başlangıcından itibaren saniye
+        self.reported = False
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        with self._lock:
+            if phase not in self.phases:
+                self.phases[phase] = time.perf_counter() - self.origin
+
+    def summary(self):
+        """{aşama: ms} sözlüğü (zaman sırasına göre)."""
+        with self._lock:
+            items = sorted(self.phases.items(), key=lambda item: item[1])
+        return {phase: round(t * 1000, 1) for phase, t in items}
+
+    def report(self):
+        """Zaman çizelgesini yazdırır."""
+        self.reported = True
+        print("[INFO] Açılış zaman çizelgesi (süreç başlangıcından itibaren):")
+        previous = 0.0
+        for phase, ms in self.summary().items():
+            print(f"  {phase:>14}: {ms:8.1f} ms  (+{ms - previous:.1f})")
+            previous = ms
+
+
+# Tüm thread'lerin paylaştığı örnek
+STARTUP = StartupTimeline()
@@ -0,0 +1,181 @@
+import numpy as np
+import config
+
+
+def iou_matrix(a, b):
+    """(N, 4) ve (M, 4) xyxy kutuları arasında (N, M) IoU matrisi."""
+    if a.shape[0] == 0 or b.shape[0] == 0:
+        return np.zeros((a.shape[0], b.shape[0]), dtype=np.float32)
+
+    xx1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xx2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def greedy_match(score, threshold):
+    """Skor matrisinde (büyük = iyi) açgözlü eşleştirme.
+    Eşik üstü çiftler skor sırasıyla bir kez taranır. (satır, sütun) dizileri döndürür."""
+    rows, cols = np.nonzero(score > threshold)
+    if rows.size == 0:
+        return rows, cols
+
+    order = np.argsort(-score[rows, cols], kind="stable")
+    used_rows = np.zeros(score.shape[0], dtype=bool)
+    used_cols = np.zeros(score.shape[1], dtype=bool)
+    match_rows, match_cols = [], []
+    for r, c in zip(rows[order], cols[order]):
+        if used_rows[r] or used_cols[c]:
+            continue
+        used_rows[r] = used_cols[c] = True
+        match_rows.append(r)
+        match_cols.append(c)
+    return np.array(match_rows, dtype=np.int64), np.array(match_cols, dtype=np.int64)
+
+
+def _xyxy_to_cxcywh(boxes):
+    return np.stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2,
+                     boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]], axis=1)
+
+
+def _cxcywh_to_xyxy(state):
+    half_w, half_h = state[:, 2] / 2, state[:, 3] / 2
+    return np.stack([state[:, 0] - half_w, state[:, 1] - half_h,
+                     state[:, 0] + half_w, state[:, 1] + half_h], axis=1)
+
+
+class MultiObjectTracker:
+    """Kararlı ID'li çoklu kişi takibi.
+
+    Her iz için hafif bir alfa-beta durumu (cx, cy, w, h ve hızları) numpy
+    dizilerinde tutulur; tüm izler tek seferde tahmin edilir. Eşleştirme önce
+    IoU, kalanlar için merkez uzaklığı ile açgözlü yapılır. Kontrolcü
+    locked_id'deki izi takip eder; kilitli iz ölene kadar başka kişiye geçmez.
+    """
+    def __init__(self, iou_threshold=None, max_center_dist=None, min_hits=None, max_age=None,
+                 alpha=0.6, beta=0.2):
+        self.iou_threshold = config.TRACK_IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        self.max_center_dist = config.TRACK_MAX_CENTER_DIST if max_center_dist is None else max_center_dist
+        self.min_hits = config.TRACK_MIN_HITS if min_hits is None else min_hits
+        self.max_age = config.TRACK_MAX_AGE if max_age is None else max_age
+        self.alpha = alpha
+        self.beta = beta
+
+        self.state = np.zeros((0, 4), dtype=np.float32)    # cx, cy, w, h
+        self.velocity = np.zeros((0, 4), dtype=np.float32) # adım başına değişim
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.conf = np.zeros(0, dtype=np.float32)
+        self.next_id = 1
+        self.locked_id = None
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def predict(self, dt=1.0):
+        """Tüm izleri dt adım ileri taşır ve xyxy kutularını döndürür."""
+        self.state += self.velocity * dt
+        self.state[:, 2:] = np.maximum(self.state[:, 2:], 1.0)
+        return _cxcywh_to_xyxy(self.state)
+
+    def _associate(self, predicted, det_boxes):
+        rows, cols = greedy_match(iou_matrix(predicted, det_boxes), self.iou_threshold)
+
+        # IoU ile eşleşmeyenler için merkez uzaklığı (hızlı hareket / küçük kutular)
+        free_t = np.setdiff1d(np.arange(predicted.shape[0]), rows)
+        free_d = np.setdiff1d(np.arange(det_boxes.shape[0]), cols)
+        if free_t.size and free_d.size:
+            t_centers = _xyxy_to_cxcywh(predicted[free_t])[:, :2]
+            d_centers = _xyxy_to_cxcywh(det_boxes[free_d])[:, :2]
+            dist = np.linalg.norm(t_centers[:, None, :] - d_centers[None, :, :], axis=2)
+            r2, c2 = greedy_match(self.max_center_dist - dist, 0.0)
+            rows = np.concatenate([rows, free_t[r2]])
+            cols = np.concatenate([cols, free_d[c2]])
+        return rows, cols
+
+    def update(self, detections, dt=1.0):
+        """(N, 6) tespit dizisi ile izleri günceller. Onaylı izleri döndürür."""
+        predicted = self.predict(dt)
+        det_boxes = detections[:, :4].astype(np.float32, copy=False)
+        rows, cols = self._associate(predicted, det_boxes)
+
+        # Eşleşen izler: alfa-beta düzeltmesi
+        if rows.size:
+            measured = _xyxy_to_cxcywh(det_boxes[cols])
+            residual = measured - self.state[rows]
+            self.state[rows] += self.alpha * residual
+            self.velocity[rows] += (self.beta / dt) * residual
+            self.hits[rows] += 1
+            self.misses[rows] = 0
+            self.conf[rows] = detections[cols, 4]
+
+        unmatched = np.ones(len(self), dtype=bool)
+        unmatched[rows] = False
+        self.misses[unmatched] += 1
+
+        # Ölen izleri sil
+        alive = self.misses <= self.max_age
+        if not alive.all():
+            self._keep(alive)
+
+        # Eşleşmeyen tespitlerden yeni izler doğar
+        new = np.ones(det_boxes.shape[0], dtype=bool)
+        new[cols] = False
+        if new.any():
+            self._spawn(det_boxes[new], detections[new, 4])
+
+        self._update_lock()
+        return self.tracks()
+
+    def _keep(self, mask):
+        self.state, self.velocity = self.state[mask], self.velocity[mask]
+        self.ids, self.hits = self.ids[mask], self.hits[mask]
+        self.misses, self.conf = self.misses[mask], self.conf[mask]
+
+    def _spawn(self, boxes, confs):
+        n = boxes.shape[0]
+        self.state = np.vstack([self.state, _xyxy_to_cxcywh(boxes)]).astype(np.float32)
+        self.velocity = np.vstack([self.velocity, np.zeros((n, 4), dtype=np.float32)])
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + n)])
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=np.int64)])
+        self.misses = np.concatenate([self.misses, np.zeros(n, dtype=np.int64)])
+        self.conf = np.concatenate([self.conf, confs.astype(np.float32)])
+        self.next_id += n
+
+    def _update_lock(self):
+        confirmed = self.hits >= self.min_hits
+        if self.locked_id is not None and np.any(self.ids == self.locked_id):
+            return
+
+        # Kilit yok veya kilitli iz öldü: en büyük onaylı ve görünür ize kilitlen
+        visible = confirmed & (self.misses == 0)
+        if not visible.any():
+            self.locked_id = None
+            return
+        areas = self.state[:, 2] * self.state[:, 3]
+        areas[~visible] = -1
+        self.locked_id = int(self.ids[np.argmax(areas)])
+
+    def tracks(self):
+        """Onaylı izler: (K, 6) dizi [x1, y1, x2, y2, conf, track_id]."""
+        confirmed = self.hits >= self.min_hits
+        boxes = _cxcywh_to_xyxy(self.state[confirmed])
+        return np.hstack([boxes, self.conf[confirmed, None],
+                          self.ids[confirmed, None].astype(np.float32)])
+
+    def locked_target(self):
+        """Kilitli iz bu adımda bir tespitle eşleştiyse [x1, y1, x2, y2, conf, track_id], yoksa None."""
+        if self.locked_id is None:
+            return None
+        idx = np.flatnonzero(self.ids == self.locked_id)
+        if idx.size == 0 or self.misses[idx[0]] > 0:
+            return None
+        i = idx[0]
+        box = _cxcywh_to_xyxy(self.state[i:i + 1])[0]
+        return np.array([*box, self.conf[i], self.ids[i]], dtype=np.float32)
@@ -1,11 +1,14 @@
-from flask import Flask, Response, render_template_string
+from flask import Flask, Response, jsonify, render_template_string, request
 import time
 import cv2
 import threading
+import config
+from metrics import METRICS
+from overlay import render_overlay
+from startup import STARTUP
 
 # --- FLASK UYGULAMASI VE GLOBAL KARE TAMPONU ---
 app = Flask(__name__)
-GLOBAL_FRAME = None 
 
 # Basit bir HTML şablonu
 INDEX_HTML = """
@@ -30,44 +33,249 @@ INDEX_HTML = """
 </html>
 """
 
-def set_global_frame(frame):
-    """main.py'nin kareyi ayarlaması için bir helper fonksiyon."""
-    global GLOBAL_FRAME
-    GLOBAL_FRAME = frame
+def snap_profile(width, quality):
+    """İstenen genişlik/kaliteyi sınırlı profil kümesine yuvarlar (önbellek boyutu sınırlı kalsın)."""
+    widths = sorted(config.STREAM_WIDTHS)
+    width = max([w for w in widths if w <= width] or widths[:1])
+    quality = int(min(90, max(20, round(quality / 10) * 10)))
+    return width, quality
+
+
+class FrameBroadcaster:
+    """Yayın karesini tüm izleyicilere profil başına tek JPEG kodlaması ile dağıtır.
+
+    Kareler sıra numarası ile yayınlanır; izleyiciler yeni kare gelene kadar
+    Condition üzerinde bekler (sabit sleep ile yoklama yok). Her kare her
+    (genişlik, kalite) profili için en fazla bir kez ve sadece bir izleyici
+    istediğinde kodlanır; aynı profildeki herkes aynı baytları alır. Küçültülmüş
+    kare de genişlik başına bir kez üretilir ve profiller arasında paylaşılır.
+    Yavaş izleyici kuyruk biriktirmez: uyandığında en son kareyi alır.
+
+    Kontrol döngüsü ham kareyi ve overlay.OverlayInfo'yu yayınlar; çizim kare
+    başına en fazla bir kez, ilk izleyici istediğinde burada yapılır. İzleyici
+    yoksa hiç çizim yapılmaz.
+
+    Yayınlanan kare yayıncının üç tamponundan birine kopyalanır (izleyici varsa,
+    kare başına bir kopya): FramePipeline halka yuvası kodlama sürerken yakalama
+    tarafından yeniden yazılabilir. Kodlayıcı, kodlama kilidini aldıktan sonra
+    en güncel tamponu alır ve kodlama bitene kadar yayıncı o tampona yazmaz.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._encode_lock = threading.Lock()
+        self._frame = None
+        self._overlay = None
+        self._seq = 0
+        self._buffers = [None, None, None] # Yayıncıya ait kare kopyaları
+        self._current = None # En güncel karenin tamponu
+        self._in_use = None # Kodlanmakta olan karenin tamponu
+        self._canvas = None # Çizimlerin yapıldığı tampon (kareler üzerine çizilmez)
+        self._rendered_seq = 0
+        self._encoded = {} # (genişlik, kalite) -> (seq, jpeg_bytes)
+        self._scaled = {}  # genişlik -> (seq, küçültülmüş kare)
+        self.subscribers = 0
+        self.encode_count = 0
+        self.encode_cpu_time = 0.0 # Kodlayıcının harcadığı CPU süresi (s)
+
+    def publish(self, frame, overlay=None):
+        """Yeni kareyi yayınlar. Kare (FramePipeline halka yuvası) izleyici
+        varsa kodlanmakta olmayan bir tampona kopyalanır; izleyici yoksa
+        kopyalanmaz. overlay verilirse kodlamadan önce üzerine çizilir."""
+        with self._cond:
+            if self.subscribers == 0:
+                self._frame = self._current = None # İzleyici gelince sonraki kare beklenir
+            else:
+                index = next(i for i in range(len(self._buffers)) if i not in (self._current, self._in_use))
+                buffer = self._buffers[index]
+                if buffer is None or buffer.shape != frame.shape:
+                    buffer = self._buffers[index] = frame.copy()
+                else:
+                    buffer[...] = frame
+                self._frame, self._current = buffer, index
+            self._overlay = overlay
+            self._seq += 1
+            self._cond.notify_all()
+
+    def subscribe(self):
+        with self._cond:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def _rendered_frame(self, frame, overlay, seq):
+        if overlay is None:
+            return frame
+        if self._rendered_seq != seq:
+            if self._canvas is None or self._canvas.shape != frame.shape:
+                self._canvas = frame.copy()
+            with METRICS.span("overlay"):
+                render_overlay(self._canvas, frame, overlay)
+            self._rendered_seq = seq
+        return self._canvas
+
+    def _scaled_frame(self, frame, seq, width):
+        if width >= frame.shape[1]:
+            return frame
+        cached = self._scaled.get(width)
+        if cached is None or cached[0] < seq:
+            height = int(frame.shape[0] * width / frame.shape[1])
+            cached = (seq, cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA))
+            self._scaled[width] = cached
+        return cached[1]
+
+    def wait_jpeg(self, last_seq, profile=None, timeout=1.0):
+        """last_seq'ten yeni bir kare olana kadar bekler ve kareyi istenen
+        (genişlik, kalite) profilinde döndürür: (seq, jpeg_bytes). Zaman
+        aşımında jpeg_bytes None'dır."""
+        width, quality = profile or (config.FRAME_WIDTH, config.STREAM_DEFAULT_QUALITY)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq and self._frame is not None, timeout):
+                return last_seq, None
+
+        # Yayıncıyı (kontrol döngüsü) bekletmemek için kodlama ayrı kilitte yapılır.
+        # Kare kilit alındıktan sonra alınır: tampon kodlama bitene kadar yazılmaz
+        with self._encode_lock:
+            with self._cond:
+                seq, frame, overlay = self._seq, self._frame, self._overlay
+                if frame is None: # Bu arada izleyici kalmadı
+                    return last_seq, None
+                self._in_use = self._current
+            try:
+                cached = self._encoded.get((width, quality))
+                if cached is None or cached[0] < seq:
+                    cpu_start = time.thread_time()
+                    frame = self._rendered_frame(frame, overlay, seq)
+                    with METRICS.span("jpeg_encode"):
+                        scaled = self._scaled_frame(frame, seq, width)
+                        ok, buf = cv2.imencode(".jpg", scaled, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+                    self.encode_cpu_time += time.thread_time() - cpu_start
+                    if not ok:
+                        print("[HATA] Frame JPEG'e dönüştürülemedi.")
+                        return seq, None
+                    cached = (seq, buf.tobytes())
+                    self._encoded[(width, quality)] = cached
+                    self.encode_count += 1
+                return cached
+            finally:
+                with self._cond:
+                    self._in_use = None
+
+
+class StreamClientControl:
+    """Tek bir izleyicinin profilini soket yazma süresine göre ayarlar.
+
+    İstemcinin istediği profil tavandır; ladder tavandan küçük STREAM_PROFILES
+    girdileriyle devam eder. Yazmalar kare bütçesinin STREAM_SLOW_WRITE_RATIO
+    katından uzun sürerse (soket dolu, bağlantı yavaş) bir basamak düşülür;
+    STREAM_UPGRADE_FRAMES kare boyunca hızlı yazılırsa bir basamak çıkılır.
+    """
+    def __init__(self, width, quality, max_fps, adaptive=True):
+        ceiling = snap_profile(width, quality)
+        lower = [p for p in sorted(config.STREAM_PROFILES, reverse=True)
+                 if p[0] <= ceiling[0] and p[1] <= ceiling[1] and p != ceiling]
+        self.ladder = [ceiling] + lower if adaptive else [ceiling]
+        self.level = 0
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.slow_writes = 0
+        self.fast_writes = 0
+
+    @property
+    def profile(self):
+        return self.ladder[self.level]
+
+    def on_write(self, write_seconds):
+        budget = self.min_interval or 1.0 / 30
+        if write_seconds > budget * config.STREAM_SLOW_WRITE_RATIO:
+            self.slow_writes += 1
+            self.fast_writes = 0
+            if self.slow_writes >= 2 and self.level < len(self.ladder) - 1:
+                self.level += 1
+                self.slow_writes = 0
+        else:
+            self.fast_writes += 1
+            self.slow_writes = 0
+            if self.fast_writes >= config.STREAM_UPGRADE_FRAMES and self.level > 0:
+                self.level -= 1
+                self.fast_writes = 0
+
+
+BROADCASTER = FrameBroadcaster()
+GOVERNOR = None # governor.QualityGovernor (main.py set_governor ile verir)
+
+def set_global_frame(frame, overlay=None):
+    """main.py'nin kareyi (ve çizilecek overlay bilgisini) ayarlaması için bir helper fonksiyon."""
+    BROADCASTER.publish(frame, overlay)
+
+def set_governor(governor):
+    global GOVERNOR
+    GOVERNOR = governor
 
 @app.route("/")
 def index():
     return render_template_string(INDEX_HTML)
 
-def mjpeg_generator():
-    """MJPEG akışını sağlayan jeneratör."""
-    global GLOBAL_FRAME
-    while True:
-        if GLOBAL_FRAME is None:
-            time.sleep(0.05) 
-            continue
-
-        try:
-            frame_copy = GLOBAL_FRAME.copy()
-        except AttributeError:
-            time.sleep(0.05)
-            continue
-        
-        ok, buf = cv2.imencode(".jpg", frame_copy, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-        if not ok:
-            print("[HATA] Frame JPEG'e dönüştürülemedi.")
-            continue
-        
-        yield (b"--frame\r\n"
-               b"Content-Type: image/jpeg\r\n\r\n" + buf.tobytes() + b"\r\n")
-        
-        time.sleep(0.03) 
+def mjpeg_generator(control, broadcaster=BROADCASTER):
+    """MJPEG akışını sağlayan jeneratör (her bağlı izleyici için bir tane)."""
+    broadcaster.subscribe()
+    try:
+        last_seq = 0
+        last_sent = 0.0
+        while True:
+            # Azami FPS: beklemeden sonra en güncel kare alınır
+            wait = last_sent + control.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            seq, jpeg = broadcaster.wait_jpeg(last_seq, control.profile)
+            if jpeg is None:
+                continue
+            last_seq = seq
+            last_sent = time.monotonic()
+
+            # Jeneratör, sunucu parçayı sokete yazdıktan sonra devam eder:
+            # aradaki süre yazmanın ne kadar bloklandığını gösterir
+            yield (b"--frame\r\n"
+                   b"Content-Type: image/jpeg\r\n\r\n" + jpeg + b"\r\n")
+            control.on_write(time.monotonic() - last_sent)
+    finally:
+        # İstemci bağlantıyı kapattığında jeneratör kapatılır
+        broadcaster.unsubscribe()
 
 @app.route("/video_feed")
 def video_feed():
-    return Response(mjpeg_generator(),
+    """İsteğe bağlı parametreler: w (genişlik), q (JPEG kalitesi), fps (azami),
+    adaptive (0 ise bağlantı hızına göre otomatik düşürme kapalı).
+    Örnek: /video_feed?w=320&q=50&fps=10"""
+    control = StreamClientControl(
+        width=request.args.get("w", config.FRAME_WIDTH, type=int),
+        quality=request.args.get("q", config.STREAM_DEFAULT_QUALITY, type=int),
+        max_fps=request.args.get("fps", config.STREAM_MAX_FPS, type=float),
+        adaptive=request.args.get("adaptive", 1, type=int) != 0,
+    )
+    return Response(mjpeg_generator(control),
                     mimetype="multipart/x-mixed-replace; boundary=frame")
 
+@app.route("/metrics")
+def metrics_json():
+    """Aşama başına p50/p95/p99 gecikmeleri (ms)."""
+    return jsonify(METRICS.summary())
+
+@app.route("/metrics/prometheus")
+def metrics_prometheus():
+    return Response(METRICS.prometheus(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/startup")
+def startup_timeline():
+    """Açılış aşamalarının süreç başlangıcından itibaren zamanları (ms)."""
+    return jsonify(STARTUP.summary())
+
+@app.route("/governor")
+def governor_status():
+    """Kalite yöneticisinin basamağı, ölçülen kapasite ve SoC sıcaklığı/frekansı."""
+    return jsonify(GOVERNOR.status() if GOVERNOR is not None else {})
+
 def start_flask_server():
     """Flask sunucusunu ayrı bir thread'de başlatır."""
     print("[INFO] Flask sunucusu 0.0.0.0:5000 adresinde başlatılıyor...")
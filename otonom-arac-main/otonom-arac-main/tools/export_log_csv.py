@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""İkili takip loglarını (logs/takip_*.bin) CSV'ye aktarır.
+
+Bir çalıştırmanın tüm parçaları verilirse sıralı olarak tek CSV'de birleştirilir.
+Sütunlar: t_mono_s (tam hassasiyetli monotonik saniye), wall_time (ISO, dosya
+başındaki saat eşlemesinden), x, y, direction, source.
+
+Kullanım:
+    python3 tools/export_log_csv.py logs/takip_20250101_120000_*.bin -o takip_log.csv
+"""
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from log_writer import read_log  # noqa: E402
+
+
+def label(table, code):
+    return table[code] if code < len(table) else "?"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Log dosyaları")
+    parser.add_argument("-o", "--output", default=None, help="CSV dosyası (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(["t_mono_s", "wall_time", "x", "y", "direction", "source"])
+    total = 0
+    for path in sorted(args.logs):
+        meta, records = read_log(path)
+        offset_ns = meta["anchor_unix_ns"] - meta["anchor_monotonic_ns"]
+        for r in records:
+            t_ns = int(r["t_ns"])
+            wall = datetime.fromtimestamp((t_ns + offset_ns) / 1e9).isoformat(timespec="microseconds")
+            writer.writerow([f"{t_ns / 1e9:.9f}", wall, f"{r['x']:.2f}", f"{r['y']:.2f}",
+                             label(meta["directions"], r["direction"]),
+                             label(meta["sources"], r["source"])])
+        total += len(records)
+    if args.output:
+        out.close()
+        print(f"[INFO] {total} kayıt {args.output} dosyasına yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
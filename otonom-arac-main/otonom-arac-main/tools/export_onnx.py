@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""YOLOv8 .pt modelini ONNX'e aktarır ve isteğe bağlı INT8 quantize eder.
+
+Bu adım geliştirme makinesinde bir kez çalıştırılır; araç üzerinde ONNX motoru
+Ultralytics olmadan çalışır.
+
+Kullanım:
+    python3 tools/export_onnx.py yolov8n.pt --imgsz 320 --int8
+    python3 tools/export_onnx.py yolov8n.pt --imgsz 320 --dynamic   # Çoklu kamera (toplu çıkarım)
+"""
+import argparse
+import os
+import shutil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model", help="YOLOv8 .pt dosyası")
+    parser.add_argument("--imgsz", type=int, default=320)
+    parser.add_argument("--int8", action="store_true", help="Dinamik INT8 quantize edilmiş kopya da üret")
+    parser.add_argument("--dynamic", action="store_true",
+                        help="Dinamik giriş boyutu (batch dahil); çoklu kamerada kareler tek çağrıda işlenir")
+    parser.add_argument("--out-dir", default=None)
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.model))
+    stem = os.path.splitext(os.path.basename(args.model))[0]
+    fp32_path = os.path.join(out_dir, f"{stem}_{args.imgsz}.onnx")
+
+    exported = YOLO(args.model).export(format="onnx", imgsz=args.imgsz, simplify=True, dynamic=args.dynamic)
+    shutil.move(exported, fp32_path)
+    print(f"[INFO] FP32 ONNX modeli: {fp32_path}")
+
+    if args.int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = os.path.join(out_dir, f"{stem}_{args.imgsz}_int8.onnx")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QUInt8)
+        print(f"[INFO] INT8 ONNX modeli: {int8_path}")
+
+
+if __name__ == "__main__":
+    main()
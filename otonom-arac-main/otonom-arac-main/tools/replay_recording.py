@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Uçuş kaydını DetectionThread ve kontrol döngüsü üzerinden deterministik oynatır.
+
+Kaydedilmiş config değerleri uygulanır, kareler RecordingSource ile okunur ve
+control_loop kaydedilmiş tur saati ile çalışır. Tespit thread'i kilit adımlı
+(lockstep) sürülür: kayıtta bir turda yeni tespit sonucu alındıysa o turda kare
+thread'e gönderilir ve sonuç beklenir, alınmadıysa sonuç yok sayılır. Böylece
+thread zamanlaması çıktıyı değiştirmez.
+
+--detections recorded (varsayılan): motor kayıttaki tespitleri döndürür; her
+oynatma aynı kararları üretir ve kayıttaki motor komutlarıyla karşılaştırılır.
+Kareler JPEG olarak saklandığı için optik akışla taşınan kutular, ölü bölge
+sınırındaki birkaç turda kayıttan farklı karar verdirebilir.
+--detections model: gerçek model kayıttaki kareler üzerinde çalışır (profil için).
+Kayıt RECORDER_EVERY_N > 1 ile alındıysa görüntüsüz turlar atlanır; oynatma
+yaklaşık olur. Kalite yöneticisi oynatmada kapalıdır (girdileri, yani çıkarım
+süreleri ve SoC sıcaklığı kaydedilmez); hız çarpanı < 1 ile sürülmüş turlar
+kayıttan farklı motor komutu gösterir.
+
+Kullanım:
+    python3 tools/replay_recording.py recordings/kayit_20250101_120000
+    python3 tools/replay_recording.py recordings/kayit_20250101_120000 --detections model --backend onnx
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import config  # noqa: E402
+from backends import InferenceBackend, create_backend  # noqa: E402
+from flight_recorder import RecordingSource, motor_state, read_recording  # noqa: E402
+from handoff import FramePacket  # noqa: E402
+from logger import StateLogger  # noqa: E402
+from main import control_loop, start_detection_thread  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from motor_control import RecordingMotorController  # noqa: E402
+
+# Oynatmayı etkilememesi gereken (donanım/çıktı) ayarlar kayıttan alınmaz
+SKIP_KEYS = {"FRAME_SOURCE", "REPLAY_PATH", "RECORDER_ENABLED", "RECORDER_DIR", "LOG_DIR", "LOG_ENABLED"}
+
+
+class RecordedBackend(InferenceBackend):
+    """O anki turun kaydedilmiş tespitlerini döndürür (model yok)."""
+    name = "recorded"
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+
+    def _load(self):
+        pass
+
+    def infer(self, image, imgsz=None):
+        current = self.source.current
+        if current is None or current["detections"] is None: # Isınma çağrısı
+            return np.zeros((0, 6), dtype=np.float32)
+        return current["detections"]
+
+
+class LockstepHandoff:
+    """Kontrol döngüsü ile tespit thread'i arasında kuyruk yerine geçer.
+    frame_q ve result_q olarak aynı nesne verilir."""
+    def __init__(self, source, frame_q, result_q):
+        self.source = source
+        self.frame_q = frame_q
+        self.result_q = result_q
+        self.pending = None
+        self.last_seq = -1
+
+    def put_nowait(self, packet):
+        # Döngünün kendi gönderimi saklanır (ROI dahil); gönderim kararı kayda göre verilir
+        self.pending = packet
+        self.last_seq = packet.seq
+
+    def get_nowait(self):
+        packet, self.pending = self.pending, None
+        if self.source.current["detections"] is None:
+            raise queue.Empty
+        if packet is None:
+            # Döngü bu turda göndermedi: o anki kare son gönderimin sırasıyla işlenir
+            frame = self.source.pipeline.frames[self.source.pipeline.index]
+            packet = FramePacket(self.last_seq, time.perf_counter_ns(), frame, None)
+        self.frame_q.put(packet)
+        return self.result_q.get(timeout=30)
+
+
+class ReplayComparer:
+    """control_loop'a recorder olarak verilir; oynatılan kararları kayıtla karşılaştırır."""
+    def __init__(self, source):
+        self.source = source
+        self.frames = 0
+        self.mismatches = []
+
+    def record(self, frame, t, detections, kalman_state, motor, direction):
+        recorded = self.source.current
+        same = (direction == recorded["direction"]
+                and np.allclose(motor_state(motor), recorded["motor"], atol=1e-3))
+        if not same:
+            self.mismatches.append((recorded["index"], recorded["direction"], direction))
+        self.frames += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="Kayıt dizini (recordings/kayit_...)")
+    parser.add_argument("--detections", choices=["recorded", "model"], default="recorded")
+    parser.add_argument("--backend", default=config.INFERENCE_BACKEND, help="--detections model için motor")
+    args = parser.parse_args()
+
+    meta, _ = read_recording(args.path)
+    for key, value in meta["config"].items():
+        if key not in SKIP_KEYS:
+            setattr(config, key, tuple(value) if isinstance(getattr(config, key, None), tuple) else value)
+    if args.detections == "recorded":
+        # Kayıttaki tespitler kare koordinatlarında; pencere ofseti tekrar eklenmesin
+        config.ROI_INFERENCE = False
+    # Yöneticinin kararları o anki makinenin sysfs'ine ve zamanlamasına bağlı: deterministik değil
+    config.GOVERNOR_ENABLED = False
+
+    source = RecordingSource(args.path)
+    source.start()
+    backend = RecordedBackend(source) if args.detections == "recorded" else create_backend(args.backend, device="cpu")
+    frame_q, result_q = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+    detection_thread = start_detection_thread(backend, frame_q, result_q)
+    handoff = LockstepHandoff(source, frame_q, result_q)
+    comparer = ReplayComparer(source)
+
+    try:
+        control_loop(source, RecordingMotorController(), StateLogger(log_enabled=False),
+                     frame_q=handoff, result_q=handoff, verbose=False,
+                     recorder=comparer, clock=source.clock)
+    finally:
+        detection_thread.stop()
+        detection_thread.join()
+
+    print(f"[INFO] Oynatılan tur: {comparer.frames} | kayıttan farklı karar: {len(comparer.mismatches)}")
+    for index, recorded, replayed in comparer.mismatches[:10]:
+        print(f"  tur {index}: kayıt {recorded} -> oynatma {replayed}")
+    for stage, stats in METRICS.summary().items():
+        print(f"  {stage:>12}: p50 {stats['p50_ms']:.3f} ms | p99 {stats['p99_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()